@@ -0,0 +1,23 @@
+"""Add accidents (user_id, timestamp) index
+
+Revision ID: 2b7c1d9e4f10
+Revises: 1234567890ab
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b7c1d9e4f10'
+down_revision = '1234567890ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_accidents_user_id_timestamp', 'accidents', ['user_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accidents_user_id_timestamp', table_name='accidents')
@@ -0,0 +1,23 @@
+"""Add users.data_version change counter
+
+Revision ID: 3c8e2f1a5b20
+Revises: 2b7c1d9e4f10
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3c8e2f1a5b20'
+down_revision = '2b7c1d9e4f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
@@ -0,0 +1,87 @@
+"""Add accident_stats rollup table
+
+Revision ID: 4d9f3a2b6c30
+Revises: 3c8e2f1a5b20
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+import math
+from collections import defaultdict
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4d9f3a2b6c30'
+down_revision = '3c8e2f1a5b20'
+branch_labels = None
+depends_on = None
+
+# Bucketing as of this revision. Frozen here, not imported from
+# backend.utils.stats, so later changes to the app cannot change what
+# this migration backfills.
+CONFIDENCE_BINS = 10
+LOCATION_CELL_DEGREES = 0.1
+
+
+def _confidence_bucket(confidence):
+    if confidence is None:
+        return "none"
+    index = int(confidence * CONFIDENCE_BINS)
+    if index > 0 and confidence <= index / CONFIDENCE_BINS:
+        index -= 1
+    index = min(max(index, 0), CONFIDENCE_BINS - 1)
+    return f"{index / CONFIDENCE_BINS:.1f}-{(index + 1) / CONFIDENCE_BINS:.1f}"
+
+
+def _rollup_keys(timestamp, latitude, longitude, confidence):
+    keys = [
+        ("total", ""),
+        ("day", timestamp.strftime("%Y-%m-%d")),
+        ("hour", f"{timestamp.hour:02d}"),
+        ("confidence", _confidence_bucket(confidence)),
+    ]
+    # 0,0 (or nothing) means the device had no GPS fix
+    if latitude is not None and longitude is not None and not (latitude == 0 and longitude == 0):
+        cells = 1 / LOCATION_CELL_DEGREES
+        keys.append(("location", f"{math.floor(latitude * cells) / cells:.1f},{math.floor(longitude * cells) / cells:.1f}"))
+    return keys
+
+
+def upgrade() -> None:
+    accident_stats = op.create_table('accident_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('confirmed', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'dimension', 'bucket')
+    )
+
+    # Backfill from existing accidents; after this the table is maintained on write
+    accidents = sa.table('accidents',
+        sa.column('user_id', sa.Integer()),
+        sa.column('timestamp', sa.DateTime()),
+        sa.column('latitude', sa.Float()),
+        sa.column('longitude', sa.Float()),
+        sa.column('confidence_score', sa.Float()),
+        sa.column('is_confirmed', sa.Boolean()),
+    )
+    result = op.get_bind().execute(sa.select(accidents).where(accidents.c.timestamp.isnot(None)))
+    totals = defaultdict(lambda: [0, 0])
+    for accident in result:
+        confirmed = 1 if accident.is_confirmed else 0
+        for key in _rollup_keys(accident.timestamp, accident.latitude, accident.longitude, accident.confidence_score):
+            total = totals[(accident.user_id,) + key]
+            total[0] += 1
+            total[1] += confirmed
+    rows = [
+        {'user_id': user_id, 'dimension': dimension, 'bucket': bucket, 'count': count, 'confirmed': confirmed}
+        for (user_id, dimension, bucket), (count, confirmed) in totals.items()
+    ]
+    if rows:
+        op.bulk_insert(accident_stats, rows)
+
+
+def downgrade() -> None:
+    op.drop_table('accident_stats')
@@ -0,0 +1,75 @@
+"""Add accidents.geocell grid index
+
+Revision ID: 5e1a4b3c7d40
+Revises: 4d9f3a2b6c30
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import math
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5e1a4b3c7d40'
+down_revision = '4d9f3a2b6c30'
+branch_labels = None
+depends_on = None
+
+# Integer geohash cells as of this revision. Frozen here, not imported from
+# backend.utils.geo, so later changes to the app cannot change what this
+# migration backfills.
+GEOCELL_PRECISION = 7
+
+
+def _location_cell(latitude, longitude):
+    # 0,0 (or nothing) means the device had no GPS fix
+    if latitude is None or longitude is None or (latitude == 0 and longitude == 0):
+        return None
+    bits = GEOCELL_PRECISION * 5
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    column = min(max(int(math.floor((longitude + 180.0) / 360.0 * (1 << lon_bits))), 0), (1 << lon_bits) - 1)
+    row = min(max(int(math.floor((latitude + 90.0) / 180.0 * (1 << lat_bits))), 0), (1 << lat_bits) - 1)
+    cell = 0
+    for i in range(bits):
+        if i % 2 == 0:
+            bit = (column >> (lon_bits - 1 - i // 2)) & 1
+        else:
+            bit = (row >> (lat_bits - 1 - i // 2)) & 1
+        cell = (cell << 1) | bit
+    return cell
+
+
+def upgrade() -> None:
+    op.add_column('accidents', sa.Column('geocell', sa.BigInteger(), nullable=True))
+
+    # Backfill cells for existing accidents
+    accidents = sa.table('accidents',
+        sa.column('id', sa.Integer()),
+        sa.column('latitude', sa.Float()),
+        sa.column('longitude', sa.Float()),
+        sa.column('geocell', sa.BigInteger()),
+    )
+    bind = op.get_bind()
+    rows = [
+        {'accident_id': accident_id, 'cell': _location_cell(latitude, longitude)}
+        for accident_id, latitude, longitude in bind.execute(
+            sa.select(accidents.c.id, accidents.c.latitude, accidents.c.longitude)
+        )
+    ]
+    rows = [row for row in rows if row['cell'] is not None]
+    if rows:
+        bind.execute(
+            accidents.update()
+            .where(accidents.c.id == sa.bindparam('accident_id'))
+            .values(geocell=sa.bindparam('cell')),
+            rows
+        )
+
+    op.create_index('ix_accidents_user_id_geocell', 'accidents', ['user_id', 'geocell'], unique=False)
+    op.create_index('ix_accidents_geocell', 'accidents', ['geocell'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_accidents_geocell', table_name='accidents')
+    op.drop_index('ix_accidents_user_id_geocell', table_name='accidents')
+    op.drop_column('accidents', 'geocell')
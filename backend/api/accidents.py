@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import numpy as np
 from ..utils import crud
+from ..utils.idempotency import run_idempotent
+from ..utils.stats import summarize
+from ..utils.geo import GEOCELL_PRECISION, cell_center, covering_ranges, geohash_string, haversine_m_array
+from ..utils.serialization import accident_serializer
 from ..schemas import schemas
+from ..core.config import settings
 from ..core.database import get_db
 from ..api import deps
+from ..api.etag import cache_headers, etag_matches, list_etag, not_modified
 
 router = APIRouter()
 
@@ -12,20 +19,120 @@ router = APIRouter()
 def create_accident(
     accident: schemas.AccidentCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(deps.get_current_active_user)
+    current_user: schemas.User = Depends(deps.get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    return crud.create_accident(db=db, accident=accident, user_id=current_user.id)
+    def create():
+        db_accident = crud.create_accident(db=db, accident=accident, user_id=current_user.id)
+        return schemas.Accident.model_validate(db_accident)
+
+    return run_idempotent(
+        idempotency_key,
+        ("accidents.create", current_user.id),
+        accident.model_dump_json(),
+        create
+    )
 
 @router.get("/", response_model=List[schemas.Accident])
 def read_accidents(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(deps.get_current_active_user)
+    current_user: schemas.User = Depends(deps.get_current_active_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
+    etag = list_etag(current_user, "accidents", skip, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if settings.FAST_JSON_RESPONSES:
+        rows = crud.get_accident_rows(db, accident_serializer.columns, user_id=current_user.id, skip=skip, limit=limit)
+        return accident_serializer.response(rows, headers=cache_headers(etag))
+    response.headers.update(cache_headers(etag))
     accidents = crud.get_accidents(db, user_id=current_user.id, skip=skip, limit=limit)
     return accidents
 
+@router.get("/stats", response_model=schemas.AccidentStats)
+def read_accident_stats(
+    response: Response,
+    days: Optional[int] = None,
+    max_locations: int = 50,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(deps.get_current_active_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """
+    Accident counts by day and hour, confirmation rate, confidence histogram
+    and location cells, read from the incrementally maintained rollup
+    """
+    etag = list_etag(current_user, "accidents.stats", days, max_locations)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    rows = crud.get_accident_stat_rows(db, user_id=current_user.id)
+    return summarize(rows, days=days, max_locations=max_locations)
+
+@router.get("/near", response_model=List[schemas.AccidentNearby])
+def read_accidents_near(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(1000.0, gt=0),
+    limit: int = Query(100, gt=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(deps.get_current_active_user)
+):
+    """
+    The user's accidents within radius_m of a point, nearest first.
+    Candidates come from the geocell index; exact distances are computed
+    in one vectorized pass.
+    """
+    ranges = covering_ranges(latitude, longitude, radius_m)
+    candidates = crud.get_accident_locations(db, user_id=current_user.id, ranges=ranges)
+    if not candidates:
+        return []
+    ids, latitudes, longitudes = np.array(candidates, dtype=np.float64).T
+    distances = haversine_m_array(latitude, longitude, latitudes, longitudes)
+    inside = np.flatnonzero(distances <= radius_m)
+    nearest = inside[np.argsort(distances[inside], kind="stable")][:limit]
+
+    accidents = {accident.id: accident for accident in crud.get_accidents_by_ids(db, [int(ids[i]) for i in nearest])}
+    return [
+        schemas.AccidentNearby(
+            **schemas.Accident.model_validate(accidents[int(ids[i])]).model_dump(),
+            distance_m=float(distances[i])
+        )
+        for i in nearest
+    ]
+
+@router.get("/hotspots", response_model=List[schemas.Hotspot])
+def read_hotspots(
+    precision: int = Query(5, ge=1, le=GEOCELL_PRECISION),
+    limit: int = Query(50, gt=0, le=1000),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(deps.get_current_active_user)
+):
+    """
+    The user's accident counts per geohash cell, busiest first,
+    optionally limited to the cells around a point
+    """
+    ranges = None
+    if latitude is not None and longitude is not None and radius_m is not None:
+        ranges = covering_ranges(latitude, longitude, radius_m)
+    hotspots = []
+    for cell, count, confirmed in crud.get_hotspot_rows(db, current_user.id, precision, ranges=ranges, limit=limit):
+        center_latitude, center_longitude = cell_center(cell, precision)
+        hotspots.append(schemas.Hotspot(
+            geohash=geohash_string(cell, precision),
+            latitude=center_latitude,
+            longitude=center_longitude,
+            count=count,
+            confirmed=confirmed or 0
+        ))
+    return hotspots
+
 @router.get("/{accident_id}", response_model=schemas.Accident)
 def read_accident(
     accident_id: int,
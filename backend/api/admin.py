@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from typing import List
+from ..schemas import schemas
+from ..core import profiling
+from ..api import deps
+
+router = APIRouter()
+
+@router.get("/profiles", response_model=List[schemas.ProfileInfo])
+def read_profiles(
+    current_user: schemas.User = Depends(deps.get_current_active_superuser)
+):
+    return profiling.list_profiles()
+
+@router.get("/profiles/{name}")
+def download_profile(
+    name: str,
+    current_user: schemas.User = Depends(deps.get_current_active_superuser)
+):
+    path = profiling.get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=name)
\ No newline at end of file
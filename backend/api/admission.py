@@ -0,0 +1,150 @@
+import asyncio
+import math
+import threading
+import time
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Request, status
+from jose import JWTError, jwt
+from ..core.config import settings
+from ..schemas import schemas
+from ..utils.idempotency import IdempotencyStore, idempotency_status, in_progress_error
+from .deps import oauth2_scheme
+
+class TokenBucket:
+    """
+    Per-key token bucket rate limiter
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        """
+        Take a token for key
+        Returns: 0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1.0:
+                self._buckets[key] = (tokens - 1.0, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1.0 - tokens) / self.rate
+            if len(self._buckets) > self.max_keys:
+                self._evict_full(now)
+        return wait
+
+    def _evict_full(self, now: float):
+        # Buckets that have refilled completely carry no state worth keeping
+        for key, (tokens, last) in list(self._buckets.items()):
+            if tokens + (now - last) * self.rate >= self.burst:
+                del self._buckets[key]
+
+class AdmissionController:
+    """
+    Bounded in-flight limit with a queue deadline, so a burst of work is
+    rejected quickly instead of exhausting the threadpool and DB pool
+    """
+
+    def __init__(self, max_in_flight: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.rejected = 0
+        self._semaphore = None
+
+    async def acquire(self) -> bool:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+# Idempotency scope of the prediction endpoint, keyed by user id
+PREDICTION_IDEMPOTENCY_SCOPE = "ml.predict"
+
+prediction_rate_limiter = TokenBucket(
+    rate=settings.PREDICT_RATE_LIMIT_PER_SECOND,
+    burst=settings.PREDICT_RATE_LIMIT_BURST,
+)
+prediction_admission = AdmissionController(
+    max_in_flight=settings.PREDICT_MAX_IN_FLIGHT,
+    queue_timeout=settings.PREDICT_QUEUE_TIMEOUT,
+)
+
+def _token_claims(token: str) -> dict:
+    # Decoding the JWT is enough to key the bucket; the user lookup happens
+    # later in get_current_user, only for admitted requests
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return {}
+
+async def _prediction_payload(request: Request) -> Optional[str]:
+    # The body in the canonical form predict_accident fingerprints
+    try:
+        return schemas.PredictionRequest.model_validate_json(await request.body()).model_dump_json()
+    except ValueError:
+        return None
+
+async def admit_prediction(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    Dependency guarding the prediction endpoint: per-user rate limit (429)
+    followed by the in-flight limit (503), both with Retry-After.
+
+    A retry with the same Idempotency-Key and body as a finished prediction
+    is let through without either, since it only replays that response. One
+    whose first request is still running gets 409 at once rather than
+    holding a slot while it waits.
+    """
+    claims = _token_claims(token)
+    key = claims.get("sub")
+    user_id = claims.get("uid")
+    if user_id is not None and idempotency_key:
+        state = idempotency_status(
+            idempotency_key, (PREDICTION_IDEMPOTENCY_SCOPE, user_id), await _prediction_payload(request)
+        )
+        if state == IdempotencyStore.DONE:
+            yield
+            return
+        if state == IdempotencyStore.RUNNING:
+            raise in_progress_error()
+    if key is not None:
+        wait = prediction_rate_limiter.acquire(key)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Prediction rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    if not await prediction_admission.acquire():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prediction service overloaded",
+            headers={"Retry-After": str(settings.PREDICT_RETRY_AFTER)},
+        )
+    try:
+        yield
+    finally:
+        prediction_admission.release()
\ No newline at end of file
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..utils import crud
+from ..utils.serialization import alert_serializer
 from ..schemas import schemas
+from ..core.config import settings
 from ..core.database import get_db
 from ..api import deps
+from ..api.etag import cache_headers, etag_matches, list_etag, not_modified
 
 router = APIRouter()
 
@@ -25,11 +28,13 @@ def create_alert(
 
 @router.get("/", response_model=List[schemas.Alert])
 def read_alerts(
+    response: Response,
     accident_id: int,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(deps.get_current_active_user)
+    current_user: schemas.User = Depends(deps.get_current_active_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
     # Verify the accident belongs to the user
     db_accident = crud.get_accident(db, accident_id=accident_id)
@@ -38,6 +43,13 @@ def read_alerts(
     if db_accident.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access alerts for this accident")
     
+    etag = list_etag(current_user, "alerts", accident_id, skip, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if settings.FAST_JSON_RESPONSES:
+        rows = crud.get_alert_rows(db, alert_serializer.columns, accident_id=accident_id, skip=skip, limit=limit)
+        return alert_serializer.response(rows, headers=cache_headers(etag))
+    response.headers.update(cache_headers(etag))
     alerts = crud.get_alerts(db, accident_id=accident_id, skip=skip, limit=limit)
     return alerts
 
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..utils import crud
+from ..utils.contact_cache import contact_cache
+from ..utils.serialization import contact_serializer
 from ..schemas import schemas
+from ..core.config import settings
 from ..core.database import get_db
 from ..api import deps
+from ..api.etag import cache_headers, etag_matches, list_etag, not_modified
 
 router = APIRouter()
 
@@ -14,15 +18,26 @@ def create_contact(
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(deps.get_current_active_user)
 ):
-    return crud.create_emergency_contact(db=db, contact=contact, user_id=current_user.id)
+    db_contact = crud.create_emergency_contact(db=db, contact=contact, user_id=current_user.id)
+    contact_cache.invalidate(current_user.id)
+    return db_contact
 
 @router.get("/", response_model=List[schemas.EmergencyContact])
 def read_contacts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(deps.get_current_active_user)
+    current_user: schemas.User = Depends(deps.get_current_active_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
+    etag = list_etag(current_user, "contacts", skip, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if settings.FAST_JSON_RESPONSES:
+        rows = crud.get_emergency_contact_rows(db, contact_serializer.columns, user_id=current_user.id, skip=skip, limit=limit)
+        return contact_serializer.response(rows, headers=cache_headers(etag))
+    response.headers.update(cache_headers(etag))
     contacts = crud.get_emergency_contacts(db, user_id=current_user.id, skip=skip, limit=limit)
     return contacts
 
@@ -51,7 +66,9 @@ def update_contact(
         raise HTTPException(status_code=404, detail="Contact not found")
     if db_contact.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this contact")
-    return crud.update_emergency_contact(db=db, contact_id=contact_id, contact_update=contact_update)
+    db_contact = crud.update_emergency_contact(db=db, contact_id=contact_id, contact_update=contact_update)
+    contact_cache.invalidate(current_user.id)
+    return db_contact
 
 @router.delete("/{contact_id}", response_model=schemas.EmergencyContact)
 def delete_contact(
@@ -64,4 +81,6 @@ def delete_contact(
         raise HTTPException(status_code=404, detail="Contact not found")
     if db_contact.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this contact")
-    return crud.delete_emergency_contact(db=db, contact_id=contact_id)
\ No newline at end of file
+    db_contact = crud.delete_emergency_contact(db=db, contact_id=contact_id)
+    contact_cache.invalidate(current_user.id)
+    return db_contact
\ No newline at end of file
@@ -31,4 +31,9 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
 def get_current_active_user(current_user: schemas.User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+def get_current_active_superuser(current_user: schemas.User = Depends(get_current_active_user)):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough privileges")
     return current_user
\ No newline at end of file
@@ -0,0 +1,39 @@
+import hashlib
+from typing import Hashable, Optional
+from fastapi import Response
+from ..core.config import settings
+
+def list_etag(user, *key: Hashable) -> str:
+    """
+    Weak ETag for one page of a user's list endpoint, built from the user's
+    change counter and the endpoint + query parameters so no rows have to be
+    read or serialized to compute it.
+    The counter is read with the user before the rows, so a write racing the
+    request can only make the tag older than the body, never newer.
+    """
+    digest = hashlib.blake2b(repr((settings.VERSION,) + key).encode(), digest_size=8).hexdigest()
+    return f'W/"{user.id}.{user.data_version}.{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against etag
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def cache_headers(etag: str) -> dict:
+    # Private data: browsers may keep it but must revalidate on every poll
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
\ No newline at end of file
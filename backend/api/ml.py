@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import numpy as np
 from ..utils import crud
 from ..schemas import schemas
 from ..core.database import get_db
 from ..api import deps
+from ..api.admission import PREDICTION_IDEMPOTENCY_SCOPE, admit_prediction
 from ..ml.model import load_model, preprocess_sensor_data
 from ..utils.alerts import send_alerts
+from ..utils.idempotency import run_idempotent
+from ..utils.coalescer import accident_coalescer
+from ..utils.contact_cache import contact_cache
+from ..utils.facility_lookup import facility_directory
 
 router = APIRouter()
 
@@ -24,14 +29,29 @@ async def load_model_on_startup():
 @router.post("/predict", response_model=schemas.PredictionResponse)
 def predict_accident(
     request: schemas.PredictionRequest,
+    admitted: None = Depends(admit_prediction),
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(deps.get_current_active_user)
+    current_user: schemas.User = Depends(deps.get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
+    # Retried uploads replay the first response without re-running inference,
+    # DB writes or alert fan-out
+    return run_idempotent(
+        idempotency_key,
+        (PREDICTION_IDEMPOTENCY_SCOPE, current_user.id),
+        request.model_dump_json(),
+        lambda: run_prediction(request, db, current_user)
+    )
+
+def run_prediction(request: schemas.PredictionRequest, db: Session, current_user: schemas.User):
     global model
     
     if model is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
     
+    # Read once; commits below expire the ORM user
+    user_id = current_user.id
+    
     try:
         # Preprocess sensor data
         sensor_data = [data.dict() for data in request.sensor_data]
@@ -44,55 +64,70 @@ def predict_accident(
         
         # If it's an accident, trigger alerts
         if is_accident:
-            # Get user's emergency contacts
-            contacts = crud.get_emergency_contacts(db, user_id=current_user.id)
-            contact_dicts = [
-                {
-                    "id": contact.id,
-                    "name": contact.name,
-                    "phone_number": contact.phone_number,
-                    "email": contact.email
-                }
-                for contact in contacts
-            ]
-            
             # Get latest sensor data point for location
             latest_data = sensor_data[-1] if sensor_data else {}
-            accident_info = {
-                "location": f"Lat: {latest_data.get('latitude', 'N/A')}, Lon: {latest_data.get('longitude', 'N/A')}",
-                "confidence": confidence,
-                "time": latest_data.get('timestamp', 'N/A')
-            }
+            latitude = latest_data.get('latitude')
+            longitude = latest_data.get('longitude')
             
-            # Send alerts
-            alert_results = send_alerts(contact_dicts, accident_info)
+            with accident_coalescer.lock(user_id):
+                # Further positive windows from the same crash update the open
+                # accident instead of creating a new one and alerting again
+                if accident_coalescer.attach(db, user_id, latitude, longitude, confidence) is not None:
+                    return schemas.PredictionResponse(
+                        is_accident=is_accident,
+                        confidence=confidence
+                    )
+                # Positives arriving while the alerts below are sent attach to this
+                event = accident_coalescer.open(user_id, latitude, longitude, confidence)
             
-            # Save accident to database
-            if sensor_data:
-                accident_create = schemas.AccidentCreate(
-                    latitude=latest_data.get('latitude', 0),
-                    longitude=latest_data.get('longitude', 0),
-                    acceleration_x=latest_data.get('acceleration_x', 0),
-                    acceleration_y=latest_data.get('acceleration_y', 0),
-                    acceleration_z=latest_data.get('acceleration_z', 0),
-                    gyroscope_x=latest_data.get('gyroscope_x', 0),
-                    gyroscope_y=latest_data.get('gyroscope_y', 0),
-                    gyroscope_z=latest_data.get('gyroscope_z', 0),
-                    speed=latest_data.get('speed'),
-                    confidence_score=confidence
-                )
-                accident = crud.create_accident(db, accident_create, current_user.id)
+            try:
+                # Get user's emergency contacts, cached in dispatch format
+                contact_dicts = contact_cache.get(db, user_id)
+                
+                accident_info = {
+                    "location": f"Lat: {latitude if latitude is not None else 'N/A'}, Lon: {longitude if longitude is not None else 'N/A'}",
+                    "confidence": confidence,
+                    "time": latest_data.get('timestamp', 'N/A'),
+                    "facilities": facility_directory.nearest(latitude, longitude)
+                }
+                
+                # Send alerts, outside the per-user lock
+                alert_results = send_alerts(contact_dicts, accident_info)
                 
-                # Save alerts to database
-                for result in alert_results:
-                    alert_create = schemas.AlertCreate(
-                        accident_id=accident.id,
-                        alert_type=result["type"],
-                        recipient=result["recipient"],
-                        status="SENT" if result["success"] else "FAILED",
-                        message=f"Accident alert with {confidence*100:.1f}% confidence"
+                # Save accident to database
+                if sensor_data:
+                    saved_confidence = event.peak_confidence
+                    accident_create = schemas.AccidentCreate(
+                        latitude=latitude or 0,
+                        longitude=longitude or 0,
+                        acceleration_x=latest_data.get('acceleration_x', 0),
+                        acceleration_y=latest_data.get('acceleration_y', 0),
+                        acceleration_z=latest_data.get('acceleration_z', 0),
+                        gyroscope_x=latest_data.get('gyroscope_x', 0),
+                        gyroscope_y=latest_data.get('gyroscope_y', 0),
+                        gyroscope_z=latest_data.get('gyroscope_z', 0),
+                        speed=latest_data.get('speed'),
+                        confidence_score=saved_confidence
                     )
-                    crud.create_alert(db, alert_create)
+                    alerts = [
+                        schemas.AlertBase(
+                            alert_type=result["type"],
+                            recipient=result["recipient"],
+                            status="SENT" if result["success"] else "FAILED",
+                            message=f"Accident alert with {confidence*100:.1f}% confidence"
+                        )
+                        for result in alert_results
+                    ]
+                    # Accident and alerts are saved in one transaction
+                    accident_id = crud.create_accident_with_alerts(db, accident_create, user_id, alerts)
+                    
+                    with accident_coalescer.lock(user_id):
+                        accident_coalescer.save(db, event, accident_id, saved_confidence)
+                else:
+                    accident_coalescer.discard(user_id, event)
+            except Exception:
+                accident_coalescer.discard(user_id, event)
+                raise
         
         return schemas.PredictionResponse(
             is_accident=is_accident,
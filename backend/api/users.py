@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from ..utils import crud
+from ..utils.contact_cache import contact_cache
 from ..schemas import schemas
 from ..core.database import get_db
 from ..core.security import create_access_token
@@ -23,9 +24,12 @@ def login(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db_user = crud.authenticate_user(db, email=user.email, password=user.password)
     if not db_user:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    # Warm the contact cache so the first alert after login needs no contact query
+    contact_cache.warm(db, db_user.id)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": db_user.email}, expires_delta=access_token_expires
+        # uid lets admission find the user's idempotency keys before the user is loaded
+        data={"sub": db_user.email, "uid": db_user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -32,6 +32,43 @@ class Settings(BaseSettings):
     SENDGRID_API_KEY: Optional[str] = None
     EMAIL_FROM: Optional[str] = None
     
+    # Profiling settings (disabled unless a token or sampling rate is set)
+    PROFILING_ADMIN_TOKEN: Optional[str] = None  # Requests sending X-Profile: <token> are profiled
+    PROFILING_SAMPLE_RATE: float = 0.0           # Fraction of requests profiled at random
+    PROFILING_INTERVAL: float = 0.005            # Stack sampling interval in seconds
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 50
+    
+    # Prediction admission control
+    PREDICT_MAX_IN_FLIGHT: int = 8                 # Concurrent predictions allowed
+    PREDICT_QUEUE_TIMEOUT: float = 0.5             # Seconds a request may wait for a slot
+    PREDICT_RETRY_AFTER: int = 2                   # Retry-After seconds when overloaded
+    PREDICT_RATE_LIMIT_PER_SECOND: float = 2.0     # Sustained predictions per user
+    PREDICT_RATE_LIMIT_BURST: int = 10             # Burst size per user
+    
+    # Idempotency-Key handling for device uploads
+    IDEMPOTENCY_TTL_SECONDS: int = 86400           # How long a stored response is replayed
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 1.0          # Max wait on an in-flight duplicate before 409
+    IDEMPOTENCY_RETRY_AFTER: int = 2               # Retry-After on that 409
+    
+    # Accident coalescing: positives within this window and radius of the
+    # user's open accident are attached to it instead of alerting again
+    ACCIDENT_COALESCE_SECONDS: int = 120
+    ACCIDENT_COALESCE_RADIUS_METERS: float = 500.0
+    
+    # Emergency contacts cached for alert fan-out
+    CONTACT_CACHE_TTL_SECONDS: int = 300
+    CONTACT_CACHE_MAX_USERS: int = 10000
+    
+    # List endpoints select column tuples and encode them with orjson
+    FAST_JSON_RESPONSES: bool = True
+    
+    # Facility JSON files ([name, [lat, lon], phone] entries) for naming the
+    # nearest hospital / police station in alerts; needs the facilities package
+    FACILITY_HOSPITALS_PATH: Optional[str] = None
+    FACILITY_POLICE_PATH: Optional[str] = None
+    
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,217 @@
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from ..core.config import settings
+
+# Only one request is profiled at a time so samples and allocations
+# can be attributed to it
+_profile_lock = threading.Lock()
+
+# Stacks that never enter application code (idle workers, the event loop
+# waiting on sockets) are dropped from the profile
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE_HEADER = b"x-profile"
+
+class RequestProfiler:
+    """
+    Statistical stack sampler plus tracemalloc delta for a single request
+
+    Stacks are sampled process-wide: sync endpoints run on threadpool
+    workers that cannot be told apart from other requests' workers, so
+    every thread in application code is recorded, prefixed with its
+    thread name. Concurrent requests and background threads therefore
+    show up in the profile too.
+    """
+
+    def __init__(self, interval: float = 0.005, top_allocations: int = 25):
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracemalloc = False
+        self._snapshot = None
+        self._started_at = 0.0
+        self.duration = 0.0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._snapshot = tracemalloc.take_snapshot()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        self.duration = time.perf_counter() - self._started_at
+        self._stop.set()
+        self._thread.join()
+
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        allocations = [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[:self.top_allocations]
+        ]
+        return {
+            "duration_ms": self.duration * 1000.0,
+            "interval_ms": self.interval * 1000.0,
+            "samples": self.samples,
+            # Not only the profiled request, see the class docstring
+            "scope": "process",
+            "stacks": [
+                {"stack": stack, "count": count}
+                for stack, count in self.stacks.most_common()
+            ],
+            "allocations": allocations,
+        }
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _collapse(frame)
+                if stack is not None:
+                    self.stacks[f"{names.get(thread_id, thread_id)};{stack}"] += 1
+            self.samples += 1
+
+def _collapse(frame) -> Optional[str]:
+    """
+    Collapse a frame into flamegraph "outer;...;inner" format, or None
+    if the stack never passes through application code
+    """
+    names = []
+    in_app = False
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_APP_ROOT):
+            in_app = True
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    if not in_app:
+        return None
+    return ";".join(reversed(names))
+
+def should_profile(scope) -> bool:
+    """
+    Decide whether a request is profiled, either through the admin header
+    or the configured sampling rate
+    """
+    if settings.PROFILING_ADMIN_TOKEN:
+        token = settings.PROFILING_ADMIN_TOKEN.encode()
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER and hmac.compare_digest(value, token):
+                return True
+    return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+def write_profile(profile: dict) -> str:
+    """
+    Write a profile to the profiling directory and rotate old ones
+    Returns: name of the written profile
+    """
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}.json"
+    with open(os.path.join(settings.PROFILING_DIR, name), "w") as f:
+        json.dump(profile, f)
+
+    profiles = sorted(p for p in os.listdir(settings.PROFILING_DIR) if p.endswith(".json"))
+    for old in profiles[:max(0, len(profiles) - settings.PROFILING_MAX_FILES)]:
+        try:
+            os.remove(os.path.join(settings.PROFILING_DIR, old))
+        except OSError:
+            pass
+    return name
+
+def list_profiles() -> List[dict]:
+    """
+    List stored profiles, newest first
+    """
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(settings.PROFILING_DIR), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        stat = os.stat(os.path.join(settings.PROFILING_DIR, name))
+        profiles.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.utcfromtimestamp(stat.st_mtime),
+        })
+    return profiles
+
+def get_profile_path(name: str) -> Optional[str]:
+    """
+    Resolve a profile name to its path, rejecting anything outside the profiling directory
+    """
+    if os.path.basename(name) != name or not name.endswith(".json"):
+        return None
+    path = os.path.join(settings.PROFILING_DIR, name)
+    if not os.path.isfile(path):
+        return None
+    return path
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected requests. When profiling is not
+    configured the only cost is a couple of attribute lookups per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profile_lock.acquire(blocking=False):
+            # Another request is already being profiled
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = RequestProfiler(interval=settings.PROFILING_INTERVAL)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile = profiler.stop()
+            _profile_lock.release()
+            profile.update({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+            })
+            try:
+                await run_in_threadpool(write_profile, profile)
+            except Exception as e:
+                print(f"Failed to write profile: {e}")
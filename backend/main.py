@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api import users, accidents, contacts, alerts, ml
+from .api import users, accidents, contacts, alerts, ml, admin
 from .core.config import settings
+from .core.profiling import ProfilingMiddleware
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -18,12 +19,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Add opt-in request profiling
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(accidents.router, prefix="/api/v1/accidents", tags=["accidents"])
 app.include_router(contacts.router, prefix="/api/v1/contacts", tags=["contacts"])
 app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["alerts"])
 app.include_router(ml.router, prefix="/api/v1/ml", tags=["ml"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 @app.get("/")
 async def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Float, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -15,6 +15,8 @@ class User(Base):
     is_superuser = Column(Boolean(), default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped on every write to the user's accidents, contacts or alerts; list ETags are built from it
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     accidents = relationship("Accident", back_populates="user")
@@ -38,10 +40,20 @@ class Accident(Base):
     confidence_score = Column(Float, nullable=True)
     is_confirmed = Column(Boolean(), default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Geohash cell of the location as an integer (see utils.geo), NULL without a GPS fix
+    geocell = Column(BigInteger, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="accidents")
     alerts = relationship("Alert", back_populates="accident")
+    
+    __table_args__ = (
+        # Recent accidents per user, used to coalesce repeated detections
+        Index("ix_accidents_user_id_timestamp", "user_id", "timestamp"),
+        # Radius queries over a user's accidents and global hotspot counts
+        Index("ix_accidents_user_id_geocell", "user_id", "geocell"),
+        Index("ix_accidents_geocell", "geocell"),
+    )
 
 class EmergencyContact(Base):
     __tablename__ = "emergency_contacts"
@@ -70,4 +82,15 @@ class Alert(Base):
     message = Column(Text, nullable=True)
     
     # Relationships
-    accident = relationship("Accident", back_populates="alerts")
\ No newline at end of file
+    accident = relationship("Accident", back_populates="alerts")
+
+class AccidentStat(Base):
+    __tablename__ = "accident_stats"
+    
+    # Per-user accident counts, kept up to date on every accident write so
+    # the stats endpoint never scans the accidents table
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    dimension = Column(String, primary_key=True)  # total, day, hour, confidence, location
+    bucket = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    confirmed = Column(Integer, nullable=False, default=0)
\ No newline at end of file
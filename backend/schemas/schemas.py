@@ -51,7 +51,7 @@ class AccidentBase(BaseModel):
     speed: Optional[float] = None
 
 class AccidentCreate(AccidentBase):
-    pass
+    confidence_score: Optional[float] = None
 
 class AccidentUpdate(BaseModel):
     is_confirmed: bool
@@ -70,6 +70,38 @@ class AccidentInDBBase(AccidentBase):
 class Accident(AccidentInDBBase):
     pass
 
+class AccidentNearby(Accident):
+    distance_m: float
+
+class Hotspot(BaseModel):
+    geohash: str
+    latitude: float  # Cell center
+    longitude: float
+    count: int
+    confirmed: int
+
+class StatBucket(BaseModel):
+    bucket: str
+    count: int
+    confirmed: int
+
+class LocationBucket(BaseModel):
+    latitude: float  # South-west corner of the cell
+    longitude: float
+    count: int
+    confirmed: int
+
+class AccidentStats(BaseModel):
+    total: int
+    confirmed: int
+    potential: int
+    low_confidence: int
+    confirmation_rate: float
+    by_day: List[StatBucket]
+    by_hour: List[StatBucket]
+    confidence_histogram: List[StatBucket]
+    locations: List[LocationBucket]
+
 # Emergency contact schemas
 class EmergencyContactBase(BaseModel):
     name: str
@@ -129,10 +161,18 @@ class SensorData(BaseModel):
     gyroscope_y: float
     gyroscope_z: float
     speed: Optional[float] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
 class PredictionRequest(BaseModel):
     sensor_data: List[SensorData]
 
 class PredictionResponse(BaseModel):
     is_accident: bool
-    confidence: float
\ No newline at end of file
+    confidence: float
+
+# Admin schemas
+class ProfileInfo(BaseModel):
+    name: str
+    size: int
+    created_at: datetime
\ No newline at end of file
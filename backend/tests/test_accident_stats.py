@@ -0,0 +1,127 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.api import accidents
+from backend.core.database import Base, get_db
+from backend.core.security import create_access_token
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+from backend.utils import stats as stats_module
+from backend.utils.stats import confidence_bucket, location_bucket, summarize
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+def make_user(db, email="stats@example.com"):
+    user = models.User(email=email, hashed_password="x", full_name="Stats User")
+    db.add(user)
+    db.commit()
+    return user.id
+
+def make_accident(latitude=52.52, longitude=13.405, confidence=0.9):
+    return schemas.AccidentCreate(
+        latitude=latitude, longitude=longitude,
+        acceleration_x=0, acceleration_y=0, acceleration_z=3.5,
+        gyroscope_x=0, gyroscope_y=0, gyroscope_z=0,
+        confidence_score=confidence
+    )
+
+def full_scan(db, user_id):
+    # What Reports.tsx computes in the browser
+    rows = db.query(models.Accident).filter(models.Accident.user_id == user_id).all()
+    confirmed = sum(1 for row in rows if row.is_confirmed)
+    potential = sum(1 for row in rows if not row.is_confirmed and row.confidence_score and row.confidence_score > 0.7)
+    return len(rows), confirmed, potential
+
+def test_buckets():
+    assert confidence_bucket(0.7) == "0.6-0.7"
+    assert confidence_bucket(0.71) == "0.7-0.8"
+    assert confidence_bucket(0.0) == "0.0-0.1"
+    assert confidence_bucket(1.0) == "0.9-1.0"
+    assert confidence_bucket(None) == "none"
+    assert location_bucket(52.52, 13.405) == "52.5,13.4"
+    assert location_bucket(-33.87, 151.21) == "-33.9,151.2"
+    assert location_bucket(0, 0) is None
+
+def test_rollup_tracks_inserts_confirmations_and_raises(db):
+    user_id = make_user(db)
+    other_id = make_user(db, "other@example.com")
+    first = crud.create_accident(db, make_accident(confidence=0.95), user_id)
+    crud.create_accident(db, make_accident(latitude=48.85, longitude=2.35, confidence=0.7), user_id)
+    crud.create_accident(db, make_accident(latitude=0, longitude=0, confidence=None), user_id)
+    raised_id = crud.create_accident_with_alerts(db, make_accident(confidence=0.55), user_id, [])
+    crud.create_accident(db, make_accident(), other_id)
+
+    crud.update_accident(db, first.id, schemas.AccidentUpdate(is_confirmed=True))
+    crud.update_accident(db, first.id, schemas.AccidentUpdate(is_confirmed=True))
+    crud.raise_accident_confidence(db, raised_id, 0.85)
+    crud.raise_accident_confidence(db, raised_id, 0.6)
+
+    stats = summarize(crud.get_accident_stat_rows(db, user_id))
+    assert (stats.total, stats.confirmed, stats.potential) == full_scan(db, user_id) == (4, 1, 1)
+    assert stats.low_confidence == 2
+    assert stats.confirmation_rate == pytest.approx(0.25)
+    assert {item.bucket: item.count for item in stats.confidence_histogram} == {
+        "0.9-1.0": 1, "0.6-0.7": 1, "none": 1, "0.8-0.9": 1
+    }
+    assert sum(item.count for item in stats.by_day) == 4
+    assert sum(item.count for item in stats.by_hour) == 4
+    # The 0,0 accident has no fix and is left out of the location cells
+    assert [(cell.latitude, cell.longitude, cell.count, cell.confirmed) for cell in stats.locations] == [
+        (52.5, 13.4, 2, 1), (48.8, 2.3, 1, 0)
+    ]
+
+    crud.update_accident(db, first.id, schemas.AccidentUpdate(is_confirmed=False))
+    stats = summarize(crud.get_accident_stat_rows(db, user_id))
+    assert (stats.total, stats.confirmed, stats.potential) == full_scan(db, user_id) == (4, 0, 2)
+
+def test_dialect_without_upsert_uses_locked_path(db, monkeypatch):
+    # As on MySQL, where there is no ON CONFLICT upsert
+    monkeypatch.setattr(stats_module, "_UPSERTS", {})
+    user_id = make_user(db)
+    first = crud.create_accident(db, make_accident(confidence=0.95), user_id)
+    crud.create_accident(db, make_accident(confidence=0.75), user_id)
+    crud.update_accident(db, first.id, schemas.AccidentUpdate(is_confirmed=True))
+
+    stats = summarize(crud.get_accident_stat_rows(db, user_id))
+    assert (stats.total, stats.confirmed, stats.potential) == full_scan(db, user_id) == (2, 1, 1)
+    assert [(cell.count, cell.confirmed) for cell in stats.locations] == [(2, 1)]
+
+def test_stats_endpoint(session_factory):
+    app = FastAPI()
+    app.include_router(accidents.router, prefix="/api/v1/accidents")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    db = session_factory()
+    user_id = make_user(db)
+    crud.create_accident(db, make_accident(), user_id)
+    db.close()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'stats@example.com'})}"}
+    with TestClient(app) as client:
+        response = client.get("/api/v1/accidents/stats?days=7", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        assert len(response.json()["by_day"]) == 1
+        etag = response.headers["ETag"]
+        assert client.get("/api/v1/accidents/stats?days=7", headers=dict(headers, **{"If-None-Match": etag})).status_code == 304
\ No newline at end of file
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from backend.api import admission
+from backend.core.security import create_access_token
+from backend.schemas import schemas
+from backend.utils import idempotency
+
+guarded_app = FastAPI()
+
+@guarded_app.post("/predict")
+def predict(admitted: None = Depends(admission.admit_prediction)):
+    return {"ok": True}
+
+@guarded_app.get("/health")
+def health():
+    return {"status": "healthy"}
+
+def auth_headers(email: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+def test_token_bucket_refills():
+    bucket = admission.TokenBucket(rate=10.0, burst=2)
+    assert bucket.acquire("user") == 0
+    assert bucket.acquire("user") == 0
+    wait = bucket.acquire("user")
+    assert 0 < wait <= 0.1
+    # Other users have their own bucket
+    assert bucket.acquire("other") == 0
+
+def test_admission_controller_rejects_after_deadline():
+    async def scenario():
+        controller = admission.AdmissionController(max_in_flight=1, queue_timeout=0.01)
+        assert await controller.acquire()
+        assert not await controller.acquire()
+        assert controller.rejected == 1
+        controller.release()
+        assert await controller.acquire()
+        controller.release()
+        return controller.in_flight
+    assert asyncio.run(scenario()) == 0
+
+def test_rate_limited_prediction_returns_429(monkeypatch):
+    monkeypatch.setattr(admission, "prediction_rate_limiter", admission.TokenBucket(rate=0.5, burst=2))
+    headers = auth_headers("ratelimit@example.com")
+    with TestClient(guarded_app) as client:
+        assert client.post("/predict", headers=headers).status_code == 200
+        assert client.post("/predict", headers=headers).status_code == 200
+        response = client.post("/predict", headers=headers)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        # Unrelated routes are not affected
+        assert client.get("/health").status_code == 200
+        # Slots are released after each admitted request
+        assert admission.prediction_admission.in_flight == 0
+
+def test_overloaded_prediction_returns_503(monkeypatch):
+    controller = admission.AdmissionController(max_in_flight=0, queue_timeout=0.01)
+    monkeypatch.setattr(admission, "prediction_admission", controller)
+    with TestClient(guarded_app) as client:
+        response = client.post("/predict", headers=auth_headers("overload@example.com"))
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+PAYLOAD = {"sensor_data": [{
+    "timestamp": "2024-01-01T12:00:00", "acceleration_x": 0.1, "acceleration_y": 0.2, "acceleration_z": 9.8,
+    "gyroscope_x": 0, "gyroscope_y": 0, "gyroscope_z": 0
+}]}
+
+def stored_payload(payload=PAYLOAD):
+    return schemas.PredictionRequest.model_validate(payload).model_dump_json()
+
+def user_headers(email, user_id, key):
+    token = create_access_token({"sub": email, "uid": user_id})
+    return {"Authorization": f"Bearer {token}", "Idempotency-Key": key}
+
+def test_stored_replay_skips_rate_limit(monkeypatch):
+    monkeypatch.setattr(admission, "prediction_rate_limiter", admission.TokenBucket(rate=0.5, burst=1))
+    monkeypatch.setattr(idempotency, "idempotency_store", idempotency.IdempotencyStore(60.0, 100, 5.0))
+    idempotency.run_idempotent("retry-1", (admission.PREDICTION_IDEMPOTENCY_SCOPE, 7), stored_payload(), lambda: "stored")
+    headers = auth_headers("replay@example.com")
+    with TestClient(guarded_app) as client:
+        assert client.post("/predict", headers=headers).status_code == 200
+        assert client.post("/predict", headers=headers).status_code == 429
+        # A retry of the finished prediction is a replay, not new work
+        response = client.post("/predict", json=PAYLOAD, headers=user_headers("replay@example.com", 7, "retry-1"))
+        assert response.status_code == 200
+        # Unknown keys are still rate limited
+        response = client.post("/predict", json=PAYLOAD, headers=user_headers("replay@example.com", 7, "retry-2"))
+        assert response.status_code == 429
+
+def test_reused_key_with_other_body_is_rate_limited(monkeypatch):
+    monkeypatch.setattr(admission, "prediction_rate_limiter", admission.TokenBucket(rate=0.5, burst=1))
+    monkeypatch.setattr(idempotency, "idempotency_store", idempotency.IdempotencyStore(60.0, 100, 5.0))
+    idempotency.run_idempotent("old-key", (admission.PREDICTION_IDEMPOTENCY_SCOPE, 8), stored_payload(), lambda: "stored")
+    other = {"sensor_data": [dict(PAYLOAD["sensor_data"][0], acceleration_z=1.0)]}
+    headers = user_headers("cycle@example.com", 8, "old-key")
+    with TestClient(guarded_app) as client:
+        assert client.post("/predict", json=other, headers=headers).status_code == 200
+        # Cycling one stored key with new bodies does not get around the bucket
+        assert client.post("/predict", json=other, headers=headers).status_code == 429
+
+def test_in_flight_duplicate_is_rejected_before_taking_a_slot(monkeypatch):
+    store = idempotency.IdempotencyStore(60.0, 100, 5.0)
+    monkeypatch.setattr(idempotency, "idempotency_store", store)
+    controller = admission.AdmissionController(max_in_flight=0, queue_timeout=0.01)
+    monkeypatch.setattr(admission, "prediction_admission", controller)
+    started, release = threading.Event(), threading.Event()
+    scope = (admission.PREDICTION_IDEMPOTENCY_SCOPE, 9)
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=lambda: idempotency.run_idempotent("slow-key", scope, stored_payload(), slow))
+    worker.start()
+    started.wait(5)
+    try:
+        with TestClient(guarded_app) as client:
+            response = client.post("/predict", json=PAYLOAD, headers=user_headers("slow@example.com", 9, "slow-key"))
+    finally:
+        release.set()
+        worker.join(5)
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "2"
+    assert controller.rejected == 0
\ No newline at end of file
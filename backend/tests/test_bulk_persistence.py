@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.core.database import Base
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+@pytest.fixture()
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+def make_accident():
+    return schemas.AccidentCreate(
+        latitude=52.52, longitude=13.405,
+        acceleration_x=0, acceleration_y=0, acceleration_z=3.5,
+        gyroscope_x=0, gyroscope_y=0, gyroscope_z=0,
+        confidence_score=0.9
+    )
+
+def make_alerts(count):
+    return [
+        schemas.AlertBase(alert_type="SMS", recipient=f"+10{i}", status="SENT", message="alert")
+        for i in range(count)
+    ]
+
+def test_accident_and_alerts_saved_together(engine, db):
+    user = models.User(email="bulk@example.com", hashed_password="x", full_name="Bulk User")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    accident_id = crud.create_accident_with_alerts(db, make_accident(), user_id, make_alerts(3))
+
+    # One INSERT ... RETURNING for the accident, one batched INSERT for the
+    # alerts, the stats rollup upsert and the user's change counter bump;
+    # nothing is read back
+    assert len(statements) == 4
+    assert not any(statement.lstrip().startswith("SELECT") for statement in statements)
+    accident = crud.get_accident(db, accident_id)
+    assert accident.user_id == user_id
+    assert accident.confidence_score == pytest.approx(0.9)
+    assert accident.timestamp is not None
+    assert sorted(alert.recipient for alert in accident.alerts) == ["+100", "+101", "+102"]
+    assert all(alert.sent_at is not None for alert in accident.alerts)
+
+def test_failed_alert_insert_rolls_back_accident(db):
+    user = models.User(email="bulk@example.com", hashed_password="x", full_name="Bulk User")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    bad_alert = schemas.AlertBase.model_construct(alert_type="SMS", recipient=None, status="SENT", message=None)
+    with pytest.raises(Exception):
+        crud.create_accident_with_alerts(db, make_accident(), user_id, [bad_alert])
+    db.rollback()
+    assert db.query(models.Accident).count() == 0
\ No newline at end of file
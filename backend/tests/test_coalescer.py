@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.core.database import Base
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+from backend.utils.coalescer import AccidentCoalescer
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+def make_user(db):
+    user = models.User(email="coalesce@example.com", hashed_password="x", full_name="Coalesce User")
+    db.add(user)
+    db.commit()
+    return user
+
+def make_accident(db, user_id, latitude, longitude, confidence):
+    accident = schemas.AccidentCreate(
+        latitude=latitude, longitude=longitude,
+        acceleration_x=0, acceleration_y=0, acceleration_z=1,
+        gyroscope_x=0, gyroscope_y=0, gyroscope_z=0,
+        confidence_score=confidence
+    )
+    return crud.create_accident(db, accident, user_id)
+
+def test_positive_within_window_and_radius_attaches(db):
+    user = make_user(db)
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    now = datetime.utcnow()
+
+    assert coalescer.attach(db, user.id, 52.5200, 13.4050, 0.7, now=now) is None
+    accident = make_accident(db, user.id, 52.5200, 13.4050, 0.7)
+    coalescer.record(user.id, accident.id, 52.5200, 13.4050, 0.7, now=now)
+
+    # ~50 m away, 10 s later, with a higher score
+    attached = coalescer.attach(db, user.id, 52.5204, 13.4052, 0.95, now=now + timedelta(seconds=10))
+    assert attached.accident_id == accident.id
+    db.refresh(accident)
+    assert accident.confidence_score == pytest.approx(0.95)
+
+    # A lower score never lowers the peak
+    coalescer.attach(db, user.id, 52.5200, 13.4050, 0.6, now=now + timedelta(seconds=20))
+    db.refresh(accident)
+    assert accident.confidence_score == pytest.approx(0.95)
+    assert db.query(models.Accident).count() == 1
+
+def test_positive_far_away_or_late_opens_new_accident(db):
+    user = make_user(db)
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    now = datetime.utcnow()
+    accident = make_accident(db, user.id, 52.5200, 13.4050, 0.7)
+    coalescer.record(user.id, accident.id, 52.5200, 13.4050, 0.7, now=now)
+
+    # ~1.1 km away
+    assert coalescer.attach(db, user.id, 52.5300, 13.4050, 0.9, now=now + timedelta(seconds=5)) is None
+    # Same place, after the window closed
+    assert coalescer.attach(db, user.id, 52.5200, 13.4050, 0.9, now=now + timedelta(seconds=120)) is None
+
+def test_missing_location_matches_on_time_only(db):
+    user = make_user(db)
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    now = datetime.utcnow()
+    accident = make_accident(db, user.id, 52.5200, 13.4050, 0.7)
+    coalescer.record(user.id, accident.id, 52.5200, 13.4050, 0.7, now=now)
+    assert coalescer.attach(db, user.id, None, None, 0.8, now=now + timedelta(seconds=5)).accident_id == accident.id
+
+def test_open_accident_found_in_database_after_restart(db):
+    user = make_user(db)
+    accident = make_accident(db, user.id, 52.5200, 13.4050, 0.7)
+    # A fresh coalescer has an empty index, as after a restart or on another worker
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    assert coalescer.attach(db, user.id, 52.5201, 13.4050, 0.8).accident_id == accident.id
+
+def test_pending_accident_coalesces_while_alerts_are_sent(db):
+    user = make_user(db)
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    now = datetime.utcnow()
+    with coalescer.lock(user.id):
+        assert coalescer.attach(db, user.id, 52.5200, 13.4050, 0.7, now=now) is None
+        event = coalescer.open(user.id, 52.5200, 13.4050, 0.7, now=now)
+
+    # The lock is released during the send, so the next positive coalesces
+    with coalescer.lock(user.id):
+        pending = coalescer.attach(db, user.id, 52.5201, 13.4050, 0.8, now=now + timedelta(seconds=2))
+    assert pending is event and event.accident_id is None
+
+    accident = make_accident(db, user.id, 52.5200, 13.4050, 0.8)
+    # Raised again between the insert and save()
+    coalescer.attach(db, user.id, 52.5200, 13.4050, 0.9, now=now + timedelta(seconds=3))
+    with coalescer.lock(user.id):
+        coalescer.save(db, event, accident.id, 0.8)
+    db.refresh(accident)
+    assert accident.confidence_score == pytest.approx(0.9)
+    assert coalescer.attach(db, user.id, 52.5200, 13.4050, 0.5, now=now + timedelta(seconds=4)).accident_id == accident.id
+
+def test_discarded_pending_accident_is_forgotten(db):
+    user = make_user(db)
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    event = coalescer.open(user.id, 52.5200, 13.4050, 0.7)
+    coalescer.discard(user.id, event)
+    assert coalescer.attach(db, user.id, 52.5200, 13.4050, 0.7) is None
+
+def test_user_locks_are_released():
+    coalescer = AccidentCoalescer(window_seconds=60, radius_meters=200)
+    for user_id in range(100):
+        with coalescer.lock(user_id):
+            assert user_id in coalescer._locks
+    assert coalescer._locks == {}
\ No newline at end of file
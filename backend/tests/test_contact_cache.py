@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.core.database import Base
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+from backend.utils.contact_cache import ContactCache
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+@pytest.fixture()
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+def count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+def make_user_with_contact(db):
+    user = models.User(email="cache@example.com", hashed_password="x", full_name="Cache User")
+    db.add(user)
+    db.commit()
+    crud.create_emergency_contact(
+        db, schemas.EmergencyContactCreate(name="Alice", phone_number="+100", email="alice@example.com"), user.id
+    )
+    return user
+
+def test_hot_cache_needs_no_queries(engine, db):
+    user = make_user_with_contact(db)
+    cache = ContactCache(ttl=60)
+    cache.warm(db, user.id)
+
+    statements = count_queries(engine)
+    contacts = cache.get(db, user.id)
+    assert statements == []
+    assert contacts[0]["name"] == "Alice"
+    assert set(contacts[0]) == {"id", "name", "phone_number", "email"}
+    assert cache.hits == 1
+
+def test_invalidate_reloads_contacts(db):
+    user = make_user_with_contact(db)
+    cache = ContactCache(ttl=60)
+    assert len(cache.get(db, user.id)) == 1
+
+    crud.create_emergency_contact(db, schemas.EmergencyContactCreate(name="Bob", phone_number="+200"), user.id)
+    assert len(cache.get(db, user.id)) == 1
+    cache.invalidate(user.id)
+    assert [contact["name"] for contact in cache.get(db, user.id)] == ["Alice", "Bob"]
+
+def test_load_racing_an_invalidation_is_not_stored(db, monkeypatch):
+    user = make_user_with_contact(db)
+    cache = ContactCache(ttl=60)
+    original = crud.get_emergency_contacts
+
+    def invalidating_load(*args, **kwargs):
+        contacts = original(*args, **kwargs)
+        cache.invalidate(user.id)
+        return contacts
+
+    monkeypatch.setattr(crud, "get_emergency_contacts", invalidating_load)
+    cache.get(db, user.id)
+    monkeypatch.setattr(crud, "get_emergency_contacts", original)
+    cache.get(db, user.id)
+    assert cache.misses == 2
+
+def test_expired_entries_are_reloaded(db):
+    user = make_user_with_contact(db)
+    cache = ContactCache(ttl=0)
+    cache.get(db, user.id)
+    cache.get(db, user.id)
+    assert cache.misses == 2
+
+def test_cache_is_bounded_and_prunes_expired(db):
+    users = []
+    for index in range(3):
+        user = models.User(email=f"bounded{index}@example.com", hashed_password="x", full_name="Bounded")
+        db.add(user)
+        db.commit()
+        users.append(user)
+    cache = ContactCache(ttl=60, max_users=2)
+    for user in users:
+        cache.get(db, user.id)
+    assert list(cache._entries) == [users[1].id, users[2].id]
+
+    cache = ContactCache(ttl=0)
+    for user in users:
+        cache.get(db, user.id)
+    # Expired entries are dropped on the next store, not only on reload
+    assert len(cache._entries) <= 1
\ No newline at end of file
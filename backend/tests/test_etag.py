@@ -0,0 +1,109 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.api import accidents, alerts, contacts
+from backend.api.etag import etag_matches
+from backend.core.database import Base, get_db
+from backend.core.security import create_access_token
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+
+ACCIDENT = {
+    "latitude": 52.52, "longitude": 13.405,
+    "acceleration_x": 0, "acceleration_y": 0, "acceleration_z": 3.5,
+    "gyroscope_x": 0, "gyroscope_y": 0, "gyroscope_z": 0
+}
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+@pytest.fixture()
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(accidents.router, prefix="/api/v1/accidents")
+    app.include_router(contacts.router, prefix="/api/v1/contacts")
+    app.include_router(alerts.router, prefix="/api/v1/alerts")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    db = session_factory()
+    for email in ("etag@example.com", "other@example.com"):
+        db.add(models.User(email=email, hashed_password="x", full_name="ETag User"))
+    db.commit()
+    db.close()
+    with TestClient(app) as client:
+        yield client
+
+def auth(email="etag@example.com"):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+def test_unchanged_list_returns_304_without_reading_rows(engine, client):
+    client.post("/api/v1/accidents/", json=ACCIDENT, headers=auth())
+    first = client.get("/api/v1/accidents/", headers=auth())
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.get("/api/v1/accidents/", headers=dict(auth(), **{"If-None-Match": etag}))
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert not any("FROM accidents" in statement for statement in statements)
+
+def test_writes_and_query_params_change_the_etag(client, session_factory):
+    etag = client.get("/api/v1/contacts/", headers=auth()).headers["ETag"]
+    assert client.get("/api/v1/contacts/?limit=10", headers=auth()).headers["ETag"] != etag
+
+    db = session_factory()
+    updated_at = crud.get_user_by_email(db, "etag@example.com").updated_at
+    db.close()
+    client.post("/api/v1/contacts/", json={"name": "Alice", "phone_number": "+100"}, headers=auth())
+
+    response = client.get("/api/v1/contacts/", headers=dict(auth(), **{"If-None-Match": etag}))
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["name"] == "Alice"
+    # The counter bump does not count as a profile update
+    db = session_factory()
+    assert crud.get_user_by_email(db, "etag@example.com").updated_at == updated_at
+    db.close()
+
+def test_alert_writes_bump_the_accident_owner(client, session_factory):
+    accident_id = client.post("/api/v1/accidents/", json=ACCIDENT, headers=auth()).json()["id"]
+    url = f"/api/v1/alerts/?accident_id={accident_id}"
+    etag = client.get(url, headers=auth()).headers["ETag"]
+
+    db = session_factory()
+    crud.create_alert(db, schemas.AlertCreate(accident_id=accident_id, alert_type="SMS", recipient="+100", status="SENT"))
+    db.close()
+    assert client.get(url, headers=dict(auth(), **{"If-None-Match": etag})).status_code == 200
+
+    # Ownership is still checked before the ETag is compared
+    response = client.get(url, headers=dict(auth("other@example.com"), **{"If-None-Match": "*"}))
+    assert response.status_code == 403
+
+def test_etag_matching():
+    etag = 'W/"1.2.abc"'
+    assert etag_matches('W/"1.2.abc"', etag)
+    assert etag_matches('"0.0.x", "1.2.abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"1.3.abc"', etag)
+    assert not etag_matches(None, etag)
\ No newline at end of file
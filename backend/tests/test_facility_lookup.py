@@ -0,0 +1,38 @@
+import json
+from backend.utils import alerts
+from backend.utils.facility_lookup import FacilityDirectory
+
+def write_facilities(path, entries):
+    path.write_text(json.dumps(entries))
+    return str(path)
+
+def test_nearest_hospital_and_police(tmp_path):
+    directory = FacilityDirectory(
+        write_facilities(tmp_path / "hub_coords.json", [
+            ["City Hospital", [12.9716, 77.5946], 8012345678],
+            ["Rural Clinic", [13.3392, 77.1140], 8087654321],
+        ]),
+        write_facilities(tmp_path / "police_coords.json", [["Central Station", [12.9760, 77.6010], 100]]),
+    )
+    found = directory.nearest(12.98, 77.60)
+    assert found["hospital"]["name"] == "City Hospital"
+    assert found["police"]["phone"] == "100"
+    # No GPS fix, no facilities
+    assert directory.nearest(0, 0) == {}
+
+def test_unconfigured_directory_is_empty():
+    assert FacilityDirectory(None, None).nearest(12.98, 77.60) == {}
+
+def test_alert_message_names_nearest_facilities(monkeypatch):
+    sent = []
+    monkeypatch.setattr(alerts, "send_sms", lambda to, message: sent.append(message) or True)
+    accident_info = {
+        "location": "Lat: 12.98, Lon: 77.6",
+        "confidence": 0.9,
+        "facilities": {"hospital": {"name": "City Hospital", "phone": "8012345678", "distance_km": 1.04}},
+    }
+    alerts.send_alerts([{"id": 1, "phone_number": "+100"}], accident_info)
+    assert sent == [
+        "EMERGENCY ALERT: Car accident detected at Lat: 12.98, Lon: 77.6. Confidence: 90.0%."
+        " Nearest hospital: City Hospital (8012345678), 1.0 km."
+    ]
\ No newline at end of file
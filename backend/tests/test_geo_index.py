@@ -0,0 +1,139 @@
+import math
+import random
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.api import accidents
+from backend.core.database import Base, get_db
+from backend.core.security import create_access_token
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+from backend.utils.geo import (
+    EARTH_RADIUS_M, cell_bounds, covering_ranges, geohash_cell, geohash_string, haversine_m, location_cell
+)
+
+def offset(latitude, longitude, distance_m, bearing_deg):
+    # Destination point on a sphere
+    delta = distance_m / EARTH_RADIUS_M
+    theta = math.radians(bearing_deg)
+    phi1, lambda1 = math.radians(latitude), math.radians(longitude)
+    phi2 = math.asin(math.sin(phi1) * math.cos(delta) + math.cos(phi1) * math.sin(delta) * math.cos(theta))
+    lambda2 = lambda1 + math.atan2(
+        math.sin(theta) * math.sin(delta) * math.cos(phi1), math.cos(delta) - math.sin(phi1) * math.sin(phi2)
+    )
+    return math.degrees(phi2), (math.degrees(lambda2) + 540) % 360 - 180
+
+def test_geohash_matches_reference():
+    assert geohash_string(geohash_cell(57.64911, 10.40744)) == "u4pruyd"
+    assert geohash_string(geohash_cell(-25.382708, -49.265506, 5), 5) == "6gkzw"
+    min_lat, min_lon, max_lat, max_lon = cell_bounds(geohash_cell(52.52, 13.405))
+    assert min_lat <= 52.52 < max_lat and min_lon <= 13.405 < max_lon
+    assert location_cell(0, 0) is None
+
+@pytest.mark.parametrize("center", [(52.52, 13.405), (-33.87, 151.21), (0.0001, 179.9995), (69.65, 18.96)])
+@pytest.mark.parametrize("radius_m", [50, 800, 5000])
+def test_covering_ranges_contain_every_point_in_radius(center, radius_m):
+    ranges = covering_ranges(center[0], center[1], radius_m)
+    assert ranges is not None
+    rng = random.Random(7)
+    for _ in range(300):
+        point = offset(center[0], center[1], radius_m * math.sqrt(rng.random()), rng.uniform(0, 360))
+        cell = geohash_cell(*point)
+        assert any(start <= cell < end for start, end in ranges), point
+
+def test_covering_ranges_gives_up_near_poles_and_for_huge_radii():
+    assert covering_ranges(89.99, 0, 5000) is None
+    assert covering_ranges(10, 10, 30000000) is None
+
+@pytest.fixture()
+def client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    app = FastAPI()
+    app.include_router(accidents.router, prefix="/api/v1/accidents")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    db = session_factory()
+    owner = models.User(email="geo@example.com", hashed_password="x", full_name="Geo User")
+    other = models.User(email="other@example.com", hashed_password="x", full_name="Other User")
+    db.add_all([owner, other])
+    db.commit()
+
+    rng = random.Random(3)
+    for i in range(200):
+        latitude, longitude = offset(52.52, 13.405, rng.uniform(0, 4000), rng.uniform(0, 360))
+        crud.create_accident(db, make_accident(latitude, longitude), owner.id if i % 4 else other.id)
+    crud.create_accident(db, make_accident(0, 0), owner.id)
+    db.close()
+    with TestClient(app) as client:
+        client.session_factory = session_factory
+        yield client
+
+def make_accident(latitude, longitude):
+    return schemas.AccidentCreate(
+        latitude=latitude, longitude=longitude,
+        acceleration_x=0, acceleration_y=0, acceleration_z=3.5,
+        gyroscope_x=0, gyroscope_y=0, gyroscope_z=0,
+        confidence_score=0.9
+    )
+
+def auth(email="geo@example.com"):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+def test_near_matches_brute_force(client):
+    center = (52.525, 13.41)
+    response = client.get(
+        "/api/v1/accidents/near",
+        params={"latitude": center[0], "longitude": center[1], "radius_m": 1500},
+        headers=auth()
+    )
+    assert response.status_code == 200
+    results = response.json()
+
+    db = client.session_factory()
+    owner_id = crud.get_user_by_email(db, "geo@example.com").id
+    expected = sorted(
+        (haversine_m(center[0], center[1], accident.latitude, accident.longitude), accident.id)
+        for accident in db.query(models.Accident).filter(models.Accident.user_id == owner_id)
+        if not (accident.latitude == 0 and accident.longitude == 0)
+    )
+    db.close()
+    expected = [(distance, accident_id) for distance, accident_id in expected if distance <= 1500]
+    assert expected
+    assert [item["id"] for item in results] == [accident_id for _, accident_id in expected]
+    assert [item["distance_m"] for item in results] == pytest.approx([distance for distance, _ in expected])
+
+def test_hotspots_count_own_accidents(client):
+    response = client.get("/api/v1/accidents/hotspots", params={"precision": 4}, headers=auth())
+    assert response.status_code == 200
+    hotspots = response.json()
+    # 150 of the 200 located accidents belong to the caller
+    assert sum(item["count"] for item in hotspots) == 150
+    assert all(len(item["geohash"]) == 4 for item in hotspots)
+    assert hotspots == sorted(hotspots, key=lambda item: -item["count"])
+
+def test_hotspots_exclude_other_users(client):
+    db = client.session_factory()
+    other_id = crud.get_user_by_email(db, "other@example.com").id
+    crud.create_accident(db, make_accident(48.8566, 2.3522), other_id)
+    db.close()
+    paris = geohash_string(geohash_cell(48.8566, 2.3522, 4), 4)
+
+    response = client.get("/api/v1/accidents/hotspots", params={"precision": 4}, headers=auth())
+    assert paris not in [item["geohash"] for item in response.json()]
+    response = client.get("/api/v1/accidents/hotspots", params={"precision": 4}, headers=auth("other@example.com"))
+    hotspots = {item["geohash"]: item["count"] for item in response.json()}
+    assert hotspots[paris] == 1
+    assert sum(hotspots.values()) == 51
\ No newline at end of file
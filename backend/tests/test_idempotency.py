@@ -0,0 +1,116 @@
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from backend.utils.idempotency import IdempotencyStore, request_fingerprint
+
+def make_store(**overrides):
+    options = {"ttl": 60.0, "max_keys": 100, "wait_timeout": 5.0}
+    options.update(overrides)
+    return IdempotencyStore(**options)
+
+def test_repeat_key_replays_first_result():
+    store = make_store()
+    calls = []
+
+    def handler():
+        calls.append(1)
+        return {"id": len(calls)}
+
+    fingerprint = request_fingerprint('{"a": 1}')
+    assert store.run("key", fingerprint, handler) == {"id": 1}
+    assert store.run("key", fingerprint, handler) == {"id": 1}
+    assert store.run("other", fingerprint, handler) == {"id": 2}
+    assert len(calls) == 2
+
+def test_reused_key_with_different_payload_is_rejected():
+    store = make_store()
+    store.run("key", request_fingerprint("a"), lambda: 1)
+    with pytest.raises(HTTPException) as excinfo:
+        store.run("key", request_fingerprint("b"), lambda: 2)
+    assert excinfo.value.status_code == 422
+
+def test_failed_request_is_not_remembered():
+    store = make_store()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        store.run("key", "fp", failing)
+    assert store.run("key", "fp", lambda: "retried") == "retried"
+
+def test_expired_entries_run_again():
+    store = make_store(ttl=0.01)
+    assert store.run("key", "fp", lambda: 1) == 1
+    time.sleep(0.02)
+    assert store.run("key", "fp", lambda: 2) == 2
+
+def test_concurrent_duplicates_wait_for_first_result():
+    store = make_store()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_handler():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "first"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(store.run("key", "fp", slow_handler)))
+    first.start()
+    started.wait(5)
+    duplicates = [
+        threading.Thread(target=lambda: results.append(store.run("key", "fp", slow_handler)))
+        for _ in range(3)
+    ]
+    for thread in duplicates:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [first] + duplicates:
+        thread.join(5)
+
+    assert results == ["first"] * 4
+    assert len(calls) == 1
+
+def test_in_flight_duplicate_times_out_with_conflict():
+    store = make_store(wait_timeout=0.01)
+    release = threading.Event()
+    worker = threading.Thread(target=lambda: store.run("key", "fp", lambda: release.wait(5)))
+    worker.start()
+    time.sleep(0.02)
+    with pytest.raises(HTTPException) as excinfo:
+        store.run("key", "fp", lambda: None)
+    assert excinfo.value.status_code == 409
+    assert "Retry-After" in excinfo.value.headers
+    assert store.status("key", "fp") == store.RUNNING
+    assert store.status("key", "other") is None
+    release.set()
+    worker.join(5)
+
+def test_in_flight_entry_does_not_block_expiry():
+    store = make_store(ttl=0.01)
+    release = threading.Event()
+    worker = threading.Thread(target=lambda: store.run("slow", "fp", lambda: release.wait(5)))
+    worker.start()
+    time.sleep(0.02)
+    for index in range(5):
+        store.run(f"done-{index}", "fp", lambda: index)
+    assert store.status("done-0", "fp") == store.DONE
+    time.sleep(0.02)
+    store.run("next", "fp", lambda: None)
+    # Completed entries behind the in-flight one expired; it is still tracked
+    assert set(store._entries) == {"slow", "next"}
+    assert store.status("done-0", "fp") is None
+    release.set()
+    worker.join(5)
+
+def test_status_matches_key_and_fingerprint():
+    store = make_store()
+    assert store.status("key", "fp") is None
+    store.run("key", "fp", lambda: 1)
+    assert store.status("key", "fp") == store.DONE
+    assert store.status("key", "other") is None
\ No newline at end of file
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.core import profiling
+from backend.core.config import settings
+
+profiled_app = FastAPI()
+profiled_app.add_middleware(profiling.ProfilingMiddleware)
+
+@profiled_app.get("/busy")
+def busy():
+    end = time.perf_counter() + 0.05
+    data = []
+    while time.perf_counter() < end:
+        data.append(list(range(100)))
+    return {"items": len(data)}
+
+def configure(monkeypatch, tmp_path, **overrides):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL", 0.001)
+    for key, value in overrides.items():
+        monkeypatch.setattr(settings, key, value)
+
+def test_request_not_profiled_without_header(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path)
+    with TestClient(profiled_app) as client:
+        response = client.get("/busy")
+        assert response.status_code == 200
+        response = client.get("/busy", headers={"X-Profile": "wrong"})
+        assert response.status_code == 200
+    assert profiling.list_profiles() == []
+
+def test_admin_header_writes_profile(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path)
+    with TestClient(profiled_app) as client:
+        response = client.get("/busy", headers={"X-Profile": "secret"})
+        assert response.status_code == 200
+
+    profiles = profiling.list_profiles()
+    assert len(profiles) == 1
+    with open(profiling.get_profile_path(profiles[0]["name"])) as f:
+        profile = json.load(f)
+    assert profile["path"] == "/busy"
+    assert profile["status_code"] == 200
+    assert profile["samples"] > 0
+    assert any("busy" in entry["stack"] for entry in profile["stacks"])
+    assert "allocations" in profile
+
+def test_stacks_are_labelled_with_their_thread(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path)
+    stop = threading.Event()
+
+    def background_work():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=background_work, name="background-work")
+    worker.start()
+    try:
+        with TestClient(profiled_app) as client:
+            client.get("/busy", headers={"X-Profile": "secret"})
+    finally:
+        stop.set()
+        worker.join()
+
+    with open(profiling.get_profile_path(profiling.list_profiles()[0]["name"])) as f:
+        profile = json.load(f)
+    assert profile["scope"] == "process"
+    # Other threads' work is sampled too, but kept apart by thread name
+    assert any(entry["stack"].startswith("background-work;") for entry in profile["stacks"])
+    assert not any(
+        "busy" in entry["stack"] and entry["stack"].startswith("background-work;") for entry in profile["stacks"]
+    )
+
+def test_sampling_rate_and_rotation(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path, PROFILING_SAMPLE_RATE=1.0, PROFILING_MAX_FILES=2)
+    with TestClient(profiled_app) as client:
+        for _ in range(3):
+            client.get("/busy")
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_profile_path_rejects_traversal(monkeypatch, tmp_path):
+    configure(monkeypatch, tmp_path)
+    assert profiling.get_profile_path("../config.json") is None
+    assert profiling.get_profile_path("missing.json") is None
\ No newline at end of file
@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import List
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.core.database import Base
+from backend.models import models
+from backend.schemas import schemas
+from backend.utils import crud
+from backend.utils.serialization import accident_serializer, alert_serializer, contact_serializer
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+def response_model_bytes(schema, objects) -> bytes:
+    # What FastAPI does for a response_model: validate from attributes, dump JSON
+    adapter = TypeAdapter(List[schema])
+    return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+def make_user(db):
+    user = models.User(email="fast@example.com", hashed_password="x", full_name="Fast User")
+    db.add(user)
+    db.commit()
+    return user
+
+def add_accident(db, user_id, **overrides):
+    values = dict(
+        user_id=user_id, latitude=52.52, longitude=13.405,
+        acceleration_x=0.1, acceleration_y=-2.5e-7, acceleration_z=3,
+        gyroscope_x=0, gyroscope_y=0, gyroscope_z=0,
+        speed=None, confidence_score=0.93,
+        timestamp=datetime(2024, 5, 1, 12, 30, 15, 123000)
+    )
+    values.update(overrides)
+    db.add(models.Accident(**values))
+    db.commit()
+
+def test_accident_page_matches_response_model(db):
+    user = make_user(db)
+    for i in range(5):
+        add_accident(db, user.id, speed=i * 12.5, is_confirmed=bool(i % 2))
+    add_accident(db, user.id, confidence_score=None)
+
+    rows = crud.get_accident_rows(db, accident_serializer.columns, user_id=user.id, skip=1, limit=4)
+    expected = response_model_bytes(schemas.Accident, crud.get_accidents(db, user_id=user.id, skip=1, limit=4))
+    assert accident_serializer.dumps(rows) == expected
+
+def test_large_exponent_falls_back_to_pydantic(db):
+    user = make_user(db)
+    add_accident(db, user.id, speed=1e16)
+
+    rows = crud.get_accident_rows(db, accident_serializer.columns, user_id=user.id)
+    expected = response_model_bytes(schemas.Accident, crud.get_accidents(db, user_id=user.id))
+    assert b"1e+16" in expected
+    assert accident_serializer.dumps(rows) == expected
+
+def test_contact_and_alert_pages_match_response_model(db):
+    user = make_user(db)
+    crud.create_emergency_contact(db, schemas.EmergencyContactCreate(name="Zoë \"Z\" Ng", phone_number="+100"), user.id)
+    crud.create_emergency_contact(
+        db, schemas.EmergencyContactCreate(name="Bob", phone_number="+200", email="bob@example.com", is_primary=True), user.id
+    )
+    add_accident(db, user.id)
+    accident_id = crud.get_accidents(db, user_id=user.id)[0].id
+    crud.create_alert(db, schemas.AlertCreate(accident_id=accident_id, alert_type="SMS", recipient="+100", status="SENT"))
+
+    contact_rows = crud.get_emergency_contact_rows(db, contact_serializer.columns, user_id=user.id)
+    assert contact_serializer.dumps(contact_rows) == response_model_bytes(
+        schemas.EmergencyContact, crud.get_emergency_contacts(db, user_id=user.id)
+    )
+    alert_rows = crud.get_alert_rows(db, alert_serializer.columns, accident_id=accident_id)
+    assert alert_serializer.dumps(alert_rows) == response_model_bytes(
+        schemas.Alert, crud.get_alerts(db, accident_id=accident_id)
+    )
\ No newline at end of file
@@ -52,11 +52,18 @@ def send_alerts(to_contacts: List[dict], accident_info: dict) -> List[dict]:
     Send alerts to all emergency contacts
     """
     results = []
+    facilities = accident_info.get("facilities") or {}
+    nearby = "".join(
+        f" Nearest {kind}: {facility['name']} ({facility['phone']}), {facility['distance_km']:.1f} km."
+        for kind, facility in facilities.items()
+    )
     
     for contact in to_contacts:
         # Send SMS if phone number is provided
         if contact.get("phone_number"):
             message = f"EMERGENCY ALERT: Car accident detected at {accident_info.get('location', 'unknown location')}. Confidence: {accident_info.get('confidence', 0)*100:.1f}%"
+            if nearby:
+                message += "." + nearby
             success = send_sms(contact["phone_number"], message)
             results.append({
                 "contact_id": contact["id"],
@@ -73,7 +80,10 @@ def send_alerts(to_contacts: List[dict], accident_info: dict) -> List[dict]:
             <p>A car accident has been detected at {accident_info.get('location', 'unknown location')}.</p>
             <p>Confidence Level: {accident_info.get('confidence', 0)*100:.1f}%</p>
             <p>Time: {accident_info.get('time', 'unknown time')}</p>
-            """
+            """ + "".join(
+                f"<p>Nearest {kind}: {facility['name']} ({facility['phone']}), {facility['distance_km']:.1f} km</p>"
+                for kind, facility in facilities.items()
+            )
             success = send_email(contact["email"], subject, content)
             results.append({
                 "contact_id": contact["id"],
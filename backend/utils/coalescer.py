@@ -0,0 +1,154 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..utils import crud
+from ..utils.geo import haversine_m, has_location
+
+class _OpenEvent:
+    __slots__ = ("accident_id", "latitude", "longitude", "peak_confidence", "last_seen")
+
+    def __init__(self, accident_id, latitude, longitude, peak_confidence, last_seen):
+        self.accident_id = accident_id
+        self.latitude = latitude
+        self.longitude = longitude
+        self.peak_confidence = peak_confidence
+        self.last_seen = last_seen
+
+class AccidentCoalescer:
+    """
+    Attaches repeated positive predictions from one crash to the open accident
+    instead of creating a new accident and alerting again.
+
+    An accident stays open while positives for the same user keep arriving
+    within window_seconds of each other and within radius_meters of it. The
+    in-memory index is the fast path; after a restart or on another worker the
+    (user_id, timestamp) index on accidents is used instead.
+
+    Deciding whether to coalesce happens under a per-user lock, but alerting
+    does not: the new accident is opened as a pending event first, so
+    positives arriving while its alerts are sent attach to it in memory.
+    """
+
+    def __init__(self, window_seconds: float, radius_meters: float):
+        self.window = timedelta(seconds=window_seconds)
+        self.radius_meters = radius_meters
+        self._events = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lock(self, user_id: int):
+        """
+        Per-user lock held across lookup and open so concurrent positives
+        for one user cannot both create an accident. Locks only exist while
+        someone holds or waits for them.
+        """
+        with self._lock:
+            entry = self._locks.get(user_id)
+            if entry is None:
+                entry = self._locks[user_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[user_id]
+
+    def attach(self, db: Session, user_id: int, latitude: Optional[float], longitude: Optional[float],
+               confidence: float, now: Optional[datetime] = None) -> Optional[_OpenEvent]:
+        """
+        Attach a positive prediction to the user's open accident, raising its
+        peak confidence if needed
+        Returns: the open event, or None if a new accident should be created
+        """
+        now = now or datetime.utcnow()
+        event = self._open_event(db, user_id, now)
+        if event is None or not self._within_radius(event, latitude, longitude):
+            return None
+
+        if confidence > (event.peak_confidence or 0.0):
+            # A pending accident is written with the peak when it is saved
+            if event.accident_id is not None:
+                crud.raise_accident_confidence(db, event.accident_id, confidence)
+            event.peak_confidence = confidence
+        event.last_seen = now
+        return event
+
+    def open(self, user_id: int, latitude: Optional[float], longitude: Optional[float],
+             confidence: float, now: Optional[datetime] = None) -> _OpenEvent:
+        """
+        Open a pending event for an accident that is about to be created;
+        call under lock(user_id), then save() or discard() it
+        """
+        now = now or datetime.utcnow()
+        event = _OpenEvent(None, latitude, longitude, confidence, now)
+        with self._lock:
+            self._events[user_id] = event
+            self._expire(now)
+        return event
+
+    def save(self, db: Session, event: _OpenEvent, accident_id: int, saved_confidence: float):
+        """
+        Attach the created accident to its pending event; call under
+        lock(user_id). A peak raised after the accident was written is
+        written too.
+        """
+        event.accident_id = accident_id
+        if event.peak_confidence > saved_confidence:
+            crud.raise_accident_confidence(db, accident_id, event.peak_confidence)
+
+    def discard(self, user_id: int, event: _OpenEvent):
+        """Forget a pending event whose accident was not created"""
+        with self._lock:
+            if self._events.get(user_id) is event:
+                del self._events[user_id]
+
+    def record(self, user_id: int, accident_id: int, latitude: Optional[float], longitude: Optional[float],
+               confidence: float, now: Optional[datetime] = None):
+        """
+        Remember a newly created accident as the user's open event
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._events[user_id] = _OpenEvent(accident_id, latitude, longitude, confidence, now)
+            self._expire(now)
+
+    def _open_event(self, db: Session, user_id: int, now: datetime) -> Optional[_OpenEvent]:
+        with self._lock:
+            event = self._events.get(user_id)
+            if event is not None and now - event.last_seen > self.window:
+                del self._events[user_id]
+                event = None
+        if event is not None:
+            return event
+
+        accident = crud.get_latest_accident_since(db, user_id=user_id, since=now - self.window)
+        if accident is None:
+            return None
+        event = _OpenEvent(accident.id, accident.latitude, accident.longitude,
+                           accident.confidence_score, accident.timestamp)
+        with self._lock:
+            self._events[user_id] = event
+        return event
+
+    def _within_radius(self, event: _OpenEvent, latitude: Optional[float], longitude: Optional[float]) -> bool:
+        # Without a fix on either side only the time window applies
+        if not has_location(latitude, longitude) or not has_location(event.latitude, event.longitude):
+            return True
+        return haversine_m(event.latitude, event.longitude, latitude, longitude) <= self.radius_meters
+
+    def _expire(self, now: datetime):
+        expired = [user_id for user_id, event in self._events.items() if now - event.last_seen > self.window]
+        for user_id in expired:
+            del self._events[user_id]
+
+accident_coalescer = AccidentCoalescer(
+    window_seconds=settings.ACCIDENT_COALESCE_SECONDS,
+    radius_meters=settings.ACCIDENT_COALESCE_RADIUS_METERS,
+)
\ No newline at end of file
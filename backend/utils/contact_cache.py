@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..utils import crud
+
+def to_dispatch(contact) -> dict:
+    """
+    Convert an emergency contact to the format send_alerts expects
+    """
+    return {
+        "id": contact.id,
+        "name": contact.name,
+        "phone_number": contact.phone_number,
+        "email": contact.email
+    }
+
+class ContactCache:
+    """
+    Per-user cache of emergency contacts, already converted to the alert
+    dispatch format so a positive prediction can fan out without touching
+    the database.
+
+    Contact handlers invalidate a user's entry on every change. A generation
+    number, bumped by every invalidation, keeps a load that raced with one
+    from being stored. The TTL bounds staleness when another worker made the
+    change. Entries are kept in load order, so expired ones are pruned from
+    the front on every store and at most max_users are kept.
+    """
+
+    def __init__(self, ttl: float, max_users: int = 10000):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, user_id: int) -> Tuple[dict, ...]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        contacts = tuple(to_dispatch(contact) for contact in crud.get_emergency_contacts(db, user_id=user_id))
+
+        with self._lock:
+            if self._generation == generation:
+                self._entries[user_id] = (now + self.ttl, contacts)
+                self._entries.move_to_end(user_id)
+                self._prune(now)
+        return contacts
+
+    def warm(self, db: Session, user_id: int):
+        self.get(db, user_id)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+
+    def _prune(self, now: float):
+        # Every entry has the same TTL, so the oldest load expires first
+        while self._entries:
+            user_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_users:
+                break
+            del self._entries[user_id]
+
+contact_cache = ContactCache(
+    ttl=settings.CONTACT_CACHE_TTL_SECONDS,
+    max_users=settings.CONTACT_CACHE_MAX_USERS,
+)
\ No newline at end of file
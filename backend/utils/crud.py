@@ -1,6 +1,10 @@
+from sqlalchemy import Integer, func, insert, or_, select, update
 from sqlalchemy.orm import Session
 from typing import Optional, List
+from datetime import datetime
 from ..models import models
+from . import stats
+from .geo import GEOCELL_PRECISION, location_cell
 from ..schemas import schemas
 from ..core.security import get_password_hash, verify_password
 
@@ -47,6 +51,22 @@ def authenticate_user(db: Session, email: str, password: str):
         return False
     return user
 
+def bump_data_version(db: Session, user_id):
+    """
+    Advance the user's change counter used for list ETags. Runs in the
+    caller's transaction and leaves updated_at alone.
+    user_id may be a scalar subquery.
+    """
+    db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(data_version=models.User.data_version + 1, updated_at=models.User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+def _accident_owner(accident_id: int):
+    return select(models.Accident.user_id).where(models.Accident.id == accident_id).scalar_subquery()
+
 # Accident CRUD operations
 def get_accident(db: Session, accident_id: int):
     return db.query(models.Accident).filter(models.Accident.id == accident_id).first()
@@ -54,12 +74,81 @@ def get_accident(db: Session, accident_id: int):
 def get_accidents(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.Accident).filter(models.Accident.user_id == user_id).offset(skip).limit(limit).all()
 
+def get_accident_rows(db: Session, columns, user_id: int, skip: int = 0, limit: int = 100):
+    """
+    Same page as get_accidents, as plain tuples of the given columns
+    """
+    return db.execute(select(*columns).where(models.Accident.user_id == user_id).offset(skip).limit(limit)).all()
+
+def get_accident_stat_rows(db: Session, user_id: int):
+    return db.execute(
+        select(
+            models.AccidentStat.dimension,
+            models.AccidentStat.bucket,
+            models.AccidentStat.count,
+            models.AccidentStat.confirmed
+        ).where(models.AccidentStat.user_id == user_id)
+    ).all()
+
+def _cell_filter(ranges):
+    return or_(*(models.Accident.geocell.between(start, end - 1) for start, end in ranges))
+
+def get_accident_locations(db: Session, user_id: int, ranges=None):
+    """
+    (id, latitude, longitude) of the user's located accidents, limited to the
+    given geocell ranges when there are any
+    """
+    query = select(models.Accident.id, models.Accident.latitude, models.Accident.longitude).where(
+        models.Accident.user_id == user_id,
+        models.Accident.geocell.isnot(None)
+    )
+    if ranges:
+        query = query.where(_cell_filter(ranges))
+    return db.execute(query).all()
+
+def get_accidents_by_ids(db: Session, accident_ids: List[int]):
+    return db.query(models.Accident).filter(models.Accident.id.in_(accident_ids)).all()
+
+def get_hotspot_rows(db: Session, user_id: int, precision: int, ranges=None, limit: int = 50):
+    """
+    (cell, count, confirmed) for the user's busiest cells at the given precision
+    """
+    cell = (models.Accident.geocell // (1 << ((GEOCELL_PRECISION - precision) * 5))).label("cell")
+    query = select(
+        cell,
+        func.count().label("count"),
+        func.sum(models.Accident.is_confirmed.cast(Integer)).label("confirmed")
+    ).where(
+        models.Accident.user_id == user_id,
+        models.Accident.geocell.isnot(None)
+    )
+    if ranges:
+        query = query.where(_cell_filter(ranges))
+    query = query.group_by(cell).order_by(func.count().desc(), cell).limit(limit)
+    return db.execute(query).all()
+
 def get_all_accidents(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Accident).offset(skip).limit(limit).all()
 
+def get_latest_accident_since(db: Session, user_id: int, since: datetime):
+    return db.query(models.Accident).filter(
+        models.Accident.user_id == user_id,
+        models.Accident.timestamp >= since
+    ).order_by(models.Accident.timestamp.desc()).first()
+
 def create_accident(db: Session, accident: schemas.AccidentCreate, user_id: int):
-    db_accident = models.Accident(**accident.dict(), user_id=user_id)
+    # Timestamp is set here rather than by the column default so the rollup uses the same value
+    db_accident = models.Accident(
+        **accident.dict(),
+        user_id=user_id,
+        timestamp=datetime.utcnow(),
+        geocell=location_cell(accident.latitude, accident.longitude)
+    )
     db.add(db_accident)
+    stats.record_accident(
+        db, user_id, db_accident.timestamp, accident.latitude, accident.longitude, accident.confidence_score
+    )
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_accident)
     return db_accident
@@ -67,13 +156,74 @@ def create_accident(db: Session, accident: schemas.AccidentCreate, user_id: int)
 def update_accident(db: Session, accident_id: int, accident_update: schemas.AccidentUpdate):
     db_accident = db.query(models.Accident).filter(models.Accident.id == accident_id).first()
     if db_accident:
+        was_confirmed = bool(db_accident.is_confirmed)
         update_data = accident_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_accident, key, value)
+        if bool(db_accident.is_confirmed) != was_confirmed:
+            stats.record_confirmation(db, db_accident, 1 if db_accident.is_confirmed else -1)
+        bump_data_version(db, db_accident.user_id)
         db.commit()
         db.refresh(db_accident)
     return db_accident
 
+def create_accident_with_alerts(db: Session, accident: schemas.AccidentCreate, user_id: int, alerts: List[schemas.AlertBase]) -> int:
+    """
+    Insert an accident and all of its alerts in a single transaction.
+    The accident id comes back through RETURNING and the alerts go in as one
+    bulk insert, with no per-row refresh.
+    Returns: the new accident id
+    """
+    timestamp = datetime.utcnow()
+    accident_id = db.execute(
+        insert(models.Accident)
+        .values(
+            **accident.dict(),
+            user_id=user_id,
+            timestamp=timestamp,
+            geocell=location_cell(accident.latitude, accident.longitude)
+        )
+        .returning(models.Accident.id)
+    ).scalar_one()
+    stats.record_accident(db, user_id, timestamp, accident.latitude, accident.longitude, accident.confidence_score)
+    if alerts:
+        db.execute(
+            insert(models.Alert),
+            [dict(alert.dict(), accident_id=accident_id) for alert in alerts]
+        )
+    bump_data_version(db, user_id)
+    db.commit()
+    return accident_id
+
+def raise_accident_confidence(db: Session, accident_id: int, confidence: float):
+    # Only ever raises the stored score, and only from the value just read, so
+    # concurrent updates keep the peak and the rollup bucket moves once
+    while True:
+        current = db.execute(
+            select(models.Accident.user_id, models.Accident.confidence_score, models.Accident.is_confirmed)
+            .where(models.Accident.id == accident_id)
+            .with_for_update()
+        ).first()
+        if current is None or (current.confidence_score is not None and current.confidence_score >= confidence):
+            db.rollback()
+            return
+        unchanged = (
+            models.Accident.confidence_score.is_(None)
+            if current.confidence_score is None
+            else models.Accident.confidence_score == current.confidence_score
+        )
+        updated = db.query(models.Accident).filter(
+            models.Accident.id == accident_id,
+            unchanged
+        ).update({models.Accident.confidence_score: confidence}, synchronize_session=False)
+        if updated:
+            stats.record_confidence_change(db, current.user_id, current.is_confirmed, current.confidence_score, confidence)
+            bump_data_version(db, current.user_id)
+            db.commit()
+            return
+        # Another request raised it in between; re-read and try again
+        db.rollback()
+
 # Emergency contact CRUD operations
 def get_emergency_contact(db: Session, contact_id: int):
     return db.query(models.EmergencyContact).filter(models.EmergencyContact.id == contact_id).first()
@@ -81,9 +231,16 @@ def get_emergency_contact(db: Session, contact_id: int):
 def get_emergency_contacts(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.EmergencyContact).filter(models.EmergencyContact.user_id == user_id).offset(skip).limit(limit).all()
 
+def get_emergency_contact_rows(db: Session, columns, user_id: int, skip: int = 0, limit: int = 100):
+    """
+    Same page as get_emergency_contacts, as plain tuples of the given columns
+    """
+    return db.execute(select(*columns).where(models.EmergencyContact.user_id == user_id).offset(skip).limit(limit)).all()
+
 def create_emergency_contact(db: Session, contact: schemas.EmergencyContactCreate, user_id: int):
     db_contact = models.EmergencyContact(**contact.dict(), user_id=user_id)
     db.add(db_contact)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_contact)
     return db_contact
@@ -94,6 +251,7 @@ def update_emergency_contact(db: Session, contact_id: int, contact_update: schem
         update_data = contact_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_contact, key, value)
+        bump_data_version(db, db_contact.user_id)
         db.commit()
         db.refresh(db_contact)
     return db_contact
@@ -102,6 +260,7 @@ def delete_emergency_contact(db: Session, contact_id: int):
     db_contact = db.query(models.EmergencyContact).filter(models.EmergencyContact.id == contact_id).first()
     if db_contact:
         db.delete(db_contact)
+        bump_data_version(db, db_contact.user_id)
         db.commit()
     return db_contact
 
@@ -112,9 +271,16 @@ def get_alert(db: Session, alert_id: int):
 def get_alerts(db: Session, accident_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.Alert).filter(models.Alert.accident_id == accident_id).offset(skip).limit(limit).all()
 
+def get_alert_rows(db: Session, columns, accident_id: int, skip: int = 0, limit: int = 100):
+    """
+    Same page as get_alerts, as plain tuples of the given columns
+    """
+    return db.execute(select(*columns).where(models.Alert.accident_id == accident_id).offset(skip).limit(limit)).all()
+
 def create_alert(db: Session, alert: schemas.AlertCreate):
     db_alert = models.Alert(**alert.dict())
     db.add(db_alert)
+    bump_data_version(db, _accident_owner(alert.accident_id))
     db.commit()
     db.refresh(db_alert)
     return db_alert
@@ -125,6 +291,7 @@ def update_alert(db: Session, alert_id: int, alert_update: schemas.AlertUpdate):
         update_data = alert_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_alert, key, value)
+        bump_data_version(db, _accident_owner(db_alert.accident_id))
         db.commit()
         db.refresh(db_alert)
     return db_alert
\ No newline at end of file
@@ -0,0 +1,57 @@
+import threading
+from typing import Optional
+from ..core.config import settings
+from .geo import has_location
+
+try:
+    from facilities import open_facilities
+except ImportError:
+    # The facilities package lives at the repository root and is not part of
+    # the backend image unless it is copied in
+    open_facilities = None
+
+class FacilityDirectory:
+    """
+    Nearest hospital and police station for alert messages. Indexes are
+    loaded once, on first use, from the configured facility JSON files
+    (or the compiled .fdb next to them).
+    """
+
+    def __init__(self, hospitals_path: Optional[str], police_path: Optional[str]):
+        self.paths = {"hospital": hospitals_path, "police": police_path}
+        self._indexes = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        with self._lock:
+            if self._indexes is None:
+                indexes = {}
+                if open_facilities is not None:
+                    for kind, path in self.paths.items():
+                        if not path:
+                            continue
+                        try:
+                            indexes[kind] = open_facilities(path)
+                        except Exception as e:
+                            print(f"Failed to load {kind} facilities from {path}: {e}")
+                self._indexes = indexes
+            return self._indexes
+
+    def nearest(self, latitude: Optional[float], longitude: Optional[float]) -> dict:
+        """
+        Nearest facility of each configured kind as {kind: {name, phone, distance_km}}
+        """
+        if not has_location(latitude, longitude) or not any(self.paths.values()):
+            return {}
+        found = {}
+        for kind, index in self._load().items():
+            matches = index.nearest(latitude, longitude)
+            if matches:
+                found[kind] = {
+                    "name": matches[0].name,
+                    "phone": matches[0].phone,
+                    "distance_km": matches[0].distance_km,
+                }
+        return found
+
+facility_directory = FacilityDirectory(settings.FACILITY_HOSPITALS_PATH, settings.FACILITY_POLICE_PATH)
\ No newline at end of file
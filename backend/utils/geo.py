@@ -0,0 +1,143 @@
+import math
+from typing import List, Optional, Tuple
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in meters between two points in degrees
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
+
+def has_location(latitude: Optional[float], longitude: Optional[float]) -> bool:
+    """
+    Devices report 0,0 (or nothing) when they have no GPS fix
+    """
+    if latitude is None or longitude is None:
+        return False
+    return not (latitude == 0 and longitude == 0)
+
+# Geohash cells are stored as integers (5 bits per geohash character,
+# longitude/latitude bits interleaved) so a cell prefix is a plain integer
+# range and can be looked up with an ordinary B-tree index on any database
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOCELL_PRECISION = 7  # ~153 m x 153 m cells at the equator
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+def _grid_bits(precision: int) -> Tuple[int, int]:
+    bits = precision * 5
+    return (bits + 1) // 2, bits // 2  # longitude bits, latitude bits
+
+def _interleave(column: int, row: int, precision: int) -> int:
+    lon_bits, lat_bits = _grid_bits(precision)
+    cell = 0
+    for i in range(precision * 5):
+        if i % 2 == 0:
+            bit = (column >> (lon_bits - 1 - i // 2)) & 1
+        else:
+            bit = (row >> (lat_bits - 1 - i // 2)) & 1
+        cell = (cell << 1) | bit
+    return cell
+
+def _grid_index(value: float, low: float, span: float, bits: int) -> int:
+    return min(max(int(math.floor((value - low) / span * (1 << bits))), 0), (1 << bits) - 1)
+
+def geohash_cell(latitude: float, longitude: float, precision: int = GEOCELL_PRECISION) -> int:
+    """
+    Geohash of a point as an integer
+    """
+    lon_bits, lat_bits = _grid_bits(precision)
+    column = _grid_index(longitude, -180.0, 360.0, lon_bits)
+    row = _grid_index(latitude, -90.0, 180.0, lat_bits)
+    return _interleave(column, row, precision)
+
+def geohash_string(cell: int, precision: int = GEOCELL_PRECISION) -> str:
+    return "".join(
+        GEOHASH_BASE32[(cell >> (5 * (precision - 1 - i))) & 31] for i in range(precision)
+    )
+
+def cell_bounds(cell: int, precision: int = GEOCELL_PRECISION) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, min_lon, max_lat, max_lon) of a cell
+    """
+    lon_bits, lat_bits = _grid_bits(precision)
+    column = row = 0
+    for i in range(precision * 5):
+        bit = (cell >> (precision * 5 - 1 - i)) & 1
+        if i % 2 == 0:
+            column = (column << 1) | bit
+        else:
+            row = (row << 1) | bit
+    height = 180.0 / (1 << lat_bits)
+    width = 360.0 / (1 << lon_bits)
+    return -90.0 + row * height, -180.0 + column * width, -90.0 + (row + 1) * height, -180.0 + (column + 1) * width
+
+def cell_center(cell: int, precision: int = GEOCELL_PRECISION) -> Tuple[float, float]:
+    min_lat, min_lon, max_lat, max_lon = cell_bounds(cell, precision)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+def covering_ranges(latitude: float, longitude: float, radius_m: float, max_cells: int = 16) -> Optional[List[Tuple[int, int]]]:
+    """
+    Half-open ranges of stored cells (at GEOCELL_PRECISION) covering the
+    bounding box of a circle, using the finest precision that needs at most
+    max_cells cells. Returns None when the circle is too large or reaches a
+    pole, in which case the caller should not prune by cell.
+    """
+    dlat = radius_m / METERS_PER_DEGREE
+    min_lat, max_lat = latitude - dlat, latitude + dlat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return None
+    dlon = dlat / math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if dlon >= 180.0:
+        return None
+
+    for precision in range(GEOCELL_PRECISION, 0, -1):
+        lon_bits, lat_bits = _grid_bits(precision)
+        width = 360.0 / (1 << lon_bits)
+        height = 180.0 / (1 << lat_bits)
+        first_column = int(math.floor((longitude - dlon + 180.0) / width))
+        last_column = int(math.floor((longitude + dlon + 180.0) / width))
+        first_row = int(math.floor((min_lat + 90.0) / height))
+        last_row = int(math.floor((max_lat + 90.0) / height))
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > max_cells:
+            continue
+        shift = (GEOCELL_PRECISION - precision) * 5
+        cells = sorted({
+            _interleave(column % (1 << lon_bits), row, precision)
+            for column in range(first_column, last_column + 1)
+            for row in range(first_row, last_row + 1)
+        })
+        # Neighbouring cells are often adjacent in the curve; merge them
+        ranges = []
+        for cell in cells:
+            start, end = cell << shift, (cell + 1) << shift
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+    return None
+
+def location_cell(latitude: Optional[float], longitude: Optional[float]) -> Optional[int]:
+    """
+    Stored cell for an accident location, None when the device had no fix
+    """
+    if not has_location(latitude, longitude):
+        return None
+    return geohash_cell(latitude, longitude)
+
+def haversine_m_array(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """
+    Vectorized haversine distance in meters from one point to many
+    """
+    phi1 = math.radians(latitude)
+    phi2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlambda = np.radians(np.asarray(longitudes, dtype=np.float64) - longitude)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(1.0, a)))
\ No newline at end of file
@@ -0,0 +1,156 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from fastapi import HTTPException
+from ..core.config import settings
+
+class _Entry:
+    __slots__ = ("fingerprint", "event", "done", "result", "expires_at")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.event = threading.Event()
+        self.done = False
+        self.result = None
+        self.expires_at = 0.0
+
+class IdempotencyStore:
+    """
+    In-memory store of completed responses keyed by Idempotency-Key.
+    A repeated key returns the stored response without re-running the
+    handler; a duplicate that arrives while the first request is still
+    running waits briefly (wait_timeout) for its result instead of racing
+    it, then gets 409 with Retry-After.
+    """
+
+    DONE = "done"
+    RUNNING = "running"
+
+    def __init__(self, ttl: float, max_keys: int, wait_timeout: float):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.wait_timeout = wait_timeout
+        self._entries = {}
+        # Completed entries only, in completion order; in-flight entries have
+        # no expiry and must not hold back the ones behind them
+        self._completed = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, fingerprint: str, func: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                entry = self._entries.get(key)
+                if entry is not None and entry.done and entry.expires_at <= now:
+                    self._remove(key)
+                    entry = None
+                if entry is None:
+                    entry = _Entry(fingerprint)
+                    self._entries[key] = entry
+                    owner = True
+                else:
+                    owner = False
+                    if entry.fingerprint != fingerprint:
+                        raise HTTPException(
+                            status_code=422,
+                            detail="Idempotency-Key was already used with a different request",
+                        )
+                    if entry.done:
+                        return entry.result
+
+            if owner:
+                return self._execute(key, entry, func)
+
+            if not entry.event.wait(self.wait_timeout):
+                raise in_progress_error()
+            # Either the first request finished (its result is returned on the
+            # next pass) or it failed and this request takes over
+
+    def _execute(self, key: Hashable, entry: _Entry, func: Callable[[], Any]) -> Any:
+        try:
+            result = func()
+        except BaseException:
+            # Failed requests are not remembered so the client can retry
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry.event.set()
+            raise
+
+        with self._lock:
+            entry.result = result
+            entry.done = True
+            entry.expires_at = time.monotonic() + self.ttl
+            if self._entries.get(key) is entry:
+                self._completed[key] = entry
+                self._completed.move_to_end(key)
+                self._evict()
+        entry.event.set()
+        return result
+
+    def status(self, key: Hashable, fingerprint: str) -> Optional[str]:
+        """
+        DONE if run() would replay a stored response for key and fingerprint,
+        RUNNING if a request with both is still in progress, otherwise None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.fingerprint != fingerprint:
+                return None
+            if not entry.done:
+                return self.RUNNING
+            return self.DONE if entry.expires_at > time.monotonic() else None
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        self._completed.pop(key, None)
+
+    def _expire(self, now: float):
+        # Expired entries sit at the front of the completion order
+        while self._completed:
+            key, entry = next(iter(self._completed.items()))
+            if entry.expires_at > now:
+                break
+            self._remove(key)
+
+    def _evict(self):
+        # Only completed entries can be dropped; in-flight ones have waiters
+        while len(self._entries) > self.max_keys and self._completed:
+            self._remove(next(iter(self._completed)))
+
+def in_progress_error() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail="A request with this Idempotency-Key is still in progress",
+        headers={"Retry-After": str(settings.IDEMPOTENCY_RETRY_AFTER)},
+    )
+
+def request_fingerprint(payload: Optional[str]) -> str:
+    return hashlib.sha256((payload or "").encode()).hexdigest()
+
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+    wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT,
+)
+
+def run_idempotent(idempotency_key: Optional[str], scope: Hashable, payload: Optional[str], func: Callable[[], Any]) -> Any:
+    """
+    Run func once per (scope, Idempotency-Key); without a key it just runs func
+    """
+    if not idempotency_key:
+        return func()
+    return idempotency_store.run((scope, idempotency_key), request_fingerprint(payload), func)
+
+def idempotency_status(idempotency_key: Optional[str], scope: Hashable, payload: Optional[str]) -> Optional[str]:
+    """
+    IdempotencyStore.DONE if run_idempotent would replay a stored response
+    for this key and payload, RUNNING if the first such request is still in
+    progress, otherwise None
+    """
+    if not idempotency_key:
+        return None
+    return idempotency_store.status((scope, idempotency_key), request_fingerprint(payload))
\ No newline at end of file
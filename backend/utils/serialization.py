@@ -0,0 +1,42 @@
+import re
+from typing import Iterable, List, Optional, Type
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from ..models import models
+from ..schemas import schemas
+
+# orjson writes large exponents as 1e16 where pydantic writes 1e+16
+_UNSIGNED_EXPONENT = re.compile(rb"[0-9]e[0-9]")
+
+class RowSerializer:
+    """
+    Prebuilt serializer for list endpoints. Selects only the columns of the
+    response schema as plain tuples and encodes them with orjson, producing
+    the same bytes the response_model path would for the same rows.
+    Values are assumed to have gone through the schema on write (emails are
+    stored normalized), so they are not validated again here.
+    """
+
+    def __init__(self, model, schema: Type[BaseModel]):
+        # Pydantic dumps fields in declaration order; keep the same order
+        self.fields = tuple(schema.model_fields)
+        self.columns = tuple(getattr(model, name) for name in self.fields)
+        self.adapter = TypeAdapter(List[schema])
+
+    def dumps(self, rows: Iterable[tuple]) -> bytes:
+        fields = self.fields
+        items = [dict(zip(fields, row)) for row in rows]
+        body = orjson.dumps(items)
+        if _UNSIGNED_EXPONENT.search(body):
+            # Rare (|x| >= 1e16 or a digit-e-digit string): let pydantic encode
+            # the page so the output stays identical
+            body = self.adapter.dump_json(self.adapter.validate_python(items))
+        return body
+
+    def response(self, rows: Iterable[tuple], headers: Optional[dict] = None) -> Response:
+        return Response(content=self.dumps(rows), media_type="application/json", headers=headers)
+
+accident_serializer = RowSerializer(models.Accident, schemas.Accident)
+contact_serializer = RowSerializer(models.EmergencyContact, schemas.EmergencyContact)
+alert_serializer = RowSerializer(models.Alert, schemas.Alert)
\ No newline at end of file
@@ -0,0 +1,174 @@
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models import models
+from ..schemas import schemas
+from .geo import has_location
+
+CONFIDENCE_BINS = 10
+LOCATION_CELL_DEGREES = 0.1
+# Reports.tsx treats unconfirmed accidents above this score as "potential"
+POTENTIAL_THRESHOLD = 0.7
+
+# Dialects with INSERT ... ON CONFLICT; others use _apply_locked
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def confidence_bucket(confidence: Optional[float]) -> str:
+    """
+    Histogram bins are (lo, hi], so everything above POTENTIAL_THRESHOLD
+    lands exactly in the bins from 0.7 up; a score of 0 goes in the first bin
+    """
+    if confidence is None:
+        return "none"
+    index = int(confidence * CONFIDENCE_BINS)
+    if index > 0 and confidence <= index / CONFIDENCE_BINS:
+        index -= 1
+    index = min(max(index, 0), CONFIDENCE_BINS - 1)
+    return f"{index / CONFIDENCE_BINS:.1f}-{(index + 1) / CONFIDENCE_BINS:.1f}"
+
+def location_bucket(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    """
+    South-west corner of the LOCATION_CELL_DEGREES cell holding the point
+    """
+    if not has_location(latitude, longitude):
+        return None
+    cells = 1 / LOCATION_CELL_DEGREES
+    return f"{math.floor(latitude * cells) / cells:.1f},{math.floor(longitude * cells) / cells:.1f}"
+
+def rollup_keys(timestamp: datetime, latitude, longitude, confidence) -> List[Tuple[str, str]]:
+    keys = [
+        ("total", ""),
+        ("day", timestamp.strftime("%Y-%m-%d")),
+        ("hour", f"{timestamp.hour:02d}"),
+        ("confidence", confidence_bucket(confidence)),
+    ]
+    location = location_bucket(latitude, longitude)
+    if location is not None:
+        keys.append(("location", location))
+    return keys
+
+def apply_deltas(db: Session, user_id, deltas: Dict[Tuple[str, str], Tuple[int, int]]):
+    """
+    Add (count, confirmed) deltas to the user's rollup rows with one upsert,
+    in the caller's transaction
+    """
+    rows = [
+        {"user_id": user_id, "dimension": dimension, "bucket": bucket, "count": count, "confirmed": confirmed}
+        for (dimension, bucket), (count, confirmed) in deltas.items()
+        if count or confirmed
+    ]
+    if not rows:
+        return
+    table = models.AccidentStat.__table__
+    dialect_insert = _UPSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        _apply_locked(db, table, user_id, rows)
+        return
+    upsert = dialect_insert(table)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.dimension, table.c.bucket],
+        set_={
+            "count": table.c.count + upsert.excluded.count,
+            "confirmed": table.c.confirmed + upsert.excluded.confirmed,
+        },
+    )
+    db.execute(upsert, rows)
+
+def _apply_locked(db: Session, table, user_id, rows: List[dict]):
+    """
+    Portable path (e.g. MySQL): lock the user's existing rows with
+    SELECT ... FOR UPDATE, insert the missing ones, update the rest
+    """
+    existing = set(db.execute(
+        select(table.c.dimension, table.c.bucket)
+        .where(table.c.user_id == user_id, table.c.dimension.in_({row["dimension"] for row in rows}))
+        .with_for_update()
+    ).all())
+    missing = [row for row in rows if (row["dimension"], row["bucket"]) not in existing]
+    present = [row for row in rows if (row["dimension"], row["bucket"]) in existing]
+    for row in missing:
+        try:
+            with db.begin_nested():
+                db.execute(insert(table), row)
+        except IntegrityError:
+            # A concurrent transaction created it first
+            present.append(row)
+    if present:
+        db.execute(
+            update(table)
+            .where(
+                table.c.user_id == bindparam("key_user_id"),
+                table.c.dimension == bindparam("key_dimension"),
+                table.c.bucket == bindparam("key_bucket"),
+            )
+            .values(
+                count=table.c.count + bindparam("delta_count"),
+                confirmed=table.c.confirmed + bindparam("delta_confirmed"),
+            ),
+            [
+                {
+                    "key_user_id": row["user_id"], "key_dimension": row["dimension"], "key_bucket": row["bucket"],
+                    "delta_count": row["count"], "delta_confirmed": row["confirmed"],
+                }
+                for row in present
+            ],
+        )
+
+def record_accident(db: Session, user_id, timestamp, latitude, longitude, confidence, is_confirmed=False):
+    confirmed = 1 if is_confirmed else 0
+    apply_deltas(db, user_id, {key: (1, confirmed) for key in rollup_keys(timestamp, latitude, longitude, confidence)})
+
+def record_confirmation(db: Session, accident, confirmed_delta: int):
+    keys = rollup_keys(accident.timestamp, accident.latitude, accident.longitude, accident.confidence_score)
+    apply_deltas(db, accident.user_id, {key: (0, confirmed_delta) for key in keys})
+
+def record_confidence_change(db: Session, user_id, is_confirmed, old: Optional[float], new: Optional[float]):
+    old_key = ("confidence", confidence_bucket(old))
+    new_key = ("confidence", confidence_bucket(new))
+    if old_key == new_key:
+        return
+    confirmed = 1 if is_confirmed else 0
+    apply_deltas(db, user_id, {old_key: (-1, -confirmed), new_key: (1, confirmed)})
+
+def summarize(rows, days: Optional[int] = None, max_locations: int = 50) -> schemas.AccidentStats:
+    """
+    Build the stats response from a user's rollup rows
+    """
+    dimensions = defaultdict(list)
+    for dimension, bucket, count, confirmed in rows:
+        if count > 0:
+            dimensions[dimension].append(schemas.StatBucket(bucket=bucket, count=count, confirmed=confirmed))
+
+    total = dimensions["total"][0] if dimensions["total"] else schemas.StatBucket(bucket="", count=0, confirmed=0)
+    by_day = sorted(dimensions["day"], key=lambda item: item.bucket)
+    if days is not None:
+        by_day = by_day[-days:] if days > 0 else []
+    histogram = sorted(dimensions["confidence"], key=lambda item: item.bucket)
+    potential = sum(
+        item.count - item.confirmed
+        for item in histogram
+        if item.bucket != "none" and float(item.bucket.split("-")[0]) >= POTENTIAL_THRESHOLD
+    )
+    locations = []
+    for item in sorted(dimensions["location"], key=lambda item: (-item.count, item.bucket))[:max_locations]:
+        latitude, longitude = item.bucket.split(",")
+        locations.append(schemas.LocationBucket(
+            latitude=float(latitude), longitude=float(longitude), count=item.count, confirmed=item.confirmed
+        ))
+
+    return schemas.AccidentStats(
+        total=total.count,
+        confirmed=total.confirmed,
+        potential=potential,
+        low_confidence=total.count - total.confirmed - potential,
+        confirmation_rate=total.confirmed / total.count if total.count else 0.0,
+        by_day=by_day,
+        by_hour=sorted(dimensions["hour"], key=lambda item: item.bucket),
+        confidence_histogram=histogram,
+        locations=locations,
+    )
\ No newline at end of file
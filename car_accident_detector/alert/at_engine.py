@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, List, NamedTuple, Optional
+from ..config import Config
+from ..metrics import LatencyStats
+
+# Result codes that end a command
+FINAL_RESULTS = ('OK', 'ERROR', 'NO CARRIER', 'BUSY', 'NO ANSWER', 'NO DIALTONE')
+FINAL_ERROR_PREFIXES = ('+CME ERROR:', '+CMS ERROR:')
+
+# Unsolicited result codes; a line with one of these prefixes is only a
+# response when it matches the command in flight (AT+CREG? -> +CREG: 0,1)
+URC_PREFIXES = ('RING', '+CMTI:', '+CMT:', '+CDS:', '+CREG:', '+CGREG:', '+CEREG:', '+CPIN:', '+CFUN:',
+                '+UGNSINF:', '+APP PDP:', 'RDY', 'SMS Ready', 'Call Ready', 'NORMAL POWER DOWN',
+                'UNDER-VOLTAGE', 'OVER-VOLTAGE',
+                '$')  # NMEA sentences, when AT+CGNSTST=1 copies them to the AT port
+# URCs followed by one more line (the message text)
+URC_WITH_BODY = ('+CMT:', '+CDS:')
+
+# Maximum response times from the SIM7000 AT command manual, in seconds
+COMMAND_TIMEOUTS = {
+    'AT+CMGS': 60.0,
+    'AT+COPS': 120.0,
+    'AT+CGATT': 75.0,
+    'AT+CFUN': 10.0,
+    'AT+CGNSPWR': 10.0
+}
+
+class ATResponse(NamedTuple):
+    """
+    Outcome of one AT command
+    """
+    command: str
+    final: str          # 'OK', 'ERROR', '+CME ERROR: <n>', '>' or 'TIMEOUT'
+    lines: List[str]    # Information lines between the command and the final result
+    elapsed: float      # Seconds from write to final result
+
+    @property
+    def ok(self) -> bool:
+        return self.final in ('OK', '>')
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines + [self.final])
+
+    def value(self, prefix: str) -> Optional[str]:
+        """
+        Payload of the first line starting with prefix ('+CSQ:' -> '15,0')
+        """
+        for line in self.lines:
+            if line.startswith(prefix):
+                return line[len(prefix):].strip()
+        return None
+
+class _Pending:
+    def __init__(self, command: str, prompt: bool):
+        self.command = command
+        # Solicited information lines start with the command name
+        name = command[2:].split('=')[0].split('?')[0] if command.upper().startswith('AT+') else None
+        self.prefix = name + ':' if name else None
+        self.prompt = prompt
+        self.lines = []
+        self.final = None
+        self.done = threading.Event()
+
+    def finish(self, final: str):
+        self.final = final
+        self.done.set()
+
+class ATTokenizer:
+    """
+    Splits the modem byte stream into lines, plus the bare '>' prompt that
+    AT+CMGS sends without a line ending
+    """
+
+    def __init__(self):
+        self.buffer = b''
+
+    def feed(self, data: bytes) -> List[str]:
+        self.buffer += data
+        *lines, self.buffer = self.buffer.replace(b'\r', b'\n').split(b'\n')
+        tokens = [line.decode('utf-8', errors='replace').strip() for line in lines]
+        tokens = [token for token in tokens if token]
+        if self.buffer.strip() == b'>':
+            tokens.append('>')
+            self.buffer = b''
+        return tokens
+
+class ATEngine:
+    """
+    Event-driven AT command channel
+
+    A reader thread tokenizes the modem output line by line. command()
+    returns as soon as the final result code (or the '>' prompt) arrives,
+    instead of sleeping for a fixed time. Unsolicited result codes are
+    routed to on_urc and never mixed into a command response.
+    """
+
+    def __init__(self, port, on_urc: Optional[Callable[[str, Optional[str]], None]] = None):
+        """
+        port: pyserial-like object with read(n), in_waiting and write(data)
+        on_urc: called on the reader thread with (urc, body); body is the
+                message text for +CMT/+CDS, otherwise None
+        """
+        self.config = Config()
+        self.port = port
+        self.on_urc = on_urc
+        self.tokenizer = ATTokenizer()
+        self._pending = None
+        self._urc_header = None
+        self._command_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reader = None
+
+        self.urcs = deque(maxlen=20)  # Recent (urc, body), newest last
+        self.urc_count = 0
+        self.timeouts = 0
+        self.stray_results = 0        # Final results that arrived after their command timed out
+        self.latency = LatencyStats()
+
+    def start(self):
+        """Start the reader thread"""
+        if self._reader is not None and self._reader.is_alive():
+            return
+        self._stop.clear()
+        self._reader = threading.Thread(target=self._read_loop, name="at-reader", daemon=True)
+        self._reader.start()
+
+    def stop(self):
+        """Stop the reader thread"""
+        self._stop.set()
+        if self._reader is not None:
+            self._reader.join(2.0)
+            self._reader = None
+
+    def command(self, command: str, timeout: Optional[float] = None, prompt: bool = False,
+                terminator: str = '\r') -> ATResponse:
+        """
+        Send one command and wait for its final result code
+        timeout: seconds; defaults to COMMAND_TIMEOUTS or AT_COMMAND_TIMEOUT
+        prompt: also complete on the '>' prompt (AT+CMGS)
+        terminator: '\\x1A' sends SMS text after the prompt
+        Returns: ATResponse; final is 'TIMEOUT' if nothing final arrived
+        """
+        if timeout is None:
+            name = command.split('=')[0].split('?')[0].upper()
+            timeout = COMMAND_TIMEOUTS.get(name, self.config.AT_COMMAND_TIMEOUT)
+
+        with self._command_lock:
+            pending = _Pending(command, prompt)
+            self._pending = pending
+            started = time.monotonic()
+            try:
+                self.port.write((command + terminator).encode())
+                completed = pending.done.wait(timeout)
+            finally:
+                self._pending = None
+            elapsed = time.monotonic() - started
+
+        if completed:
+            self.latency.add(elapsed)
+            return ATResponse(command, pending.final, list(pending.lines), elapsed)
+        self.timeouts += 1
+        return ATResponse(command, 'TIMEOUT', list(pending.lines), elapsed)
+
+    def _read_loop(self):
+        while not self._stop.is_set():
+            try:
+                # Blocks for the port timeout, then takes whatever else has arrived
+                data = self.port.read(1)
+                if data and self.port.in_waiting:
+                    data += self.port.read(self.port.in_waiting)
+            except Exception as e:
+                print(f"Error reading from modem: {e}")
+                self._stop.wait(1.0)
+                continue
+            if data:
+                for token in self.tokenizer.feed(data):
+                    self._handle_line(token)
+
+    def _handle_line(self, line: str):
+        # Route one tokenized line to the command in flight or to on_urc
+        if self._urc_header is not None:
+            header, self._urc_header = self._urc_header, None
+            self._dispatch_urc(header, line)
+            return
+
+        pending = self._pending
+        is_final = line in FINAL_RESULTS or line.startswith(FINAL_ERROR_PREFIXES)
+        if pending is None or pending.final is not None:
+            if is_final:
+                self.stray_results += 1
+            elif line != '>':
+                self._urc(line)
+            return
+
+        if line == pending.command:
+            return  # Echo
+        if is_final:
+            pending.finish(line)
+        elif line == '>':
+            if pending.prompt:
+                pending.finish(line)
+        elif line.startswith(URC_PREFIXES) and not (pending.prefix and line.startswith(pending.prefix)):
+            self._urc(line)
+        else:
+            pending.lines.append(line)
+
+    def _urc(self, line: str):
+        if line.startswith(URC_WITH_BODY):
+            self._urc_header = line
+        else:
+            self._dispatch_urc(line, None)
+
+    def _dispatch_urc(self, urc: str, body: Optional[str]):
+        self.urcs.append((urc, body))
+        self.urc_count += 1
+        if self.on_urc is not None:
+            try:
+                self.on_urc(urc, body)
+            except Exception as e:
+                print(f"URC handler error: {e}")
+
+    def get_metrics(self) -> dict:
+        """
+        Command count and latency, timeouts and URCs seen
+        """
+        return {
+            'commands': self.latency.count + self.timeouts,
+            'timeouts': self.timeouts,
+            'stray_results': self.stray_results,
+            'urcs': self.urc_count,
+            'latency': self.latency.summary()
+        }
\ No newline at end of file
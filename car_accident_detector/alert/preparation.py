@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+from ..config import Config
+from .serial_manager import PRIORITY_CONTROL
+
+try:
+    from facilities import open_facilities
+except ImportError:
+    # The facilities package lives at the repository root; without it the
+    # alert goes out with the location link only
+    open_facilities = None
+
+# Longest text AT+CMGS sends as a single SMS in GSM text mode
+SMS_MAX_LENGTH = 160
+
+def load_facilities(config: Optional[Config] = None) -> dict:
+    """
+    Facility indexes for the configured FACILITY_*_FILE paths, by kind
+    """
+    config = config or Config()
+    paths = {'hospital': config.FACILITY_HOSPITALS_FILE, 'police': config.FACILITY_POLICE_FILE}
+    indexes = {}
+    if open_facilities is None:
+        return indexes
+    for kind, path in paths.items():
+        if not path:
+            continue
+        try:
+            indexes[kind] = open_facilities(path)
+        except Exception as e:
+            print(f"Failed to load {kind} facilities from {path}: {e}")
+    return indexes
+
+class PreparedAlert(NamedTuple):
+    """
+    Everything send_alert needs, gathered during the cancel window
+    """
+    fix: Optional[object]   # GPSFix the messages were composed from
+    registered: bool        # Modem registered on the network
+    signal_dbm: Optional[int]
+    facilities: Dict[str, object]  # Nearest Facility of each kind
+    messages: List[str]     # Emergency alert first, then one per facility
+
+class AlertPreparation:
+    """
+    Speculative alert preparation while the override countdown runs
+
+    start() launches an "alert-prep" thread that initializes the modem if
+    needed, queries a fresh GPS fix and the network registration at control
+    priority, looks up the nearest facilities and composes the messages. It
+    retries every ALERT_PREP_RETRY_INTERVAL seconds until it has a fresh fix
+    and a registered modem. cancel() stops it between commands; finish()
+    stops it and returns the messages, so the SMS goes out at once.
+
+    Each start() gets its own cancel event. A thread from a cancelled
+    incident may still be blocked in a modem command, but it can no longer
+    publish results, so a new incident always starts from scratch.
+    """
+
+    def __init__(self, gps, sim7000c, facilities: Optional[dict] = None):
+        """
+        gps, sim7000c: drivers sharing one SerialPortManager
+        facilities: {kind: index with nearest()}, see load_facilities()
+        """
+        self.config = Config()
+        self.gps = gps
+        self.sim7000c = sim7000c
+        self.facilities = facilities or {}
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._prepared = None
+        self.started_at = None
+        self.ready_at = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once a fresh fix and network registration were confirmed"""
+        return self.ready_at is not None
+
+    def start(self):
+        """Start preparing an alert from the current position"""
+        # Retire any previous run, even one still blocked on the modem
+        self._cancel.set()
+        cancel = threading.Event()
+        with self._lock:
+            self._cancel = cancel
+            self._prepared = self.compose(self.gps.get_fix(), False, None)
+            self.started_at = time.monotonic()
+            self.ready_at = None
+        self._thread = threading.Thread(target=self._run, args=(cancel,), name="alert-prep", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """
+        Stop preparing; the command already on the wire is left to finish,
+        nothing further is queued
+        """
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait for the preparation thread to exit"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def finish(self) -> PreparedAlert:
+        """
+        Stop preparing and return the alert, recomposed if the GPS poller
+        delivered a newer fix in the meantime
+        """
+        self.cancel()
+        with self._lock:
+            prepared = self._prepared
+        fix = self.gps.get_fix()
+        if prepared is None:
+            return self.compose(fix, False, None)
+        if fix != prepared.fix:
+            return self.compose(fix, prepared.registered, prepared.signal_dbm)
+        return prepared
+
+    def compose(self, fix, registered: bool, signal_dbm: Optional[int]) -> PreparedAlert:
+        """
+        Alert messages for fix, with the nearest facility of each kind
+        """
+        nearest = {}
+        if fix is not None:
+            for kind, index in self.facilities.items():
+                matches = index.nearest(fix.latitude, fix.longitude)
+                if matches:
+                    nearest[kind] = matches[0]
+        messages = [self.sim7000c.compose_alert(self.gps.get_google_maps_link(fix))]
+        for kind, facility in nearest.items():
+            text = f"Nearest {kind}: {facility.name}, {facility.phone}, {facility.distance_km:.1f} km"
+            messages.append(text[:SMS_MAX_LENGTH])
+        return PreparedAlert(fix, registered, signal_dbm, nearest, messages)
+
+    def _publish(self, cancel: threading.Event, prepared: PreparedAlert, ready: bool = False):
+        # Results of a cancelled or superseded run are dropped
+        with self._lock:
+            if cancel.is_set():
+                return
+            self._prepared = prepared
+            if ready:
+                self.ready_at = time.monotonic()
+
+    def _run(self, cancel: threading.Event):
+        # Only a fix reported after the accident counts as fresh
+        started = time.time()
+        registered, signal_dbm = False, None
+        try:
+            if not self.sim7000c.initialized:
+                self.sim7000c.initialize_module()
+            while not cancel.is_set():
+                fix = self.gps.get_fix()
+                if fix is None or fix.timestamp < started:
+                    self.gps.poll(PRIORITY_CONTROL)
+                    fix = self.gps.get_fix()
+                if not registered and not cancel.is_set():
+                    registered, signal_dbm = self.sim7000c.check_network()
+                ready = registered and fix is not None and fix.timestamp >= started
+                self._publish(cancel, self.compose(fix, registered, signal_dbm), ready)
+                if ready:
+                    return
+                cancel.wait(self.config.ALERT_PREP_RETRY_INTERVAL)
+        except Exception as e:
+            print(f"Alert preparation failed: {e}")
\ No newline at end of file
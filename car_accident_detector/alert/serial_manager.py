@@ -0,0 +1,165 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+import serial
+from ..config import Config
+from ..metrics import LatencyStats
+from .at_engine import ATEngine, ATResponse
+
+# Request priorities, lowest value runs first
+PRIORITY_ALERT = 0     # Emergency SMS
+PRIORITY_CONTROL = 1   # Initialization and one-off queries
+PRIORITY_POLL = 2      # Periodic GPS and signal polling
+PRIORITY_NAMES = {PRIORITY_ALERT: 'alert', PRIORITY_CONTROL: 'control', PRIORITY_POLL: 'poll'}
+
+class SerialPortManager:
+    """
+    Sole owner of the SIM7000C serial port, shared by the modem and its GNSS
+
+    Requests are functions of the ATEngine, run one at a time on a
+    "modem-commands" thread from a priority queue. An emergency SMS
+    therefore waits at most for the command already on the wire, never
+    behind queued GPS polls. Each requester gets its own responses back
+    through a Future, and URCs are routed to subscribers by prefix.
+    """
+
+    def __init__(self, port=None):
+        """
+        port: already open pyserial-like port; by default SERIAL_PORT is
+              opened by open()
+        """
+        self.config = Config()
+        self.port = port
+        self.engine = None
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._worker = None
+
+        self.executed = 0
+        self.unrouted_urcs = 0
+        self.queue_latency = {name: LatencyStats() for name in PRIORITY_NAMES.values()}
+
+    @property
+    def is_open(self) -> bool:
+        return self._worker is not None
+
+    def open(self) -> bool:
+        """
+        Open the serial port (once, however many drivers call this)
+        Returns: True if the port is open
+        """
+        if self.is_open:
+            return True
+        if self.port is None:
+            try:
+                # A short read timeout only bounds how long close() waits for the reader
+                self.port = serial.Serial(
+                    self.config.SERIAL_PORT,
+                    self.config.BAUD_RATE,
+                    timeout=0.1
+                )
+            except Exception as e:
+                print(f"Failed to open {self.config.SERIAL_PORT}: {e}")
+                return False
+        self.start()
+        return True
+
+    def start(self):
+        """Start the AT engine and the command worker on self.port"""
+        self.engine = ATEngine(self.port, on_urc=self._route_urc)
+        self.engine.start()
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._work, name="modem-commands", daemon=True)
+        self._worker.start()
+
+    def close(self):
+        """Stop the worker, cancel queued requests and release the port"""
+        if self._worker is None:
+            return
+        self._stop.set()
+        # Sorts ahead of every request, so the worker exits at once
+        self._queue.put((-1, next(self._sequence), 0.0, None, None))
+        self._worker.join(2.0)
+        self._worker = None
+        while True:
+            try:
+                _, _, _, _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None:
+                future.cancel()
+        self.engine.stop()
+        if hasattr(self.port, 'close'):
+            self.port.close()
+
+    def subscribe(self, prefix: str, handler: Callable[[str, Optional[str]], None]):
+        """
+        Route URCs starting with prefix to handler(urc, body)
+        Handlers run on the reader thread and must not issue commands
+        """
+        self._subscribers.append((prefix, handler))
+
+    def submit(self, request: Callable[[ATEngine], object], priority: int = PRIORITY_CONTROL) -> Future:
+        """
+        Queue request(engine); it runs alone on the port, so multi-command
+        exchanges such as AT+CMGS and its text cannot be interleaved
+        Returns: Future with the request's return value
+        """
+        future = Future()
+        if not self.is_open:
+            future.set_exception(RuntimeError("Serial port is not open"))
+            return future
+        self._queue.put((priority, next(self._sequence), time.monotonic(), request, future))
+        return future
+
+    def run(self, request: Callable[[ATEngine], object], priority: int = PRIORITY_CONTROL,
+            timeout: Optional[float] = None):
+        """Submit a request and wait for its result"""
+        return self.submit(request, priority).result(timeout)
+
+    def command(self, command: str, priority: int = PRIORITY_CONTROL, **kwargs) -> ATResponse:
+        """Run a single AT command through the queue"""
+        return self.run(lambda engine: engine.command(command, **kwargs), priority)
+
+    def _work(self):
+        while not self._stop.is_set():
+            priority, _, queued, request, future = self._queue.get()
+            if request is None:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.queue_latency[PRIORITY_NAMES[priority]].add(time.monotonic() - queued)
+            try:
+                future.set_result(request(self.engine))
+            except Exception as e:
+                future.set_exception(e)
+            self.executed += 1
+
+    def _route_urc(self, urc: str, body: Optional[str]):
+        routed = False
+        for prefix, handler in self._subscribers:
+            if urc.startswith(prefix):
+                routed = True
+                try:
+                    handler(urc, body)
+                except Exception as e:
+                    print(f"URC handler error: {e}")
+        if not routed:
+            self.unrouted_urcs += 1
+
+    def get_metrics(self) -> dict:
+        """
+        Queue depth, per-priority queueing latency and AT engine metrics
+        """
+        return {
+            'queued': self._queue.qsize(),
+            'executed': self.executed,
+            'unrouted_urcs': self.unrouted_urcs,
+            'queue_latency': {name: stats.summary() for name, stats in self.queue_latency.items()},
+            'engine': self.engine.get_metrics() if self.engine else None
+        }
\ No newline at end of file
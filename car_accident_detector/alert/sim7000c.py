@@ -1,91 +1,83 @@
-import serial
-import time
-from typing import Optional
+from typing import Optional, Tuple
 from ..config import Config
+from .at_engine import COMMAND_TIMEOUTS
+from .serial_manager import PRIORITY_ALERT, PRIORITY_CONTROL, SerialPortManager
+
+# URCs the modem driver handles: incoming SMS and registration changes
+MODEM_URC_PREFIXES = ('+CMTI:', '+CMT:', '+CREG:', '+CEREG:', 'RING')
 
 class SIM7000C:
     """
     Interface for SIM7000C GSM/GPS module
     """
     
-    def __init__(self):
+    def __init__(self, manager: Optional[SerialPortManager] = None):
+        """
+        manager: serial port shared with GPSInterface; one is created if not given
+        """
         self.config = Config()
-        self.serial_port = None
+        self.manager = manager if manager is not None else SerialPortManager()
         self.initialized = False
+        for prefix in MODEM_URC_PREFIXES:
+            self.manager.subscribe(prefix, self.handle_urc)
     
     def connect(self) -> bool:
         """
-        Connect to SIM7000C module via serial
+        Connect to SIM7000C module via the shared serial port
         Returns: True if connected successfully
         """
-        try:
-            self.serial_port = serial.Serial(
-                self.config.SERIAL_PORT,
-                self.config.BAUD_RATE,
-                timeout=2
-            )
-            print("Connected to SIM7000C")
-            return True
-        except Exception as e:
-            print(f"Failed to connect to SIM7000C: {e}")
+        if not self.manager.open():
+            print("Failed to connect to SIM7000C")
             return False
+        print("Connected to SIM7000C")
+        return True
+    
+    def handle_urc(self, urc: str, body: Optional[str]):
+        """Unsolicited result codes (incoming SMS, registration changes)"""
+        print(f"SIM7000C: {urc}" + (f" {body}" if body else ""))
     
-    def send_at_command(self, command: str, wait_time: float = 1.0) -> str:
+    def send_at_command(self, command: str, timeout: Optional[float] = None) -> str:
         """
         Send AT command to SIM7000C and return response
+        Returns as soon as the final result code arrives
         """
-        if not self.serial_port:
-            return ""
-            
-        try:
-            # Clear input buffer
-            self.serial_port.flushInput()
-            
-            # Send command
-            cmd = command + '\r\n'
-            self.serial_port.write(cmd.encode())
-            time.sleep(wait_time)
-            
-            # Read response
-            response = ""
-            start_time = time.time()
-            while time.time() - start_time < 2.0:
-                if self.serial_port.in_waiting > 0:
-                    response += self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
-                time.sleep(0.1)
-            
-            return response
-        except Exception as e:
-            print(f"Error sending AT command: {e}")
+        if not self.manager.is_open:
             return ""
+        return self.manager.command(command, timeout=timeout).text
     
     def initialize_module(self) -> bool:
         """
         Initialize SIM7000C module
         Returns: True if initialization successful
         """
-        if not self.serial_port:
+        if not self.manager.is_open:
             return False
-            
+        
         print("Initializing SIM7000C...")
+        if not self.manager.run(self._initialize, PRIORITY_CONTROL):
+            print("Module not responding to AT commands")
+            return False
         
+        print("SIM7000C initialized successfully")
+        self.initialized = True
+        return True
+    
+    def _initialize(self, engine) -> bool:
         # Test communication
-        response = self.send_at_command("AT", 1)
-        if "OK" not in response:
-            print("Module not responding to AT commands")
+        if not engine.command("AT").ok:
             return False
         
+        # Disable command echo
+        engine.command("ATE0")
+        
         # Set SMS mode to text
-        self.send_at_command("AT+CMGF=1", 1)
+        engine.command("AT+CMGF=1")
         
         # Set SMS character set
-        self.send_at_command("AT+CSCS=\"GSM\"", 1)
+        engine.command("AT+CSCS=\"GSM\"")
         
         # Enable SMS notification
-        self.send_at_command("AT+CNMI=1,2,0,0,0", 1)
-        
-        print("SIM7000C initialized successfully")
-        self.initialized = True
+        engine.command("AT+CNMI=1,2,0,0,0")
         return True
     
     def send_sms(self, phone_number: str, message: str) -> bool:
@@ -96,58 +88,71 @@ class SIM7000C:
         if not self.initialized:
             print("Module not initialized")
             return False
-            
-        try:
-            # Send SMS command
-            self.send_at_command(f"AT+CMGS=\"{phone_number}\"", 1)
-            
-            # Send message content
-            self.serial_port.write(message.encode())
-            
-            # Send Ctrl+Z to terminate message
-            self.serial_port.write(b'\x1A')
-            
-            # Wait for response
-            time.sleep(3)
-            
-            response = self.serial_port.read_all().decode('utf-8', errors='ignore')
-            if "OK" in response or "+CMGS" in response:
-                print(f"SMS sent successfully to {phone_number}")
-                return True
-            else:
-                print(f"Failed to send SMS to {phone_number}")
-                return False
-                
-        except Exception as e:
-            print(f"Error sending SMS: {e}")
+        
+        # Runs ahead of any queued GPS or signal polling
+        response = self.manager.run(lambda engine: self._send_sms(engine, phone_number, message), PRIORITY_ALERT)
+        if response.ok:
+            print(f"SMS sent successfully to {phone_number}")
+            return True
+        else:
+            print(f"Failed to send SMS to {phone_number}: {response.final}")
             return False
     
+    def _send_sms(self, engine, phone_number: str, message: str):
+        # Wait for the '>' prompt, then send the text terminated by Ctrl+Z
+        response = engine.command(f"AT+CMGS=\"{phone_number}\"", prompt=True)
+        if response.final != '>':
+            return response
+        return engine.command(message, timeout=COMMAND_TIMEOUTS['AT+CMGS'], terminator='\x1A')
+    
     def send_alert(self, phone_number: str, location_link: Optional[str] = None) -> bool:
         """
         Send accident alert SMS
         """
-        if location_link:
-            message = f"EMERGENCY: Car accident detected! Location: {location_link}"
-        else:
-            message = "EMERGENCY: Car accident detected! Location unknown."
-        
+        message = self.compose_alert(location_link)
         print(f"Sending alert: {message}")
         return self.send_sms(phone_number, message)
     
+    def compose_alert(self, location_link: Optional[str] = None) -> str:
+        """
+        Text of the accident alert SMS
+        """
+        if location_link:
+            return f"EMERGENCY: Car accident detected! Location: {location_link}"
+        return "EMERGENCY: Car accident detected! Location unknown."
+    
+    def check_network(self) -> Tuple[bool, Optional[int]]:
+        """
+        Network registration and signal strength, in one queued request
+        Returns: (registered, signal in dBm or None)
+        """
+        if not self.manager.is_open:
+            return False, None
+        registration, signal = self.manager.run(
+            lambda engine: (engine.command("AT+CREG?"), engine.command("AT+CSQ")), PRIORITY_CONTROL
+        )
+        # "+CREG: 0,1" is home network, "+CREG: 0,5" roaming
+        registered = (registration.value("+CREG:") or "").split(",")[-1] in ("1", "5")
+        return registered, self._signal_dbm(signal)
+    
     def get_signal_strength(self) -> Optional[int]:
         """
         Get network signal strength
         Returns: Signal strength in dBm or None if unavailable
         """
-        response = self.send_at_command("AT+CSQ", 1)
-        if "+CSQ:" in response:
-            try:
-                # Parse response like "+CSQ: 15,0"
-                parts = response.split("+CSQ:")[1].split(",")[0].strip()
-                signal = int(parts)
-                # Convert to dBm (approximate)
-                dBm = -113 + (signal * 2)
-                return dBm
-            except:
-                pass
-        return None
\ No newline at end of file
+        if not self.manager.is_open:
+            return None
+        return self._signal_dbm(self.manager.command("AT+CSQ"))
+    
+    def _signal_dbm(self, response) -> Optional[int]:
+        # Parse response like "+CSQ: 15,0"
+        value = response.value("+CSQ:")
+        try:
+            signal = int(value.split(",")[0])
+        except (AttributeError, ValueError):
+            return None
+        # 99 means not known or not detectable
+        if signal == 99:
+            return None
+        # Convert to dBm (approximate)
+        return -113 + (signal * 2)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 
 @dataclass
 class Config:
@@ -17,14 +17,45 @@ class Config:
     MODEL_PATH: str = "models/accident_model.tflite"
     CONFIDENCE_THRESHOLD: float = 0.8
     
+    # Inference scheduling
+    INFERENCE_HOP_SIZE: int = 10          # Run the model every 10 samples (5 Hz) on quiet driving
+    GATE_ACCEL_DEVIATION: float = 1.5     # g away from 1 g (|accel|) that forces inference
+    GATE_JERK: float = 50.0               # g/s change of |accel| that forces inference
+    GATE_GYRO_RATE: float = 100.0         # deg/s on any axis that forces inference
+    GATE_HOLD_SAMPLES: int = 50           # Keep inferring every sample this long after a trigger
+    
+    # Streaming inference (single-step LSTM with state kept between samples)
+    USE_STREAMING_INFERENCE: bool = False
+    STREAMING_MODEL_PATH: str = "models/accident_model_stream.tflite"
+    STREAMING_RESYNC_INTERVAL: int = 100  # Samples between exact resyncs to the windowed state
+    
+    # Acquisition/inference pipeline
+    PIPELINE_QUEUE_SIZE: int = 250        # Samples buffered between acquisition and inference (5 s)
+    
+    # Sensor calibration
+    CALIBRATION_FILE: str = "data/calibration.json"
+    CALIBRATION_MAX_SAMPLES: int = 1000     # Upper bound (10 s at 10 ms per sample)
+    CALIBRATION_MIN_SAMPLES: int = 50
+    CALIBRATION_ACCEL_TOLERANCE: float = 0.001  # g, standard error at which accel offsets are final
+    CALIBRATION_GYRO_TOLERANCE: float = 0.02    # deg/s, standard error at which gyro offsets are final
+    CALIBRATION_MAX_TEMP_DELTA: float = 5.0     # °C from the stored calibration before recalibrating
+    STATIONARY_ACCEL_STD: float = 0.02      # g spread of |accel| allowed while at rest
+    STATIONARY_GYRO_STD: float = 1.0        # deg/s spread per gyro axis allowed while at rest
+    
     # Alert configuration
     ALERT_DELAY: int = 15         # 15 seconds delay before sending alert
     PHONE_NUMBER: str = "+1234567890"  # Emergency contact
-    GPS_POLL_INTERVAL: int = 10   # GPS update interval in seconds
+    GPS_POLL_INTERVAL: float = 1.0  # Seconds between AT+CGNSINF polls
+    GPS_TRACK_LENGTH: int = 300   # Recent fixes kept in the track history
+    GPS_MAX_FIX_AGE: int = 300    # Seconds before the last fix is considered stale
+    ALERT_PREP_RETRY_INTERVAL: float = 1.0  # Seconds between fix / registration retries during the countdown
+    FACILITY_HOSPITALS_FILE: Optional[str] = None  # hub_coords.json format (or its compiled .fdb), for the alert SMS
+    FACILITY_POLICE_FILE: Optional[str] = None     # police_coords.json format
     
     # Hardware pins
     BUTTON_PIN: int = 18          # GPIO pin for override button
     LED_PIN: int = 24             # GPIO pin for status LED
+    MPU6050_INT_PIN: Optional[int] = None  # GPIO pin wired to MPU6050 INT; None paces sampling on deadlines
     
     # Data storage
     DATA_DIR: str = "data"
@@ -33,6 +64,7 @@ class Config:
     # SIM7000C configuration
     SERIAL_PORT: str = "/dev/ttyS0"
     BAUD_RATE: int = 115200
+    AT_COMMAND_TIMEOUT: float = 5.0  # Seconds to wait for a final result code (long commands have their own)
     
     @classmethod
     def from_env(cls):
@@ -6,26 +6,52 @@ import numpy as np
 
 from .config import Config
 from .sensors.mpu6050 import MPU6050
+from .sensors.calibration import CalibrationStore, calibrate_on_boot
 from .sensors.gps import GPSInterface
+from .sensors.sample_clock import SampleClock
 from .ml.preprocessing import DataPreprocessor
 from .ml.inference import AccidentDetector
+from .ml.scheduler import InferenceScheduler
+from .ml.streaming import StreamingAccidentDetector
+from .alert.preparation import AlertPreparation, load_facilities
+from .alert.serial_manager import SerialPortManager
 from .alert.sim7000c import SIM7000C
+from .pipeline import DetectionPipeline
 
 class CarAccidentDetector:
-    \"\"\"
+    """
     Main controller for car accident detection system
-    \"\"\"
+    """
     
     def __init__(self):
+        # Boot time, for measuring how long until detection is live
+        self.boot_started = time.monotonic()
         self.config = Config()
         self.setup_gpio()
         
         # Initialize components
         self.mpu6050 = MPU6050()
-        self.gps = GPSInterface()
+        self.calibration_store = CalibrationStore()
+        self.sample_clock = self.setup_sample_clock()
+        # GPS and modem share the SIM7000C serial port
+        self.modem = SerialPortManager()
+        self.gps = GPSInterface(self.modem)
         self.preprocessor = DataPreprocessor()
         self.detector = AccidentDetector()
-        self.sim7000c = SIM7000C()
+        self.scheduler = InferenceScheduler()
+        self.streaming = self.setup_streaming()
+        self.sim7000c = SIM7000C(self.modem)
+        # Gathers fix, registration and messages during the override countdown
+        self.preparation = AlertPreparation(self.gps, self.sim7000c, load_facilities(self.config))
+        self.pipeline = DetectionPipeline(
+            read_sample=self.mpu6050.read_sensor_data,
+            preprocessor=self.preprocessor,
+            detector=self.detector,
+            scheduler=self.scheduler,
+            on_accident=self.handle_detection,
+            sample_clock=self.sample_clock,
+            streaming=self.streaming
+        )
         
         # State variables
         self.accident_detected = False
@@ -36,7 +62,7 @@ class CarAccidentDetector:
         self.calibrate_sensors()
         
     def setup_gpio(self):
-        \"\"\"Setup GPIO pins\"\"\"
+        """Setup GPIO pins"""
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(self.config.BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         GPIO.setup(self.config.LED_PIN, GPIO.OUT)
@@ -50,47 +76,73 @@ class CarAccidentDetector:
             bouncetime=300
         )
     
+    def setup_sample_clock(self) -> SampleClock:
+        """Pace sampling on the MPU6050 data-ready interrupt if wired, else on deadlines"""
+        if self.config.MPU6050_INT_PIN is None:
+            return SampleClock()
+        sample_clock = SampleClock(interrupt=True)
+        self.mpu6050.enable_data_ready_interrupt(self.config.SAMPLING_RATE)
+        GPIO.setup(self.config.MPU6050_INT_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+        GPIO.add_event_detect(
+            self.config.MPU6050_INT_PIN,
+            GPIO.RISING,
+            callback=sample_clock.data_ready
+        )
+        return sample_clock
+    
+    def setup_streaming(self) -> Optional[StreamingAccidentDetector]:
+        """Load the single-step model when streaming inference is enabled"""
+        if not self.config.USE_STREAMING_INFERENCE:
+            return None
+        streaming = StreamingAccidentDetector()
+        if streaming.interpreter is None:
+            print("Falling back to windowed inference")
+            return None
+        return streaming
+    
     def calibrate_sensors(self):
-        \"\"\"Calibrate MPU6050 sensor\"\"\"
-        print(\"Calibrating sensors...\")
+        """Apply stored MPU6050 calibration, or calibrate and store it"""
+        print("Calibrating sensors...")
+        started = time.monotonic()
         try:
-            accel_offsets, gyro_offsets = self.mpu6050.calibrate()
-            print(\"Sensor calibration completed\")
+            source = calibrate_on_boot(self.mpu6050, self.calibration_store)
+            print(f"Sensor calibration completed ({source} offsets, {time.monotonic() - started:.2f} s)")
         except Exception as e:
-            print(f\"Sensor calibration failed: {e}\")
+            print(f"Sensor calibration failed: {e}")
     
     def initialize_communications(self):
-        \"\"\"Initialize GPS and SIM7000C modules\"\"\"
-        print(\"Initializing communications...\")
+        """Initialize GPS and SIM7000C modules"""
+        print("Initializing communications...")
         
         # Initialize GPS
         if self.gps.connect():
-            print(\"GPS module connected\")
+            print("GPS module connected, polling in the background")
         else:
-            print(\"Failed to connect to GPS module\")
+            print("Failed to connect to GPS module")
         
         # Initialize SIM7000C
         if self.sim7000c.connect() and self.sim7000c.initialize_module():
-            print(\"SIM7000C module initialized\")
+            print("SIM7000C module initialized")
             # Check signal strength
             signal = self.sim7000c.get_signal_strength()
             if signal:
-                print(f\"GSM signal strength: {signal} dBm\")
+                print(f"GSM signal strength: {signal} dBm")
         else:
-            print(\"Failed to initialize SIM7000C module\")
+            print("Failed to initialize SIM7000C module")
     
     def button_pressed(self, channel):
-        \"\"\"Handle button press event\"\"\"
-        print(\"Button pressed!\")
+        """Handle button press event"""
+        print("Button pressed!")
         if self.accident_detected:
             self.cancel_alert()
     
     def start_alert_timer(self):
-        \"\"\"Start timer for sending alert\"\"\"
+        """Start timer for sending alert"""
         if self.alert_timer is None:
-            print(f\"Accident detected! Sending alert in {self.config.ALERT_DELAY} seconds...\")
-            print(\"Press button to cancel...\")
+            print(f"Accident detected! Sending alert in {self.config.ALERT_DELAY} seconds...")
+            print("Press button to cancel...")
             GPIO.output(self.config.LED_PIN, GPIO.HIGH)
+            self.preparation.start()
             self.alert_timer = threading.Timer(
                 self.config.ALERT_DELAY, 
                 self.send_alert
@@ -98,70 +150,102 @@ class CarAccidentDetector:
             self.alert_timer.start()
     
     def cancel_alert(self):
-        \"\"\"Cancel pending alert\"\"\"
+        """Cancel pending alert"""
         if self.alert_timer and self.alert_timer.is_alive():
             self.alert_timer.cancel()
+            self.preparation.cancel()
             self.alert_timer = None
             self.accident_detected = False
             GPIO.output(self.config.LED_PIN, GPIO.LOW)
-            print(\"Alert cancelled!\")
+            print("Alert cancelled!")
     
     def send_alert(self):
-        \"\"\"Send accident alert\"\"\"
-        print(\"Sending emergency alert...\")
+        """Send accident alert"""
+        print("Sending emergency alert...")
+        started = time.monotonic()
         
-        # Get current location
-        location_link = self.gps.get_google_maps_link()
-        if not location_link:
-            print(\"Warning: No GPS location available\")
+        # Location, network check and messages were prepared during the countdown
+        prepared = self.preparation.finish()
+        if prepared.fix is None:
+            print("Warning: No GPS location available")
+        if not prepared.registered:
+            print("Warning: Modem not registered on the network, trying anyway")
         
         # Send SMS alert
-        success = self.sim7000c.send_alert(self.config.PHONE_NUMBER, location_link)
+        print(f"Sending alert: {prepared.messages[0]}")
+        success = self.sim7000c.send_sms(self.config.PHONE_NUMBER, prepared.messages[0])
         
         if success:
-            print(\"Emergency alert sent successfully!\")
+            print(f"Emergency alert sent successfully in {time.monotonic() - started:.2f} s!")
+            # Nearest hospital / police station follow the alert
+            for message in prepared.messages[1:]:
+                self.sim7000c.send_sms(self.config.PHONE_NUMBER, message)
         else:
-            print(\"Failed to send emergency alert!\")
+            print("Failed to send emergency alert!")
         
         # Reset state
         self.alert_timer = None
         GPIO.output(self.config.LED_PIN, GPIO.LOW)
     
+    def handle_detection(self, timestamp: float, confidence: float):
+        """Handle a positive prediction (runs on the pipeline's alert thread)"""
+        if self.accident_detected:
+            return
+        print(f"Accident detected at {time.strftime('%H:%M:%S', time.localtime(timestamp))}! "
+              f"Confidence: {confidence:.3f}")
+        self.accident_detected = True
+        self.start_alert_timer()
+    
     def run_detection_loop(self):
-        \"\"\"Main detection loop\"\"\"
-        print(\"Starting accident detection...\")
-        print(\"Press Ctrl+C to stop\")
+        """Main detection loop"""
+        print("Starting accident detection...")
+        print("Press Ctrl+C to stop")
         
+        # Acquisition, inference and alerts run on the pipeline's threads
+        self.pipeline.start()
+        dropped = 0
+        ready_reported = False
         try:
             while self.system_active:
-                # Read sensor data
-                sensor_data = self.mpu6050.read_sensor_data()
-                
-                # Add to preprocessor buffer
-                self.preprocessor.add_data(sensor_data)
-                
-                # Get processed data window
-                processed_data = self.preprocessor.get_processed_window()
-                
-                # Run inference if we have enough data
-                if processed_data is not None:
-                    is_accident, confidence = self.detector.predict(processed_data)
-                    
-                    if is_accident and not self.accident_detected:
-                        print(f\"Accident detected! Confidence: {confidence:.3f}\")
-                        self.accident_detected = True
-                        self.start_alert_timer()
-                
-                # Small delay to control sampling rate
-                time.sleep(1.0 / self.config.SAMPLING_RATE)
+                time.sleep(1.0)
+                if not ready_reported and self.pipeline.first_inference_at is not None:
+                    print(f"Detection live {self.pipeline.first_inference_at - self.boot_started:.2f} s after boot")
+                    ready_reported = True
+                metrics = self.pipeline.get_metrics()
+                if metrics['dropped_samples'] > dropped:
+                    print(f"Warning: inference fell behind, {metrics['dropped_samples'] - dropped} samples dropped "
+                          f"(queue {metrics['queue_occupancy']}/{metrics['queue_capacity']})")
+                    dropped = metrics['dropped_samples']
                 
         except KeyboardInterrupt:
-            print(\"\
-Stopping detection system...\")
+            print("\nStopping detection system...")
             self.system_active = False
+        finally:
+            self.pipeline.stop()
+        
+        if self.streaming is not None:
+            # The pipeline bypasses the scheduler in streaming mode
+            print(f"Streaming model ran {self.streaming.steps} steps on {self.streaming.samples} samples "
+                  f"({self.streaming.resyncs} resyncs)")
+        else:
+            metrics = self.scheduler.get_metrics()
+            print(f"Model ran {metrics['inferences']} times on {metrics['samples']} samples "
+                  f"({metrics['inferences_per_second']:.1f}/s, {metrics['gated_inferences']} forced by the gate)")
+        pacing = self.sample_clock.get_metrics()
+        print(f"Sampled at {pacing['observed_rate']:.2f} Hz (target {pacing['target_rate']} Hz), "
+              f"{pacing['missed_deadlines']} missed deadlines, {pacing['interval_jitter_ms']:.2f} ms jitter")
+        metrics = self.pipeline.get_metrics()
+        print(f"Pipeline: {metrics['dropped_samples']} dropped samples, "
+              f"queue high water {metrics['queue_high_water']}/{metrics['queue_capacity']}")
+        for stage, latency in metrics['latency'].items():
+            print(f"  {stage}: mean {latency['mean_ms']:.2f} ms, max {latency['max_ms']:.2f} ms")
+        metrics = self.modem.get_metrics()
+        print(f"Modem: {metrics['executed']} requests, {metrics['unrouted_urcs']} unrouted URCs")
+        for priority, latency in metrics['queue_latency'].items():
+            print(f"  {priority} queueing: mean {latency['mean_ms']:.2f} ms, max {latency['max_ms']:.2f} ms")
     
     def run(self):
-        \"\"\"Main application entry point\"\"\"
+        """Main application entry point"""
         try:
             # Initialize communications
             self.initialize_communications()
@@ -170,12 +254,14 @@ Stopping detection system...\")
             self.run_detection_loop()
             
         except Exception as e:
-            print(f\"Error in main application: {e}\")
+            print(f"Error in main application: {e}")
         finally:
             # Cleanup
+            self.gps.stop()
+            self.modem.close()
             GPIO.cleanup()
-            print(\"System shutdown complete\")
+            print("System shutdown complete")
 
-if __name__ == \"__main__\":
+if __name__ == "__main__":
     detector = CarAccidentDetector()
     detector.run()
\ No newline at end of file
@@ -0,0 +1,23 @@
+class LatencyStats:
+    """
+    Running count, mean and maximum of one latency, e.g. a pipeline stage
+    or a modem command
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_ms': 1000 * self.total / self.count if self.count else 0.0,
+            'max_ms': 1000 * self.maximum
+        }
\ No newline at end of file
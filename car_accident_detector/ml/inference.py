@@ -49,8 +49,8 @@ class AccidentDetector:
             return False, 0.0
             
         try:
-            # Set input tensor
-            self.interpreter.set_tensor(self.input_details[0]['index'], sensor_data.astype(np.float32))
+            # Set input tensor (float32 windows from DataPreprocessor are passed through without a copy)
+            self.interpreter.set_tensor(self.input_details[0]['index'], np.asarray(sensor_data, dtype=np.float32))
             
             # Run inference
             self.interpreter.invoke()
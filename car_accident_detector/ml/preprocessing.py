@@ -11,29 +11,57 @@ class DataPreprocessor:
         self.config = Config()
         self.window_size = self.config.WINDOW_SIZE
         self.features = self.config.FEATURES
-        self.data_buffer = []
+        # Clip range per axis: ±2 g acceleration, ±250 deg/s rotation
+        self.scale = np.array([2.0] * 3 + [250.0] * (self.features - 3), dtype=np.float32)
+        self.reset()
+    
+    def reset(self):
+        """
+        Drop all buffered samples
+        """
+        window = self.window_size
+        # The window is stored twice, side by side: each sample is written at
+        # slot and slot + window_size, so the latest window_size samples are
+        # always the contiguous rows [start, start + window_size)
+        self._ring = np.zeros((2 * window, self.features), dtype=np.float32)
+        self._count = 0
+        # One read-only (1, window, features) view per start position, built
+        # once so reading a window allocates nothing
+        self._windows = []
+        for start in range(window):
+            view = self._ring[start:start + window].reshape(1, window, self.features)
+            view.flags.writeable = False
+            self._windows.append(view)
+    
+    @property
+    def data_buffer(self) -> np.ndarray:
+        """
+        Buffered samples, oldest first, already normalized (at most window_size rows)
+        """
+        available = min(self._count, self.window_size)
+        return self._windows[self._count % self.window_size][0, self.window_size - available:]
         
     def add_data(self, sensor_data: Tuple[float, float, float, float, float, float]):
         """
         Add new sensor data to buffer
         sensor_data: (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
         """
-        self.data_buffer.append(sensor_data)
-        # Keep only the last window_size samples
-        if len(self.data_buffer) > self.window_size:
-            self.data_buffer.pop(0)
+        slot = self._count % self.window_size
+        row = self._ring[slot]
+        # Normalized once here instead of over the whole window on every read
+        np.clip(sensor_data, -self.scale, self.scale, out=row)
+        row /= self.scale
+        self._ring[slot + self.window_size] = row
+        self._count += 1
     
     def get_window(self) -> np.ndarray:
         """
-        Get current data window as numpy array
-        Returns: numpy array of shape (window_size, features)
+        Get current data window as a view into the buffer
+        Returns: normalized float32 array of shape (window_size, features)
         """
-        if len(self.data_buffer) < self.window_size:
+        if self._count < self.window_size:
             return None
-            
-        # Convert to numpy array
-        data_array = np.array(self.data_buffer[-self.window_size:])
-        return data_array
+        return self._windows[self._count % self.window_size][0]
     
     def normalize_data(self, data: np.ndarray) -> np.ndarray:
         """
@@ -69,8 +97,8 @@ class DataPreprocessor:
     def get_processed_window(self) -> np.ndarray:
         """
         Get fully processed data window ready for model inference
+        Returns: read-only (1, window_size, features) view, valid until the next add_data
         """
-        window = self.get_window()
-        if window is None:
+        if self._count < self.window_size:
             return None
-        return self.extract_features(window)
\ No newline at end of file
+        return self._windows[self._count % self.window_size]
\ No newline at end of file
@@ -8,6 +8,7 @@ from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
 import tensorflow as tf
 import os
+from streaming_export import export_streaming_model
 
 def load_and_preprocess_data(data_path: str):
     """
@@ -140,6 +141,16 @@ def train_model(data_path: str, model_type: str = 'lstm', model_save_path: str =
     print(f"Model saved as {model_save_path}")
     print(f"TensorFlow Lite model saved as {tflite_path}")
     
+    # Single-step model with explicit LSTM state for streaming inference
+    if model_type == 'lstm':
+        stream_path = model_save_path.replace('.h5', '_stream.tflite')
+        try:
+            export_streaming_model(model, stream_path)
+            print(f"Streaming TensorFlow Lite model saved as {stream_path}")
+        except Exception as e:
+            print(f"Failed to export streaming model: {e}")
+            print("Keeping the windowed model only")
+    
     return model, history
 
 def generate_sample_data(filename: str = 'sample_data.csv', samples: int = 10000):
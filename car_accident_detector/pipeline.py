@@ -0,0 +1,220 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from .config import Config
+from .metrics import LatencyStats
+from .sensors.sample_clock import SampleClock
+
+class SampleRing:
+    """
+    Bounded single-producer, single-consumer queue of timestamped samples
+
+    push() never blocks the acquisition thread. When the ring is full the
+    oldest sample is overwritten (deque append/popleft are atomic, so no
+    lock is taken). Each sample carries a sequence number, so the consumer
+    counts the samples it never saw exactly.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items = deque(maxlen=capacity)
+        self._ready = threading.Event()
+        self._next_seq = 0
+        self._expected_seq = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def pushed(self) -> int:
+        return self._next_seq
+
+    def push(self, timestamp: float, sample: Tuple[float, ...]):
+        """Producer side: add a sample, overwriting the oldest when full"""
+        self._items.append((self._next_seq, timestamp, sample))
+        self._next_seq += 1
+        occupancy = len(self._items)
+        if occupancy > self.high_water:
+            self.high_water = occupancy
+        self._ready.set()
+
+    def drain(self, timeout: float) -> List[Tuple[float, Tuple[float, ...]]]:
+        """
+        Consumer side: wait up to timeout for samples, then take all of them
+        Returns: list of (timestamp, sample), oldest first
+        """
+        if not self._ready.wait(timeout):
+            return []
+        # Cleared before taking items, so a push during the drain re-arms it
+        self._ready.clear()
+        batch = []
+        while True:
+            try:
+                seq, timestamp, sample = self._items.popleft()
+            except IndexError:
+                break
+            if seq != self._expected_seq:
+                self.dropped += seq - self._expected_seq
+            self._expected_seq = seq + 1
+            batch.append((timestamp, sample))
+        return batch
+
+class DetectionPipeline:
+    """
+    Runs sensor acquisition, inference and alert handling on separate threads
+
+    The acquisition thread only waits on the SampleClock, reads the sensor
+    and pushes into a SampleRing, so a slow model invoke or a GC pause no
+    longer costs samples. The inference worker drains whatever has arrived,
+    feeds every sample to the preprocessor and scheduler, and runs the model
+    at most once per drain on the newest window. Detections are handed to
+    an alert thread, so alert work never holds up inference.
+    """
+
+    def __init__(self, read_sample: Callable[[], Tuple[float, ...]], preprocessor, detector, scheduler,
+                 on_accident: Callable[[float, float], None],
+                 sample_clock: Optional[SampleClock] = None, streaming=None,
+                 queue_size: Optional[int] = None):
+        """
+        read_sample: returns one (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z) sample
+        on_accident: called on the alert thread with (timestamp, confidence)
+        streaming: optional StreamingAccidentDetector run on every sample instead
+        """
+        self.config = Config()
+        self.read_sample = read_sample
+        self.preprocessor = preprocessor
+        self.detector = detector
+        self.scheduler = scheduler
+        self.on_accident = on_accident
+        self.sample_clock = sample_clock if sample_clock is not None else SampleClock()
+        self.streaming = streaming
+        self.ring = SampleRing(queue_size or self.config.PIPELINE_QUEUE_SIZE)
+        self._alerts = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+
+        self.processed = 0
+        self.inferences = 0
+        self.first_inference_at = None  # time.monotonic() of the first model run
+        self.detections = 0
+        self.read_errors = 0
+        self.acquisition_latency = LatencyStats()  # Sensor read
+        self.queue_latency = LatencyStats()        # Sample time to pickup by inference
+        self.inference_latency = LatencyStats()    # Model invoke
+        self.alert_latency = LatencyStats()        # Detection to alert handler
+
+    def start(self):
+        """Start the acquisition, inference and alert threads"""
+        self._stop.clear()
+        self.sample_clock.reset()
+        self._threads = [
+            threading.Thread(target=self._acquire, name="acquisition", daemon=True),
+            threading.Thread(target=self._infer, name="inference", daemon=True),
+            threading.Thread(target=self._handle_alerts, name="alerts", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop all threads and wait for them to finish"""
+        self._stop.set()
+        self._alerts.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _acquire(self):
+        while not self._stop.is_set():
+            timestamp = self.sample_clock.wait()
+            started = time.monotonic()
+            try:
+                sample = self.read_sample()
+            except Exception as e:
+                self.read_errors += 1
+                print(f"Sensor read error: {e}")
+                continue
+            self.acquisition_latency.add(time.monotonic() - started)
+            self.ring.push(timestamp, sample)
+
+    def _infer(self):
+        while not self._stop.is_set():
+            batch = self.ring.drain(timeout=0.1)
+            if not batch:
+                continue
+            picked_up = time.time()
+            run_model = False
+            for timestamp, sample in batch:
+                self.queue_latency.add(max(0.0, picked_up - timestamp))
+                self.preprocessor.add_data(sample)
+                self.processed += 1
+                if self.streaming is not None:
+                    # One LSTM timestep on the newest normalized sample
+                    started = time.monotonic()
+                    is_accident, confidence = self.streaming.predict_sample(self.preprocessor.data_buffer[-1])
+                    self._inferred(started)
+                    if is_accident:
+                        self._detected(timestamp, confidence)
+                elif self.scheduler.should_infer(sample[:3], sample[3:]):
+                    run_model = True
+
+            # Every hop, or every sample while the gate is open; a backlog
+            # is caught up with a single run on the newest window
+            if run_model:
+                processed_data = self.preprocessor.get_processed_window()
+                if processed_data is not None:
+                    started = time.monotonic()
+                    is_accident, confidence = self.detector.predict(processed_data)
+                    self._inferred(started)
+                    if is_accident:
+                        self._detected(batch[-1][0], confidence)
+
+    def _inferred(self, started: float):
+        finished = time.monotonic()
+        self.inference_latency.add(finished - started)
+        self.inferences += 1
+        if self.first_inference_at is None:
+            self.first_inference_at = finished
+
+    def _detected(self, timestamp: float, confidence: float):
+        self.detections += 1
+        self._alerts.put((time.monotonic(), timestamp, confidence))
+
+    def _handle_alerts(self):
+        while True:
+            item = self._alerts.get()
+            if item is None:
+                break
+            queued, timestamp, confidence = item
+            self.alert_latency.add(time.monotonic() - queued)
+            try:
+                self.on_accident(timestamp, confidence)
+            except Exception as e:
+                print(f"Alert handler error: {e}")
+
+    def get_metrics(self) -> dict:
+        """
+        Queue occupancy, sample counters and per-stage latency
+        """
+        return {
+            'samples': self.ring.pushed,
+            'processed': self.processed,
+            'dropped_samples': self.ring.dropped,
+            'missed_deadlines': self.sample_clock.missed_deadlines,
+            'read_errors': self.read_errors,
+            'queue_occupancy': len(self.ring),
+            'queue_capacity': self.ring.capacity,
+            'queue_high_water': self.ring.high_water,
+            'inferences': self.inferences,
+            'detections': self.detections,
+            'latency': {
+                'acquisition': self.acquisition_latency.summary(),
+                'queue': self.queue_latency.summary(),
+                'inference': self.inference_latency.summary(),
+                'alert': self.alert_latency.summary()
+            }
+        }
\ No newline at end of file
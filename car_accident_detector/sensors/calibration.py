@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Optional, Tuple
+from ..config import Config
+
+class CalibrationStore:
+    """
+    MPU6050 offsets persisted to a small JSON file, so a restart can reuse
+    them instead of recalibrating
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.config = Config()
+        self.path = path or self.config.CALIBRATION_FILE
+
+    def load(self) -> Optional[dict]:
+        """
+        Read the stored calibration
+        Returns: dict with accel_offsets, gyro_offsets and temperature, or None
+        """
+        try:
+            with open(self.path) as f:
+                record = json.load(f)
+            return {
+                'accel_offsets': tuple(float(value) for value in record['accel_offsets']),
+                'gyro_offsets': tuple(float(value) for value in record['gyro_offsets']),
+                'temperature': float(record['temperature'])
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, accel_offsets: Tuple[float, float, float], gyro_offsets: Tuple[float, float, float],
+             temperature: float):
+        """Write the calibration atomically, so a power cut never leaves half a file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump({
+                'accel_offsets': list(accel_offsets),
+                'gyro_offsets': list(gyro_offsets),
+                'temperature': temperature
+            }, f)
+        os.replace(temporary, self.path)
+
+def calibrate_on_boot(mpu, store: CalibrationStore) -> str:
+    """
+    Apply stored offsets when they still hold, otherwise recalibrate
+    Stored offsets are reused when the die temperature is within
+    CALIBRATION_MAX_TEMP_DELTA of the stored one. They are also reused when
+    the car is already moving, since calibrating then would bake the motion
+    into the offsets.
+    Returns: 'stored', 'calibrated', or 'none' (moving and nothing stored)
+    """
+    config = Config()
+    record = store.load()
+    # The stationarity burst also refreshes mpu.temperature
+    stationary = mpu.is_stationary()
+
+    if record is not None:
+        similar = abs(mpu.temperature - record['temperature']) <= config.CALIBRATION_MAX_TEMP_DELTA
+        if similar or not stationary:
+            mpu.set_offsets(record['accel_offsets'], record['gyro_offsets'])
+            return 'stored'
+
+    if not stationary:
+        print("Sensor is moving; running without calibration offsets")
+        return 'none'
+
+    accel_offsets, gyro_offsets = mpu.calibrate()
+    store.save(accel_offsets, gyro_offsets, mpu.temperature)
+    return 'calibrated'
\ No newline at end of file
@@ -1,82 +1,226 @@
-import serial
+import threading
 import time
-from typing import Optional, Tuple
+from collections import deque
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
 import pynmea2
 from ..config import Config
+from ..alert.serial_manager import PRIORITY_POLL, SerialPortManager
+
+KNOTS_TO_KMH = 1.852
+
+class GPSFix(NamedTuple):
+    """
+    One position fix; immutable so readers never see a half-updated record
+    """
+    latitude: float
+    longitude: float
+    timestamp: float                   # time.time() when the sentence arrived
+    fix_time: Optional[object] = None  # UTC time of the fix reported by the module
+    speed_kmh: Optional[float] = None
+    heading: Optional[float] = None    # Degrees from true north
+    altitude: Optional[float] = None   # Metres above mean sea level
+    satellites: Optional[int] = None
 
 class GPSInterface:
     """
-    Interface for GPS module
+    Interface for the SIM7000C GNSS receiver
+    
+    The GNSS shares the modem's serial port, so it is read through the
+    SerialPortManager. A background poller queues AT+CGNSINF every
+    GPS_POLL_INTERVAL seconds at the lowest priority and swaps in a new
+    GPSFix. NMEA sentences copied to the port (AT+CGNSTST=1) update the fix
+    too. Position lookups never wait on the serial port.
     """
     
-    def __init__(self):
+    def __init__(self, manager: Optional[SerialPortManager] = None):
+        """
+        manager: serial port shared with SIM7000C; one is created if not given
+        """
         self.config = Config()
-        self.serial_port = None
-        self.last_position = None
-        self.last_update = 0
-        
+        self.manager = manager if manager is not None else SerialPortManager()
+        self.manager.subscribe('$', self._handle_nmea)
+        self._fix = None
+        self._track = deque(maxlen=self.config.GPS_TRACK_LENGTH)
+        self._track_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._poller = None
+        self.sentences = 0
+        self.parse_errors = 0
+    
     def connect(self) -> bool:
         """
-        Connect to GPS module via serial
+        Power on the GNSS and start polling it
         Returns: True if connected successfully
         """
+        if not self.manager.open():
+            print("Failed to connect to GPS")
+            return False
+        response = self.manager.command("AT+CGNSPWR=1")
+        if not response.ok:
+            print(f"Failed to power on GNSS: {response.final}")
+            return False
+        self.start()
+        return True
+    
+    def start(self):
+        """Start the background AT+CGNSINF poller"""
+        if self._poller is not None and self._poller.is_alive():
+            return
+        self._stop.clear()
+        self._poller = threading.Thread(target=self._poll_loop, name="gps-poller", daemon=True)
+        self._poller.start()
+    
+    def stop(self):
+        """Stop the background poller"""
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join(2.0)
+            self._poller = None
+    
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.config.GPS_POLL_INTERVAL)
+    
+    def poll(self, priority: int = PRIORITY_POLL) -> bool:
+        """
+        Query AT+CGNSINF once, by default behind any alert or control commands
+        Returns: True if the reply updated the position
+        """
         try:
-            self.serial_port = serial.Serial(
-                self.config.SERIAL_PORT,
-                self.config.BAUD_RATE,
-                timeout=1
-            )
-            return True
+            response = self.manager.command("AT+CGNSINF", priority)
         except Exception as e:
-            print(f"Failed to connect to GPS: {e}")
+            print(f"Error reading GPS data: {e}")
             return False
+        value = response.value("+CGNSINF:")
+        return value is not None and self.process_cgnsinf(value)
+    
+    def process_cgnsinf(self, value: str) -> bool:
+        """
+        Parse the payload of a +CGNSINF reply and update the fix
+        Returns: True if the reply holds a valid fix
+        """
+        # <run>,<fix>,<UTC yyyyMMddhhmmss.sss>,<lat>,<lon>,<altitude m>,<speed km/h>,<course>,
+        # <fix mode>,,<HDOP>,<PDOP>,<VDOP>,,<satellites in view>,<satellites used>,...
+        fields = value.split(',')
+        if len(fields) < 8 or fields[1] != '1' or not fields[3] or not fields[4]:
+            return False
+        try:
+            fix = GPSFix(
+                latitude=float(fields[3]),
+                longitude=float(fields[4]),
+                timestamp=time.time(),
+                fix_time=datetime.strptime(fields[2], '%Y%m%d%H%M%S.%f').time(),
+                speed_kmh=float(fields[6]) if fields[6] else None,
+                heading=float(fields[7]) if fields[7] else None,
+                altitude=float(fields[5]) if fields[5] else None,
+                satellites=int(fields[15]) if len(fields) > 15 and fields[15] else None
+            )
+        except ValueError:
+            self.parse_errors += 1
+            return False
+        self._update(fix)
+        return True
+    
+    def _handle_nmea(self, sentence: str, body: Optional[str]):
+        self.process_line(sentence)
+    
+    def process_line(self, line: str) -> bool:
+        """
+        Parse one NMEA sentence and update the fix
+        Returns: True if the sentence updated the position
+        """
+        # Cheap talker-independent filter ($GPGGA, $GNRMC, ...) before parsing
+        if len(line) < 6 or line[0] != '$' or line[3:6] not in ('GGA', 'RMC'):
+            return False
+        try:
+            msg = pynmea2.parse(line.strip())
+        except pynmea2.ParseError:
+            self.parse_errors += 1
+            return False
+        self.sentences += 1
+        
+        previous = self._fix
+        if msg.sentence_type == 'GGA':
+            if not msg.gps_qual or not msg.lat or not msg.lon:
+                return False
+            fix = GPSFix(
+                latitude=msg.latitude,
+                longitude=msg.longitude,
+                timestamp=time.time(),
+                fix_time=msg.timestamp,
+                speed_kmh=previous.speed_kmh if previous else None,
+                heading=previous.heading if previous else None,
+                altitude=float(msg.altitude) if msg.altitude is not None else None,
+                satellites=int(msg.num_sats) if msg.num_sats else None
+            )
+        else:
+            if msg.status != 'A' or not msg.lat or not msg.lon:
+                return False
+            fix = GPSFix(
+                latitude=msg.latitude,
+                longitude=msg.longitude,
+                timestamp=time.time(),
+                fix_time=msg.timestamp,
+                speed_kmh=msg.spd_over_grnd * KNOTS_TO_KMH if msg.spd_over_grnd is not None else None,
+                heading=msg.true_course,
+                altitude=previous.altitude if previous else None,
+                satellites=previous.satellites if previous else None
+            )
+        
+        self._update(fix)
+        return True
+    
+    def _update(self, fix: GPSFix):
+        # Attribute assignment is atomic: readers get the old or the new fix
+        self._fix = fix
+        with self._track_lock:
+            # GGA and RMC for the same epoch describe one fix
+            if self._track and self._track[-1].fix_time == fix.fix_time:
+                self._track[-1] = fix
+            else:
+                self._track.append(fix)
+    
+    def get_fix(self) -> Optional[GPSFix]:
+        """
+        Latest fix, including speed and heading when the module reports them
+        Returns: GPSFix or None if no fix has been received
+        """
+        return self._fix
+    
+    def get_track(self) -> List[GPSFix]:
+        """
+        Recent fixes, oldest first (at most GPS_TRACK_LENGTH)
+        """
+        with self._track_lock:
+            return list(self._track)
+    
+    @property
+    def last_position(self) -> Optional[Tuple[float, float]]:
+        fix = self._fix
+        return (fix.latitude, fix.longitude) if fix else None
+    
+    @property
+    def last_update(self) -> float:
+        fix = self._fix
+        return fix.timestamp if fix else 0
     
     def get_position(self) -> Optional[Tuple[float, float]]:
         """
         Get current GPS position (latitude, longitude)
         Returns: (latitude, longitude) or None if unavailable
         """
-        if not self.serial_port:
-            return None
-            
-        try:
-            # Read data for up to 1 second
-            start_time = time.time()
-            while time.time() - start_time < 1.0:
-                line = self.serial_port.readline().decode('ascii', errors='replace')
-                if line.startswith('$GPGGA'):
-                    try:
-                        msg = pynmea2.parse(line)
-                        if msg.latitude and msg.longitude:
-                            lat = float(msg.latitude)
-                            lon = float(msg.longitude)
-                            # Convert from DDMM.MMMM to DD.DDDDDD
-                            lat = lat // 100 + (lat % 100) / 60
-                            lon = lon // 100 + (lon % 100) / 60
-                            # Apply sign based on direction
-                            if msg.lat_dir == 'S':
-                                lat = -lat
-                            if msg.lon_dir == 'W':
-                                lon = -lon
-                            self.last_position = (lat, lon)
-                            self.last_update = time.time()
-                            return self.last_position
-                    except pynmea2.ParseError:
-                        continue
-        except Exception as e:
-            print(f"Error reading GPS data: {e}")
-            
         return self.last_position
     
-    def get_google_maps_link(self) -> Optional[str]:
+    def get_google_maps_link(self, fix: Optional[GPSFix] = None) -> Optional[str]:
         """
-        Get Google Maps link for current position
+        Get Google Maps link for current position, or for the given fix
         Returns: Google Maps URL or None if position unavailable
         """
-        position = self.get_position()
-        if position:
-            lat, lon = position
-            return f"https://www.google.com/maps?q={lat},{lon}"
+        fix = fix if fix is not None else self._fix
+        if fix:
+            return f"https://www.google.com/maps?q={fix.latitude},{fix.longitude}"
         return None
     
     def is_valid_position(self) -> bool:
@@ -84,7 +228,8 @@ class GPSInterface:
         Check if we have a valid GPS position
         Returns: True if position is valid
         """
-        if not self.last_position:
+        fix = self._fix
+        if not fix:
             return False
-        # Check if position is less than 5 minutes old
-        return (time.time() - self.last_update) < 300
\ No newline at end of file
+        # Check if position is less than GPS_MAX_FIX_AGE old
+        return (time.time() - fix.timestamp) < self.config.GPS_MAX_FIX_AGE
\ No newline at end of file
@@ -1,6 +1,8 @@
 import time
 import math
-from typing import Tuple, List
+import statistics
+import struct
+from typing import Optional, Tuple, List
 import smbus2
 from ..config import Config
 
@@ -20,10 +22,42 @@ class MPU6050:
     GYRO_ZOUT_H = 0x47
     ACCEL_CONFIG = 0x1C
     GYRO_CONFIG = 0x1B
+    SMPLRT_DIV = 0x19
+    CONFIG = 0x1A
+    FIFO_EN = 0x23
+    INT_PIN_CFG = 0x37
+    INT_ENABLE = 0x38
+    INT_STATUS = 0x3A
+    USER_CTRL = 0x6A
+    FIFO_COUNTH = 0x72
+    FIFO_R_W = 0x74
     
-    def __init__(self, bus_number: int = 1):
-        self.bus = smbus2.SMBus(bus_number)
+    # ACCEL_XOUT_H..GYRO_ZOUT_L: accel x/y/z, temperature, gyro x/y/z
+    BLOCK_SIZE = 14
+    BLOCK_FORMAT = '>7h'
+    
+    # FIFO_EN bits for the accelerometer and all three gyro axes; each FIFO
+    # frame is then accel x/y/z followed by gyro x/y/z
+    FIFO_ACCEL_GYRO = 0x78
+    FIFO_FRAME_SIZE = 12
+    FIFO_FRAME_FORMAT = '>6h'
+    USER_CTRL_FIFO_EN = 0x40
+    USER_CTRL_FIFO_RESET = 0x04
+    INT_STATUS_FIFO_OFLOW = 0x10
+    INT_ENABLE_DATA_RDY = 0x01
+    # DLPF_CFG = 1 (184 Hz bandwidth) runs the internal sample clock at 1 kHz
+    DLPF_184HZ = 0x01
+    INTERNAL_SAMPLE_RATE = 1000
+    
+    def __init__(self, bus_number: int = 1, bus: Optional[smbus2.SMBus] = None):
+        self.bus = bus if bus is not None else smbus2.SMBus(bus_number)
         self.config = Config()
+        self.fifo_enabled = False
+        self.fifo_overflows = 0
+        self.temperature = None
+        self.accel_offsets = (0.0, 0.0, 0.0)
+        self.gyro_offsets = (0.0, 0.0, 0.0)
+        self.calibration_samples = 0
         self._initialize()
         
     def _initialize(self):
@@ -49,89 +83,211 @@ class MPU6050:
         }[self.config.GYROSCOPE_RANGE]
         self.bus.write_byte_data(self.MPU6050_ADDR, self.GYRO_CONFIG, gyro_range)
         
-    def _read_word(self, reg: int) -> int:
-        """Read a 16-bit word from the sensor"""
-        high = self.bus.read_byte_data(self.MPU6050_ADDR, reg)
-        low = self.bus.read_byte_data(self.MPU6050_ADDR, reg + 1)
-        value = (high << 8) + low
-        # Convert to signed 16-bit integer
-        if value >= 0x8000:
-            value = -((65535 - value) + 1)
-        return value
-    
-    def _read_acceleration(self) -> Tuple[float, float, float]:
-        """Read acceleration data in g"""
-        accel_x = self._read_word(self.ACCEL_XOUT_H)
-        accel_y = self._read_word(self.ACCEL_YOUT_H)
-        accel_z = self._read_word(self.ACCEL_ZOUT_H)
-        
-        # Convert to g based on range
-        accel_divisor = {
+        # Convert to g and °/s based on range
+        self.accel_divisor = {
             2: 16384.0,
             4: 8192.0,
             8: 4096.0,
             16: 2048.0
         }[self.config.ACCELEROMETER_RANGE]
-        
-        return (
-            accel_x / accel_divisor,
-            accel_y / accel_divisor,
-            accel_z / accel_divisor
-        )
-    
-    def _read_gyroscope(self) -> Tuple[float, float, float]:
-        """Read gyroscope data in °/s"""
-        gyro_x = self._read_word(self.GYRO_XOUT_H)
-        gyro_y = self._read_word(self.GYRO_YOUT_H)
-        gyro_z = self._read_word(self.GYRO_ZOUT_H)
-        
-        # Convert to °/s based on range
-        gyro_divisor = {
+        self.gyro_divisor = {
             250: 131.0,
             500: 65.5,
             1000: 32.8,
             2000: 16.4
         }[self.config.GYROSCOPE_RANGE]
         
+    def _read_block(self) -> Tuple[int, ...]:
+        """
+        Read the accel, temperature and gyro registers in one I2C transaction
+        Returns: raw (accel_x, accel_y, accel_z, temp, gyro_x, gyro_y, gyro_z)
+        """
+        block = self.bus.read_i2c_block_data(self.MPU6050_ADDR, self.ACCEL_XOUT_H, self.BLOCK_SIZE)
+        return struct.unpack(self.BLOCK_FORMAT, bytes(block))
+        
+    def _scale(self, raw: Tuple[int, ...]) -> Tuple[float, float, float, float, float, float]:
+        """Convert raw accel x/y/z, gyro x/y/z counts to g and °/s, minus the offsets"""
+        accel_divisor = self.accel_divisor
+        gyro_divisor = self.gyro_divisor
+        accel_x_offset, accel_y_offset, accel_z_offset = self.accel_offsets
+        gyro_x_offset, gyro_y_offset, gyro_z_offset = self.gyro_offsets
         return (
-            gyro_x / gyro_divisor,
-            gyro_y / gyro_divisor,
-            gyro_z / gyro_divisor
+            raw[0] / accel_divisor - accel_x_offset,
+            raw[1] / accel_divisor - accel_y_offset,
+            raw[2] / accel_divisor - accel_z_offset,
+            raw[3] / gyro_divisor - gyro_x_offset,
+            raw[4] / gyro_divisor - gyro_y_offset,
+            raw[5] / gyro_divisor - gyro_z_offset
         )
     
+    def set_offsets(self, accel_offsets: Tuple[float, float, float], gyro_offsets: Tuple[float, float, float]):
+        """Set the offsets (g and °/s) subtracted from every reading"""
+        self.accel_offsets = tuple(float(value) for value in accel_offsets)
+        self.gyro_offsets = tuple(float(value) for value in gyro_offsets)
+        
+    def _read_acceleration(self) -> Tuple[float, float, float]:
+        """Read acceleration data in g"""
+        return self.read_sensor_data()[:3]
+        
+    def _read_gyroscope(self) -> Tuple[float, float, float]:
+        """Read gyroscope data in °/s"""
+        return self.read_sensor_data()[3:]
+        
     def read_sensor_data(self) -> Tuple[float, float, float, float, float, float]:
         """
-        Read all sensor data
+        Read all sensor data with a single burst read
         Returns: (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
         """
-        accel = self._read_acceleration()
-        gyro = self._read_gyroscope()
-        return accel + gyro
+        ax, ay, az, temp, gx, gy, gz = self._read_block()
+        self.temperature = temp / 340.0 + 36.53
+        return self._scale((ax, ay, az, gx, gy, gz))
+        
+    def read_temperature(self) -> float:
+        """Read the die temperature in °C"""
+        self.read_sensor_data()
+        return self.temperature
+        
+    def _set_sample_rate(self, sample_rate: int) -> float:
+        """
+        Set the sensor's own output rate (4-1000 Hz) from the 1 kHz clock
+        Returns: the sample rate actually configured in Hz
+        """
+        divider = max(0, min(255, round(self.INTERNAL_SAMPLE_RATE / sample_rate) - 1))
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.CONFIG, self.DLPF_184HZ)
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.SMPLRT_DIV, divider)
+        return self.INTERNAL_SAMPLE_RATE / (1 + divider)
+        
+    def enable_data_ready_interrupt(self, sample_rate: int) -> float:
+        """
+        Pulse the INT pin (active high) each time a new sample is latched
+        at sample_rate Hz, to pace reads on the sensor's clock
+        Returns: the sample rate actually configured in Hz
+        """
+        rate = self._set_sample_rate(sample_rate)
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.INT_PIN_CFG, 0)
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.INT_ENABLE, self.INT_ENABLE_DATA_RDY)
+        return rate
+        
+    def enable_fifo(self, sample_rate: int) -> float:
+        """
+        Buffer accel and gyro samples in the sensor's 1 KB FIFO
+        The FIFO holds 85 samples, so read_fifo() must run at least every
+        85 / sample_rate seconds to avoid an overflow.
+        Returns: the sample rate actually configured in Hz
+        """
+        rate = self._set_sample_rate(sample_rate)
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.FIFO_EN, self.FIFO_ACCEL_GYRO)
+        self._reset_fifo()
+        self.fifo_enabled = True
+        return rate
+        
+    def disable_fifo(self):
+        """Stop buffering samples in the FIFO"""
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.FIFO_EN, 0)
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.USER_CTRL, 0)
+        self.fifo_enabled = False
+        
+    def _reset_fifo(self):
+        """Discard the FIFO contents and keep buffering"""
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.USER_CTRL, self.USER_CTRL_FIFO_RESET)
+        self.bus.write_byte_data(self.MPU6050_ADDR, self.USER_CTRL, self.USER_CTRL_FIFO_EN)
+        
+    def fifo_count(self) -> int:
+        """Number of complete samples waiting in the FIFO"""
+        high, low = self.bus.read_i2c_block_data(self.MPU6050_ADDR, self.FIFO_COUNTH, 2)
+        return ((high << 8) | low) // self.FIFO_FRAME_SIZE
+        
+    def read_fifo(self, max_samples: Optional[int] = None) -> List[Tuple[float, float, float, float, float, float]]:
+        """
+        Drain buffered samples, oldest first, in one I2C transaction
+        After an overflow the frame boundaries are lost, so the FIFO is
+        reset and the call returns no samples.
+        Returns: list of (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
+        """
+        status = self.bus.read_byte_data(self.MPU6050_ADDR, self.INT_STATUS)
+        if status & self.INT_STATUS_FIFO_OFLOW:
+            self.fifo_overflows += 1
+            self._reset_fifo()
+            return []
+        
+        frames = self.fifo_count()
+        if max_samples is not None:
+            frames = min(frames, max_samples)
+        if frames == 0:
+            return []
+        
+        # SMBus block reads stop at 32 bytes, so select FIFO_R_W and read
+        # every frame in one combined write/read transaction
+        select = smbus2.i2c_msg.write(self.MPU6050_ADDR, [self.FIFO_R_W])
+        data = smbus2.i2c_msg.read(self.MPU6050_ADDR, frames * self.FIFO_FRAME_SIZE)
+        self.bus.i2c_rdwr(select, data)
+        
+        return [self._scale(raw) for raw in struct.iter_unpack(self.FIFO_FRAME_FORMAT, bytes(data))]
+        
+    def is_stationary(self, samples: int = 25, interval: float = 0.004) -> bool:
+        """
+        Check over a short burst that the sensor is at rest: low spread of
+        |accel| and of each gyro axis (offsets do not matter here)
+        """
+        magnitudes = []
+        gyro = ([], [], [])
+        for _ in range(samples):
+            accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z = self.read_sensor_data()
+            magnitudes.append(math.sqrt(accel_x * accel_x + accel_y * accel_y + accel_z * accel_z))
+            gyro[0].append(gyro_x)
+            gyro[1].append(gyro_y)
+            gyro[2].append(gyro_z)
+            time.sleep(interval)
+        
+        if statistics.pstdev(magnitudes) > self.config.STATIONARY_ACCEL_STD:
+            return False
+        return all(statistics.pstdev(axis) <= self.config.STATIONARY_GYRO_STD for axis in gyro)
     
-    def calibrate(self, samples: int = 1000) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+    def calibrate(self, samples: Optional[int] = None, min_samples: Optional[int] = None,
+                  interval: float = 0.01) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
         """
-        Calibrate the sensor by calculating offsets
+        Calibrate the sensor by calculating offsets, and apply them
+        Averages readings until the standard error of every offset is within
+        CALIBRATION_ACCEL_TOLERANCE / CALIBRATION_GYRO_TOLERANCE (after at
+        least min_samples), or until samples readings have been taken.
         Returns: (accel_offsets, gyro_offsets)
         """
-        accel_sum = [0.0, 0.0, 0.0]
-        gyro_sum = [0.0, 0.0, 0.0]
+        max_samples = samples or self.config.CALIBRATION_MAX_SAMPLES
+        min_samples = max(2, min(max_samples, min_samples or self.config.CALIBRATION_MIN_SAMPLES))
+        tolerances = [self.config.CALIBRATION_ACCEL_TOLERANCE] * 3 + [self.config.CALIBRATION_GYRO_TOLERANCE] * 3
+        # Welford running mean and sum of squared deviations per axis
+        mean = [0.0] * 6
+        squares = [0.0] * 6
+        temperature_sum = 0
+        count = 0
         
         print("Calibrating MPU6050. Keep the sensor still...")
-        for _ in range(samples):
-            accel = self._read_acceleration()
-            gyro = self._read_gyroscope()
-            
-            for i in range(3):
-                accel_sum[i] += accel[i]
-                gyro_sum[i] += gyro[i]
+        while count < max_samples:
+            ax, ay, az, temp, gx, gy, gz = self._read_block()
+            values = (
+                ax / self.accel_divisor, ay / self.accel_divisor, az / self.accel_divisor,
+                gx / self.gyro_divisor, gy / self.gyro_divisor, gz / self.gyro_divisor
+            )
+            count += 1
+            temperature_sum += temp
+            for i in range(6):
+                delta = values[i] - mean[i]
+                mean[i] += delta / count
+                squares[i] += delta * (values[i] - mean[i])
             
-            time.sleep(0.01)
-        
-        accel_offsets = tuple(accel_sum[i] / samples for i in range(3))
-        gyro_offsets = tuple(gyro_sum[i] / samples for i in range(3))
+            # Stop once every mean is known to within its tolerance
+            if count >= min_samples and all(
+                math.sqrt(squares[i] / ((count - 1) * count)) <= tolerances[i] for i in range(6)
+            ):
+                break
+            time.sleep(interval)
         
         # Gravity should be 1g on Z-axis when sensor is flat
-        accel_offsets = (accel_offsets[0], accel_offsets[1], accel_offsets[2] - 1.0)
+        accel_offsets = (mean[0], mean[1], mean[2] - 1.0)
+        gyro_offsets = (mean[3], mean[4], mean[5])
+        self.temperature = temperature_sum / count / 340.0 + 36.53
+        self.calibration_samples = count
+        self.set_offsets(accel_offsets, gyro_offsets)
         
-        print(f"Calibration complete. Accel offsets: {accel_offsets}, Gyro offsets: {gyro_offsets}")
+        print(f"Calibration complete after {count} samples. Accel offsets: {accel_offsets}, Gyro offsets: {gyro_offsets}")
         return accel_offsets, gyro_offsets
\ No newline at end of file
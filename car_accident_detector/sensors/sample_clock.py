@@ -0,0 +1,139 @@
+import math
+import threading
+import time
+from typing import Callable, Optional
+from ..config import Config
+
+class SampleClock:
+    """
+    Paces the detection loop on absolute sample deadlines, or on the
+    MPU6050 data-ready interrupt when one is wired up
+
+    Sleeping a fixed period after each sample makes the real rate drop by
+    the cost of the loop body. Here deadline n is start + n * period, so a
+    slow sample only shortens the next sleep. If a whole period is lost,
+    the missed deadlines are counted and skipped instead of being caught
+    up in a burst.
+    """
+
+    def __init__(self, rate: Optional[int] = None, interrupt: bool = False,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        rate: samples per second (defaults to SAMPLING_RATE)
+        interrupt: pace on data_ready() calls instead of deadlines
+        clock, sleep: monotonic time source and sleep, in seconds
+        """
+        self.config = Config()
+        self.rate = rate if rate is not None else self.config.SAMPLING_RATE
+        self.period = 1.0 / self.rate
+        self.interrupt = interrupt
+        self.clock = clock
+        self.sleep = sleep
+        self._ready = threading.Event()
+        self._ready_lock = threading.Lock()
+        self._pending = 0
+        self._ready_time = 0.0
+        self.reset()
+
+    def reset(self):
+        """Restart pacing from now and clear statistics"""
+        self._deadline = None
+        # Timestamps are monotonic-paced but on the time.time() scale
+        self._epoch = time.time() - self.clock()
+        self.samples = 0
+        self.missed_deadlines = 0
+        self._first_time = None
+        self._last_time = None
+        self._lateness_sum = 0.0
+        self._max_lateness = 0.0
+        self._intervals = 0
+        self._interval_error_sq_sum = 0.0
+
+    def data_ready(self, channel=None):
+        """
+        Data-ready interrupt handler, e.g. a GPIO.add_event_detect callback
+        """
+        now = self.clock()
+        with self._ready_lock:
+            self._pending += 1
+            self._ready_time = now
+            # Set under the lock, so wait() can never clear the event between
+            # the count and the set and then be woken with nothing pending
+            self._ready.set()
+
+    def wait(self) -> float:
+        """
+        Block until the next sample is due
+        Returns: the sample timestamp in seconds since the epoch
+        """
+        if self.interrupt:
+            sample_time, lateness, missed = self._wait_interrupt()
+        else:
+            sample_time, lateness, missed = self._wait_deadline()
+        self._record(sample_time, lateness, missed)
+        return self._epoch + sample_time
+
+    def _wait_deadline(self):
+        now = self.clock()
+        missed = 0
+        if self._deadline is None:
+            self._deadline = now
+        else:
+            self._deadline += self.period
+            behind = now - self._deadline
+            if behind >= self.period:
+                missed = int(behind // self.period)
+                self._deadline += missed * self.period
+            if self._deadline > now:
+                self.sleep(self._deadline - now)
+                now = self.clock()
+        return now, now - self._deadline, missed
+
+    def _wait_interrupt(self):
+        timeout = time.monotonic() + 2 * self.period
+        while True:
+            remaining = timeout - time.monotonic()
+            if remaining <= 0 or not self._ready.wait(remaining):
+                # No edge for two periods: read anyway so the loop keeps running
+                now = self.clock()
+                return now, 0.0, 1
+            with self._ready_lock:
+                pending = self._pending
+                ready_time = self._ready_time
+                self._pending = 0
+                self._ready.clear()
+            if pending:
+                # Each extra edge was a sample overwritten before it was read
+                return ready_time, self.clock() - ready_time, pending - 1
+            # Woken without a new edge: keep waiting for one
+
+    def _record(self, sample_time: float, lateness: float, missed: int):
+        self.samples += 1
+        self.missed_deadlines += missed
+        self._lateness_sum += lateness
+        self._max_lateness = max(self._max_lateness, lateness)
+        if self._last_time is None:
+            self._first_time = sample_time
+        elif not missed:
+            # Interval jitter only over back-to-back samples
+            error = sample_time - self._last_time - self.period
+            self._intervals += 1
+            self._interval_error_sq_sum += error * error
+        self._last_time = sample_time
+
+    def get_metrics(self) -> dict:
+        """
+        Pacing statistics since the last reset
+        Returns: dictionary with observed rate, missed deadlines and jitter
+        """
+        elapsed = (self._last_time - self._first_time) if self.samples > 1 else 0.0
+        return {
+            'samples': self.samples,
+            'missed_deadlines': self.missed_deadlines,
+            'target_rate': self.rate,
+            'observed_rate': (self.samples - 1) / elapsed if elapsed > 0 else 0.0,
+            'mean_lateness_ms': 1000 * self._lateness_sum / self.samples if self.samples else 0.0,
+            'max_lateness_ms': 1000 * self._max_lateness,
+            'interval_jitter_ms': 1000 * math.sqrt(self._interval_error_sq_sum / self._intervals) if self._intervals else 0.0
+        }
\ No newline at end of file
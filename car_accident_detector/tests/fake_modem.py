@@ -0,0 +1,80 @@
+import threading
+import time
+
+# Fix reported by AT+CGNSINF: New York, 36 km/h heading east, 8 satellites used
+CGNSINF_FIX = '1,1,20240101120000.000,40.712800,-74.006000,10.0,36.00,90.0,1,,1.0,1.2,0.8,,9,8,,,40,,'
+
+class FakeModem:
+    """
+    Serial port stand-in for a SIM7000C: answers each command after
+    `delay` seconds with a scripted reply, like pyserial with a read timeout
+    """
+
+    def __init__(self, delay=0.02, replies=None, echo=False):
+        self.delay = delay
+        self.echo = echo
+        self.replies = {
+            'AT': 'OK',
+            'ATE0': 'OK',
+            'AT+CMGF=1': 'OK',
+            'AT+CSCS="GSM"': 'OK',
+            'AT+CNMI=1,2,0,0,0': 'OK',
+            'AT+CREG?': '+CREG: 0,1\r\n\r\nOK',
+            'AT+CSQ': '+CSQ: 15,0\r\n\r\nOK',
+            'AT+CGNSPWR=1': 'OK',
+            'AT+CGNSINF': '+CGNSINF: ' + CGNSINF_FIX + '\r\n\r\nOK'
+        }
+        self.replies.update(replies or {})
+        self.written = []
+        self._output = []  # (due time, bytes)
+        self._readable = b''
+        self._input = b''
+        self._lock = threading.Lock()
+        self.timeout = 0.05
+
+    def inject(self, text, delay=0.0):
+        """Emit modem output, e.g. a URC, after delay seconds"""
+        with self._lock:
+            self._output.append((time.monotonic() + delay, text.encode()))
+
+    def write(self, data):
+        self.written.append(data)
+        self._input += data
+        while True:
+            ends = [index for index in (self._input.find(b'\r'), self._input.find(b'\x1a')) if index >= 0]
+            if not ends:
+                break
+            end = min(ends)
+            command, self._input = self._input[:end].decode().strip(), self._input[end + 1:]
+            if self.echo:
+                self.inject(command + '\r\n')
+            if command.startswith('AT+CMGS='):
+                reply = '\r\n> '
+            elif command.startswith('AT'):
+                reply = self.replies.get(command)
+                if reply is None:
+                    continue
+                reply = f"\r\n{reply}\r\n"
+            else:
+                # Message text after the prompt
+                reply = '\r\n+CMGS: 12\r\n\r\nOK\r\n'
+            self.inject(reply, self.delay)
+
+    def _ready(self):
+        now = time.monotonic()
+        with self._lock:
+            due = [chunk for when, chunk in self._output if when <= now]
+            self._output = [(when, chunk) for when, chunk in self._output if when > now]
+            self._readable += b''.join(due)
+        return self._readable
+
+    @property
+    def in_waiting(self):
+        return len(self._ready())
+
+    def read(self, size=1):
+        deadline = time.monotonic() + self.timeout
+        while not self._ready() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        data, self._readable = self._readable[:size], self._readable[size:]
+        return data
\ No newline at end of file
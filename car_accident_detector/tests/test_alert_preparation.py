@@ -0,0 +1,121 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from facilities import FacilityIndex
+from car_accident_detector.alert.preparation import AlertPreparation
+from car_accident_detector.alert.serial_manager import SerialPortManager
+from car_accident_detector.alert.sim7000c import SIM7000C
+from car_accident_detector.sensors.gps import GPSInterface
+from car_accident_detector.tests.fake_modem import FakeModem
+
+HOSPITALS = FacilityIndex.from_entries([
+    ["Far Hospital", [41.5, -73.0], "+15550002"],
+    ["City Hospital", [40.72, -74.0], "+15550001"],
+])
+POLICE = FacilityIndex.from_entries([["1st Precinct", [40.7143, -74.0071], "+15550100"]])
+
+class TestAlertPreparation(unittest.TestCase):
+    def start(self, delay=0.01, replies=None):
+        self.modem = FakeModem(delay=delay, replies=replies)
+        self.manager = SerialPortManager(self.modem)
+        self.manager.start()
+        self.addCleanup(self.manager.close)
+        self.gps = GPSInterface(self.manager)
+        self.sim = SIM7000C(self.manager)
+        preparation = AlertPreparation(self.gps, self.sim, {'hospital': HOSPITALS, 'police': POLICE})
+        preparation.start()
+        return preparation
+
+    def test_prepares_fix_network_and_messages(self):
+        preparation = self.start()
+        preparation.join(1)
+        self.assertTrue(preparation.is_ready)
+        # The modem was initialized during the countdown, not at expiry
+        self.assertTrue(self.sim.initialized)
+
+        prepared = preparation.finish()
+        self.assertTrue(prepared.registered)
+        self.assertEqual(prepared.signal_dbm, -83)
+        self.assertEqual((prepared.fix.latitude, prepared.fix.longitude), (40.7128, -74.006))
+        self.assertIn("https://www.google.com/maps?q=40.7128,-74.006", prepared.messages[0])
+        self.assertEqual(prepared.facilities['hospital'].name, "City Hospital")
+        self.assertTrue(prepared.messages[1].startswith("Nearest hospital: City Hospital, +15550001, "))
+        self.assertTrue(prepared.messages[2].startswith("Nearest police: 1st Precinct, +15550100, "))
+
+        # At expiry only the SMS itself is left to do
+        started = time.monotonic()
+        self.assertTrue(self.sim.send_sms("+15551234", prepared.messages[0]))
+        self.assertLess(time.monotonic() - started, 0.2)
+        self.assertEqual(sum(data.startswith(b'AT+CMGS=') for data in self.modem.written), 1)
+
+    def test_cancel_stops_preparation(self):
+        preparation = self.start(delay=0.05)
+        preparation.cancel()
+        preparation.join(1)
+        self.assertFalse(preparation.is_running)
+        self.assertFalse(preparation.is_ready)
+        written = len(self.modem.written)
+        time.sleep(0.1)
+        self.assertEqual(len(self.modem.written), written)
+        self.assertFalse(any(data.startswith(b'AT+CMGS=') for data in self.modem.written))
+
+    def test_unregistered_modem_still_gets_messages(self):
+        preparation = self.start(replies={'AT+CREG?': '+CREG: 0,2\r\n\r\nOK'})
+        time.sleep(0.2)
+        # Still retrying registration when the countdown ends
+        self.assertTrue(preparation.is_running)
+        prepared = preparation.finish()
+        preparation.join(1)
+        self.assertFalse(preparation.is_running)
+        self.assertFalse(prepared.registered)
+        self.assertIn("maps?q=40.7128,-74.006", prepared.messages[0])
+        self.assertEqual(len(prepared.messages), 3)
+
+    def test_no_fix_gives_location_unknown(self):
+        preparation = self.start(replies={'AT+CGNSINF': '+CGNSINF: 1,0,,,,,,,0,,,,,,,,,,,,\r\n\r\nOK'})
+        prepared = preparation.finish()
+        preparation.join(1)
+        self.assertIsNone(prepared.fix)
+        self.assertEqual(prepared.messages, ["EMERGENCY: Car accident detected! Location unknown."])
+
+    def test_restart_after_cancel_does_not_reuse_blocked_run(self):
+        preparation = self.start()
+        preparation.join(1)
+        entered, release = threading.Event(), threading.Event()
+        calls = []
+
+        def check_network():
+            calls.append(1)
+            if len(calls) == 1:
+                # First incident: stuck on the modem long after its cancel
+                entered.set()
+                release.wait(5)
+                return True, -51
+            return False, None
+
+        self.sim.check_network = check_network
+        preparation.start()
+        entered.wait(1)
+        first = preparation._thread
+        preparation.cancel()
+
+        # Second incident while the first run is still blocked
+        preparation.start()
+        self.assertIsNot(preparation._thread, first)
+        self.assertFalse(preparation.is_ready)
+        release.set()
+        first.join(1)
+        time.sleep(0.05)
+        prepared = preparation.finish()
+        preparation.join(1)
+        self.assertFalse(prepared.registered)
+        self.assertIsNone(prepared.signal_dbm)
+        self.assertFalse(preparation.is_ready)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
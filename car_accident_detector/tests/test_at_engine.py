@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.alert.at_engine import ATEngine, ATTokenizer
+from car_accident_detector.alert.serial_manager import SerialPortManager
+from car_accident_detector.alert.sim7000c import SIM7000C
+from car_accident_detector.tests.fake_modem import FakeModem
+
+def make_engine(modem):
+    received = []
+    engine = ATEngine(modem, on_urc=lambda urc, body: received.append((urc, body)))
+    engine.start()
+    return engine, received
+
+class TestATTokenizer(unittest.TestCase):
+    def test_lines_split_across_reads_and_prompt(self):
+        tokenizer = ATTokenizer()
+        self.assertEqual(tokenizer.feed(b'\r\n+CSQ: 1'), [])
+        self.assertEqual(tokenizer.feed(b'5,0\r\n\r\nOK\r\n'), ['+CSQ: 15,0', 'OK'])
+        self.assertEqual(tokenizer.feed(b'\r\n> '), ['>'])
+
+class TestATEngine(unittest.TestCase):
+    def setUp(self):
+        self.modem = FakeModem()
+        self.engine, self.urcs = make_engine(self.modem)
+
+    def tearDown(self):
+        self.engine.stop()
+
+    def test_command_completes_on_final_result(self):
+        response = self.engine.command("AT+CSQ")
+        self.assertTrue(response.ok)
+        self.assertEqual(response.value("+CSQ:"), "15,0")
+        # Done when OK arrives, not after a fixed wait
+        self.assertLess(response.elapsed, 0.2)
+        self.assertEqual(self.engine.get_metrics()['commands'], 1)
+
+    def test_error_results_are_final(self):
+        self.modem.replies['AT+CPIN?'] = '+CME ERROR: 10'
+        self.modem.replies['AT+CMGR=1'] = '+CMS ERROR: 321'
+        self.assertEqual(self.engine.command("AT+CPIN?").final, '+CME ERROR: 10')
+        response = self.engine.command("AT+CMGR=1")
+        self.assertFalse(response.ok)
+        self.assertEqual(response.final, '+CMS ERROR: 321')
+
+    def test_timeout(self):
+        response = self.engine.command("AT+UNKNOWN", timeout=0.1)
+        self.assertEqual(response.final, 'TIMEOUT')
+        self.assertGreaterEqual(response.elapsed, 0.1)
+        self.assertEqual(self.engine.get_metrics()['timeouts'], 1)
+
+    def test_urcs_are_kept_out_of_responses(self):
+        self.modem.replies['AT+CREG?'] = '+CREG: 0,1\r\n\r\nOK'
+        # New SMS and registration change arrive while AT+CSQ is in flight
+        self.modem.inject('\r\n+CMTI: "SM",3\r\n\r\n+CREG: 5\r\n', 0.01)
+        response = self.engine.command("AT+CSQ")
+        self.assertEqual(response.lines, ['+CSQ: 15,0'])
+        # A +CREG line is the response to AT+CREG?
+        self.assertEqual(self.engine.command("AT+CREG?").value("+CREG:"), "0,1")
+
+        self.modem.inject('\r\n+CMT: "+15551234",,"24/01/01,12:00:00+00"\r\nCANCEL\r\n')
+        time.sleep(0.1)
+        self.assertEqual(self.urcs, [('+CMTI: "SM",3', None), ('+CREG: 5', None),
+                                     ('+CMT: "+15551234",,"24/01/01,12:00:00+00"', 'CANCEL')])
+
+    def test_echo_is_ignored(self):
+        self.modem.echo = True
+        response = self.engine.command("AT+CSQ")
+        self.assertEqual(response.lines, ['+CSQ: 15,0'])
+
+class TestSIM7000C(unittest.TestCase):
+    def test_initialize_and_send_alert_latency(self):
+        # 20 ms per reply; the fixed-wait driver took 12+ s to initialize
+        # and about 10 s per SMS regardless of the modem
+        modem = FakeModem(delay=0.02)
+        manager = SerialPortManager(modem)
+        manager.start()
+        sim = SIM7000C(manager)
+        try:
+            started = time.monotonic()
+            self.assertTrue(sim.initialize_module())
+            self.assertEqual(sim.get_signal_strength(), -83)
+            self.assertTrue(sim.send_alert("+15551234", "https://www.google.com/maps?q=1,2"))
+            elapsed = time.monotonic() - started
+        finally:
+            manager.close()
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(modem.written[-2], b'AT+CMGS="+15551234"\r')
+        self.assertTrue(modem.written[-1].endswith(b'\x1a'))
+        metrics = manager.engine.get_metrics()
+        self.assertEqual(metrics['commands'], 8)
+        self.assertLess(metrics['latency']['mean_ms'], 100)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
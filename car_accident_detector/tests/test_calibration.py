@@ -0,0 +1,102 @@
+import os
+import random
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.sensors.calibration import CalibrationStore, calibrate_on_boot
+from car_accident_detector.sensors.mpu6050 import MPU6050
+
+ACCEL_BIAS = (0.02, -0.01, 0.03)   # g
+GYRO_BIAS = (1.5, -0.7, 0.3)       # deg/s
+
+class NoisySensorBus:
+    """
+    Simulated MPU6050 at rest (or shaking) with fixed biases and white
+    noise; every burst read returns a fresh sample
+    """
+
+    def __init__(self, temperature=30.0, seed=0):
+        self.temperature = temperature
+        self.moving = False
+        self.reads = 0
+        self.random = random.Random(seed)
+
+    def write_byte_data(self, addr, reg, value):
+        pass
+
+    def read_i2c_block_data(self, addr, reg, length):
+        self.reads += 1
+        noise = self.random.gauss
+        motion = 0.5 if self.moving else 0.0
+        accel = [
+            ACCEL_BIAS[i] + (1.0 if i == 2 else 0.0) + noise(0, 0.004) + noise(0, motion)
+            for i in range(3)
+        ]
+        gyro = [GYRO_BIAS[i] + noise(0, 0.05) + noise(0, 50 * motion) for i in range(3)]
+        raw = [round(value * 16384) for value in accel] + [round((self.temperature - 36.53) * 340)]
+        raw += [round(value * 131) for value in gyro]
+        # The sensor saturates at the ends of its range
+        return list(struct.pack('>7h', *(max(-32768, min(32767, value)) for value in raw)))
+
+class TestCalibration(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CalibrationStore(os.path.join(self.directory.name, "data", "calibration.json"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_adaptive_calibration_stops_early_and_applies_offsets(self):
+        bus = NoisySensorBus()
+        mpu = MPU6050(bus=bus)
+        accel_offsets, gyro_offsets = mpu.calibrate(interval=0)
+
+        self.assertLess(mpu.calibration_samples, 200)
+        for offset, bias in zip(accel_offsets + gyro_offsets, ACCEL_BIAS + GYRO_BIAS):
+            self.assertAlmostEqual(offset, bias, delta=0.05)
+
+        # Offsets are subtracted from later readings
+        samples = [mpu.read_sensor_data() for _ in range(200)]
+        means = [sum(axis) / len(samples) for axis in zip(*samples)]
+        expected = (0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
+        for mean, value in zip(means, expected):
+            self.assertAlmostEqual(mean, value, delta=0.02)
+
+    def test_boot_reuses_stored_calibration(self):
+        first = MPU6050(bus=NoisySensorBus())
+        self.assertEqual(calibrate_on_boot(first, self.store), 'calibrated')
+        self.assertIsNotNone(self.store.load())
+
+        # A restart only pays for the short stationarity check
+        bus = NoisySensorBus(temperature=31.0, seed=1)
+        second = MPU6050(bus=bus)
+        self.assertEqual(calibrate_on_boot(second, self.store), 'stored')
+        self.assertEqual(bus.reads, 25)
+        self.assertEqual(second.accel_offsets, first.accel_offsets)
+        self.assertEqual(second.gyro_offsets, first.gyro_offsets)
+
+    def test_temperature_change_forces_recalibration(self):
+        calibrate_on_boot(MPU6050(bus=NoisySensorBus()), self.store)
+        bus = NoisySensorBus(temperature=45.0, seed=1)
+        self.assertEqual(calibrate_on_boot(MPU6050(bus=bus), self.store), 'calibrated')
+        self.assertAlmostEqual(self.store.load()['temperature'], 45.0, delta=0.1)
+
+    def test_moving_sensor_is_never_calibrated(self):
+        bus = NoisySensorBus()
+        bus.moving = True
+        mpu = MPU6050(bus=bus)
+        self.assertEqual(calibrate_on_boot(mpu, self.store), 'none')
+        self.assertEqual(mpu.accel_offsets, (0.0, 0.0, 0.0))
+        self.assertIsNone(self.store.load())
+
+        # With a stored calibration, a moving boot keeps it even if warmer
+        self.store.save((0.1, 0.2, 0.3), (1.0, 2.0, 3.0), 20.0)
+        self.assertEqual(calibrate_on_boot(mpu, self.store), 'stored')
+        self.assertEqual(mpu.gyro_offsets, (1.0, 2.0, 3.0))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
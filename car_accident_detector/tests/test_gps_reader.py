@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+import unittest
+from functools import reduce
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.alert.serial_manager import SerialPortManager
+from car_accident_detector.sensors.gps import GPSInterface
+from car_accident_detector.tests.fake_modem import CGNSINF_FIX, FakeModem
+
+def nmea(body):
+    """Wrap a sentence body with $ and its XOR checksum"""
+    checksum = reduce(lambda value, char: value ^ ord(char), body, 0)
+    return f"${body}*{checksum:02X}\r\n"
+
+GGA = nmea("GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,")
+RMC = nmea("GPRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W")
+RMC_NEXT = nmea("GNRMC,123520,A,4807.100,N,01131.050,E,010.0,090.0,230394,003.1,W")
+GGA_NO_FIX = nmea("GPGGA,123521,,,,,0,00,,,M,,M,,")
+RMC_VOID = nmea("GPRMC,123521,V,4807.038,S,01131.000,W,,,230394,,")
+
+class TestGPSReader(unittest.TestCase):
+    def test_gga_and_rmc_build_one_fix(self):
+        gps = GPSInterface()
+        self.assertIsNone(gps.get_position())
+        self.assertFalse(gps.is_valid_position())
+
+        self.assertTrue(gps.process_line(GGA))
+        self.assertTrue(gps.process_line(RMC))
+        fix = gps.get_fix()
+        # pynmea2 already returns decimal degrees
+        self.assertAlmostEqual(fix.latitude, 48.1173, places=4)
+        self.assertAlmostEqual(fix.longitude, 11.516667, places=4)
+        self.assertAlmostEqual(fix.speed_kmh, 22.4 * 1.852)
+        self.assertAlmostEqual(fix.heading, 84.4)
+        self.assertAlmostEqual(fix.altitude, 545.4)
+        self.assertEqual(fix.satellites, 8)
+        self.assertTrue(gps.is_valid_position())
+        self.assertEqual(gps.get_google_maps_link(), f"https://www.google.com/maps?q={fix.latitude},{fix.longitude}")
+        # Both sentences of the epoch collapse into one track entry
+        self.assertEqual(len(gps.get_track()), 1)
+
+    def test_sentences_without_fix_keep_last_position(self):
+        gps = GPSInterface()
+        gps.process_line(GGA)
+        position = gps.get_position()
+        self.assertFalse(gps.process_line(GGA_NO_FIX))
+        self.assertFalse(gps.process_line(RMC_VOID))
+        self.assertFalse(gps.process_line("$GPGSV,3,1,11,03,03,111,00*74\r\n"))
+        self.assertFalse(gps.process_line("$GPGGA,garbage*00\r\n"))
+        self.assertEqual(gps.get_position(), position)
+        self.assertEqual(gps.parse_errors, 1)
+
+    def test_stale_fix_is_invalid(self):
+        gps = GPSInterface()
+        gps.process_line(GGA)
+        gps._fix = gps._fix._replace(timestamp=time.time() - gps.config.GPS_MAX_FIX_AGE - 1)
+        self.assertFalse(gps.is_valid_position())
+        self.assertIsNotNone(gps.get_google_maps_link())
+
+    def test_track_is_bounded(self):
+        gps = GPSInterface()
+        gps._track = type(gps._track)(maxlen=3)
+        for second in range(5):
+            gps.process_line(nmea(f"GPRMC,12352{second},A,4807.038,N,01131.000,E,000.0,000.0,230394,,"))
+        track = gps.get_track()
+        self.assertEqual(len(track), 3)
+        self.assertEqual([fix.fix_time.second for fix in track], [22, 23, 24])
+
+    def test_cgnsinf_reply_builds_fix(self):
+        gps = GPSInterface()
+        self.assertTrue(gps.process_cgnsinf(CGNSINF_FIX))
+        fix = gps.get_fix()
+        self.assertEqual((fix.latitude, fix.longitude), (40.7128, -74.006))
+        self.assertEqual((fix.speed_kmh, fix.heading, fix.altitude, fix.satellites), (36.0, 90.0, 10.0, 8))
+        self.assertEqual(fix.fix_time.hour, 12)
+        # GNSS running without a fix
+        self.assertFalse(gps.process_cgnsinf('1,0,20240101120001.000,,,,0.00,0.0,0,,,,,,9,0,,,,,'))
+        self.assertEqual(gps.get_fix(), fix)
+
+class TestGPSOverSharedPort(unittest.TestCase):
+    def setUp(self):
+        self.modem = FakeModem(delay=0.005)
+        self.manager = SerialPortManager(self.modem)
+        self.manager.start()
+        self.gps = GPSInterface(self.manager)
+
+    def tearDown(self):
+        self.gps.stop()
+        self.manager.close()
+
+    def test_poller_keeps_position_fresh(self):
+        self.gps.config.GPS_POLL_INTERVAL = 0.01
+        self.gps.start()
+        deadline = time.monotonic() + 1
+        while self.gps.get_fix() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.gps.get_position(), (40.7128, -74.006))
+        self.assertGreaterEqual(self.manager.get_metrics()['queue_latency']['poll']['count'], 1)
+
+        # Lookups are plain reads of the cached fix
+        started = time.monotonic()
+        for _ in range(1000):
+            self.gps.get_google_maps_link()
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_nmea_on_the_port_updates_fix(self):
+        # With AT+CGNSTST=1 the module copies NMEA to the AT port
+        self.modem.inject(GGA + RMC)
+        deadline = time.monotonic() + 1
+        while self.gps.sentences < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertAlmostEqual(self.gps.get_fix().speed_kmh, 22.4 * 1.852)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import ctypes
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.sensors.mpu6050 import MPU6050
+
+class FakeSMBus:
+    """
+    Simulated MPU6050 register map with a 1 KB FIFO; counts I2C transactions
+    """
+
+    def __init__(self):
+        self.registers = bytearray(0x80)
+        self.fifo = bytearray()
+        self.transactions = 0
+
+    def set_block(self, ax, ay, az, temp, gx, gy, gz):
+        self.registers[MPU6050.ACCEL_XOUT_H:MPU6050.ACCEL_XOUT_H + 14] = struct.pack('>7h', ax, ay, az, temp, gx, gy, gz)
+
+    def push(self, frames):
+        for frame in frames:
+            self.fifo += struct.pack('>6h', *frame)
+        if len(self.fifo) > 1024:
+            # The hardware keeps writing over the oldest bytes
+            del self.fifo[:len(self.fifo) - 1024]
+            self.registers[MPU6050.INT_STATUS] |= MPU6050.INT_STATUS_FIFO_OFLOW
+
+    def write_byte_data(self, addr, reg, value):
+        self.transactions += 1
+        self.registers[reg] = value
+        if reg == MPU6050.USER_CTRL and value & MPU6050.USER_CTRL_FIFO_RESET:
+            self.fifo.clear()
+
+    def read_byte_data(self, addr, reg):
+        self.transactions += 1
+        value = self.registers[reg]
+        if reg == MPU6050.INT_STATUS:
+            # Interrupt status clears on read
+            self.registers[reg] = 0
+        return value
+
+    def read_i2c_block_data(self, addr, reg, length):
+        self.transactions += 1
+        if reg == MPU6050.FIFO_COUNTH:
+            return list(struct.pack('>H', len(self.fifo)))
+        return list(self.registers[reg:reg + length])
+
+    def i2c_rdwr(self, select, read):
+        self.transactions += 1
+        assert list(select) == [MPU6050.FIFO_R_W]
+        data = bytes(self.fifo[:read.len])
+        del self.fifo[:read.len]
+        ctypes.memmove(read.buf, data, read.len)
+
+class TestMPU6050(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeSMBus()
+        self.mpu = MPU6050(bus=self.bus)
+        self.bus.transactions = 0
+
+    def test_burst_read_is_one_transaction(self):
+        self.bus.set_block(16384, -8192, 4096, -521, 131, -262, 655)
+        sample = self.mpu.read_sensor_data()
+        self.assertEqual(self.bus.transactions, 1)
+        for value, expected in zip(sample, (1.0, -0.5, 0.25, 1.0, -2.0, 5.0)):
+            self.assertAlmostEqual(value, expected)
+        self.assertAlmostEqual(self.mpu.temperature, 35.0, places=2)
+
+    def test_fifo_drains_many_samples_per_transaction(self):
+        self.assertEqual(self.mpu.enable_fifo(500), 500)
+        self.assertEqual(self.bus.registers[MPU6050.SMPLRT_DIV], 1)
+        self.assertEqual(self.bus.registers[MPU6050.FIFO_EN], MPU6050.FIFO_ACCEL_GYRO)
+
+        frames = [(i * 16, -i * 16, 16384, i * 131, 0, -131) for i in range(80)]
+        self.bus.push(frames)
+        self.bus.transactions = 0
+        samples = self.mpu.read_fifo()
+
+        # Status, count and one combined read for all 80 samples
+        self.assertEqual(self.bus.transactions, 3)
+        self.assertEqual(len(samples), 80)
+        self.assertAlmostEqual(samples[10][0], 160 / 16384.0)
+        self.assertAlmostEqual(samples[10][1], -160 / 16384.0)
+        self.assertAlmostEqual(samples[10][3], 10.0)
+        self.assertAlmostEqual(samples[79][5], -1.0)
+        self.assertEqual(self.mpu.read_fifo(), [])
+
+    def test_fifo_max_samples_leaves_the_rest(self):
+        self.mpu.enable_fifo(1000)
+        self.bus.push([(i, 0, 0, 0, 0, 0) for i in range(10)])
+        first = self.mpu.read_fifo(max_samples=4)
+        rest = self.mpu.read_fifo()
+        self.assertEqual([round(s[0] * 16384) for s in first + rest], list(range(10)))
+
+    def test_fifo_overflow_resets(self):
+        self.mpu.enable_fifo(1000)
+        self.bus.push([(1, 2, 3, 4, 5, 6)] * 100)
+        self.assertEqual(self.mpu.read_fifo(), [])
+        self.assertEqual(self.mpu.fifo_overflows, 1)
+        self.assertEqual(len(self.bus.fifo), 0)
+
+        self.bus.push([(1, 2, 3, 4, 5, 6)] * 5)
+        self.assertEqual(len(self.mpu.read_fifo()), 5)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.ml.preprocessing import DataPreprocessor
+from car_accident_detector.ml.scheduler import InferenceScheduler
+from car_accident_detector.pipeline import DetectionPipeline, SampleRing
+from car_accident_detector.sensors.sample_clock import SampleClock
+
+QUIET_SAMPLE = (0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
+
+class SlowDetector:
+    """Stand-in for the model: each invoke takes `delay` seconds"""
+
+    def __init__(self, delay, result=(False, 0.0)):
+        self.delay = delay
+        self.result = result
+        self.calls = 0
+
+    def predict(self, window):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.result
+
+def make_pipeline(detector, on_accident=lambda timestamp, confidence: None, queue_size=250, hop_size=1):
+    return DetectionPipeline(
+        read_sample=lambda: QUIET_SAMPLE,
+        preprocessor=DataPreprocessor(),
+        detector=detector,
+        scheduler=InferenceScheduler(hop_size=hop_size),
+        on_accident=on_accident,
+        sample_clock=SampleClock(200),
+        queue_size=queue_size
+    )
+
+class TestSampleRing(unittest.TestCase):
+    def test_full_ring_overwrites_oldest_and_counts_drops(self):
+        ring = SampleRing(5)
+        for i in range(8):
+            ring.push(float(i), (i,))
+        self.assertEqual(ring.high_water, 5)
+
+        batch = ring.drain(timeout=0)
+        self.assertEqual([timestamp for timestamp, _ in batch], [3.0, 4.0, 5.0, 6.0, 7.0])
+        self.assertEqual(ring.dropped, 3)
+        self.assertEqual(ring.drain(timeout=0), [])
+
+        ring.push(8.0, (8,))
+        self.assertEqual(len(ring.drain(timeout=0)), 1)
+        self.assertEqual(ring.dropped, 3)
+        self.assertEqual(ring.pushed, 9)
+
+class TestDetectionPipeline(unittest.TestCase):
+    def test_slow_model_does_not_cost_samples(self):
+        # Each invoke takes six sample periods at 200 Hz
+        detector = SlowDetector(0.03)
+        pipeline = make_pipeline(detector)
+        pipeline.start()
+        time.sleep(0.6)
+        pipeline.stop()
+
+        metrics = pipeline.get_metrics()
+        self.assertGreater(metrics['samples'], 80)
+        self.assertEqual(metrics['dropped_samples'], 0)
+        self.assertEqual(metrics['processed'] + metrics['queue_occupancy'], metrics['samples'])
+        # The worker catches up with one invoke per backlog, not one per sample
+        self.assertLess(detector.calls, metrics['samples'] / 3)
+        self.assertGreater(metrics['queue_high_water'], 1)
+        self.assertGreater(metrics['latency']['inference']['mean_ms'], 25)
+
+    def test_stalled_worker_drops_oldest_samples(self):
+        detector = SlowDetector(0.3)
+        pipeline = make_pipeline(detector, queue_size=10)
+        pipeline.start()
+        time.sleep(0.6)
+        pipeline.stop()
+
+        metrics = pipeline.get_metrics()
+        self.assertGreater(metrics['dropped_samples'], 0)
+        self.assertEqual(metrics['queue_high_water'], 10)
+
+    def test_alerts_run_off_the_inference_thread(self):
+        handled = []
+        release = threading.Event()
+
+        def on_accident(timestamp, confidence):
+            handled.append((threading.current_thread().name, confidence))
+            release.wait(1)
+
+        detector = SlowDetector(0.0, result=(True, 0.9))
+        pipeline = make_pipeline(detector, on_accident=on_accident)
+        pipeline.start()
+        time.sleep(0.4)
+        # The first alert is still blocked, yet inference kept running
+        calls = detector.calls
+        time.sleep(0.1)
+        self.assertGreater(detector.calls, calls)
+        release.set()
+        pipeline.stop()
+
+        self.assertEqual(handled[0], ("alerts", 0.9))
+        self.assertGreater(pipeline.get_metrics()['detections'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
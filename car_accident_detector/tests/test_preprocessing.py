@@ -1,7 +1,12 @@
+import os
+import sys
 import unittest
 import numpy as np
-from ml.preprocessing import DataPreprocessor
-from config import Config
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.ml.preprocessing import DataPreprocessor
+from car_accident_detector.config import Config
 
 class TestDataPreprocessor(unittest.TestCase):
     
@@ -16,7 +21,10 @@ class TestDataPreprocessor(unittest.TestCase):
         self.preprocessor.add_data(sensor_data)
         
         self.assertEqual(len(self.preprocessor.data_buffer), 1)
-        self.assertEqual(self.preprocessor.data_buffer[0], sensor_data)
+        # Samples are normalized on write
+        np.testing.assert_allclose(
+            self.preprocessor.data_buffer[0], [0.5, 1.0, 1.0, 4.0 / 250, 5.0 / 250, 6.0 / 250], rtol=1e-6
+        )
     
     def test_window_size_limit(self):
         """Test that buffer maintains correct window size"""
@@ -30,8 +38,8 @@ class TestDataPreprocessor(unittest.TestCase):
         self.assertEqual(len(self.preprocessor.data_buffer), self.config.WINDOW_SIZE)
         
         # First item should be the correct one (after removing oldest)
-        expected_first = (10.0, 11.0, 12.0, 13.0, 14.0, 15.0)
-        self.assertEqual(self.preprocessor.data_buffer[0], expected_first)
+        expected_first = self.preprocessor.normalize_data(np.array([[10.0, 11.0, 12.0, 13.0, 14.0, 15.0]]))[0]
+        np.testing.assert_allclose(self.preprocessor.data_buffer[0], expected_first, rtol=1e-6)
     
     def test_get_window(self):
         """Test getting data window"""
@@ -85,6 +93,30 @@ class TestDataPreprocessor(unittest.TestCase):
         # Check output shape
         expected_shape = (1, self.config.WINDOW_SIZE, self.config.FEATURES)
         self.assertEqual(features.shape, expected_shape)
+    
+    def test_processed_window_matches_list_buffer(self):
+        """Test the ring buffer against normalizing the last window of a plain list"""
+        rng = np.random.default_rng(0)
+        samples = rng.uniform(-300, 300, (3 * self.config.WINDOW_SIZE + 7, self.config.FEATURES))
+        for count, sample in enumerate(samples, start=1):
+            self.preprocessor.add_data(tuple(sample))
+            window = self.preprocessor.get_processed_window()
+            if count < self.config.WINDOW_SIZE:
+                self.assertIsNone(window)
+                continue
+            expected = self.preprocessor.extract_features(samples[count - self.config.WINDOW_SIZE:count].copy())
+            self.assertEqual(window.dtype, np.float32)
+            np.testing.assert_allclose(window, expected, rtol=1e-6, atol=1e-7)
+    
+    def test_processed_window_is_a_view(self):
+        """Test that reading a window does not copy the buffer"""
+        for i in range(self.config.WINDOW_SIZE + 3):
+            self.preprocessor.add_data((float(i),) * self.config.FEATURES)
+        window = self.preprocessor.get_processed_window()
+        self.assertTrue(window.flags.c_contiguous)
+        self.assertFalse(window.flags.writeable)
+        self.assertTrue(np.shares_memory(window, self.preprocessor.get_window()))
+        self.assertIs(window, self.preprocessor.get_processed_window())
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
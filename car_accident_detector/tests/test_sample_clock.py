@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.sensors.sample_clock import SampleClock
+
+class FakeClock:
+    """Monotonic clock that only moves when slept on or advanced"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestSampleClock(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeClock()
+        self.clock = SampleClock(50, clock=self.time, sleep=self.time.sleep)
+
+    def test_loop_cost_does_not_lower_the_rate(self):
+        # 12 ms of work per sample; sleeping 20 ms after it would give 31 Hz
+        timestamps = []
+        for _ in range(500):
+            timestamps.append(self.clock.wait())
+            self.time.now += 0.012
+
+        metrics = self.clock.get_metrics()
+        self.assertAlmostEqual(metrics['observed_rate'], 50.0, places=6)
+        self.assertEqual(metrics['missed_deadlines'], 0)
+        self.assertLess(metrics['interval_jitter_ms'], 1e-6)
+        self.assertAlmostEqual(timestamps[-1] - timestamps[0], 499 * 0.02, places=6)
+
+    def test_stall_skips_missed_deadlines_and_stays_on_grid(self):
+        start = self.clock.wait()
+        self.time.now += 0.07
+        # Deadlines at 20 and 40 ms are lost; the 60 ms one is served late
+        late = self.clock.wait()
+        self.assertEqual(self.clock.missed_deadlines, 2)
+        self.assertAlmostEqual(late - start, 0.07, places=6)
+        self.assertAlmostEqual(self.clock.get_metrics()['max_lateness_ms'], 10.0, places=3)
+
+        following = [self.clock.wait() for _ in range(3)]
+        self.assertEqual([round((t - start) * 1000) for t in following], [80, 100, 120])
+        self.assertEqual(self.clock.missed_deadlines, 2)
+
+    def test_interrupt_pacing_uses_edge_times(self):
+        clock = SampleClock(50, interrupt=True, clock=self.time, sleep=self.time.sleep)
+        clock.data_ready()
+        self.time.now += 0.001
+        first = clock.wait()
+
+        # Two edges before the next read: one sample was overwritten
+        self.time.now += 0.019
+        clock.data_ready()
+        self.time.now += 0.020
+        clock.data_ready()
+        self.time.now += 0.002
+        second = clock.wait()
+
+        self.assertAlmostEqual(second - first, 0.04, places=6)
+        metrics = clock.get_metrics()
+        self.assertEqual(metrics['missed_deadlines'], 1)
+        self.assertAlmostEqual(metrics['max_lateness_ms'], 2.0, places=3)
+
+    def test_interrupt_timeout_counts_a_miss(self):
+        clock = SampleClock(200, interrupt=True, clock=self.time, sleep=self.time.sleep)
+        clock.wait()
+        self.assertEqual(clock.missed_deadlines, 1)
+
+    def test_edge_interleaved_with_wait_is_not_a_bogus_sample(self):
+        clock = SampleClock(50, interrupt=True, clock=self.time, sleep=self.time.sleep)
+        outside_lock = []
+
+        class CheckedEvent(threading.Event):
+            def set(self):
+                outside_lock.append(not clock._ready_lock.locked())
+                super().set()
+
+        clock._ready = CheckedEvent()
+        clock.data_ready()
+        clock.wait()
+        self.assertEqual(outside_lock, [False])
+
+        # A wake-up left over with nothing pending is waited through, not
+        # returned as a sample with -1 missed deadlines
+        clock._ready.set()
+        self.time.now += 0.020
+        edge = threading.Timer(0.005, clock.data_ready)
+        edge.start()
+        sample_time = clock.wait()
+        edge.join()
+        self.assertAlmostEqual(sample_time - clock._epoch, self.time.now, places=6)
+        self.assertEqual(clock.missed_deadlines, 0)
+        self.assertEqual(clock.samples, 2)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.config import Config
+from car_accident_detector.ml.preprocessing import DataPreprocessor
+from car_accident_detector.ml.scheduler import InferenceScheduler
+
+def window_classifier(window):
+    """Stand-in for the model: enough violent samples in the window"""
+    violent = (np.abs(window[0, :, :3]) >= 0.9).any(axis=1) | (np.abs(window[0, :, 3:]) >= 0.6).any(axis=1)
+    return int(violent.sum()) >= 8
+
+def make_drive(seed, minutes, accidents):
+    """
+    Quiet driving with 5 s accident events spliced in (the distributions of
+    generate_training_data.py); returns samples and event starts
+    """
+    rng = np.random.default_rng(seed)
+    rate = Config().SAMPLING_RATE
+    seconds = np.arange(minutes * 60 * rate) / rate
+    drive = np.column_stack([
+        rng.normal(0, 0.3, len(seconds)) + 0.2 * np.sin(2 * np.pi * seconds / 10),
+        rng.normal(0, 0.3, len(seconds)) + 0.1 * np.cos(2 * np.pi * seconds / 15),
+        rng.normal(1.0, 0.2, len(seconds)),
+        rng.normal(0, 5.0, len(seconds)),
+        rng.normal(0, 5.0, len(seconds)),
+        rng.normal(0, 3.0, len(seconds)),
+    ])
+    offsets = np.arange(5 * rate) / rate
+    starts = np.linspace(rate * 30, len(drive) - rate * 30, accidents).astype(int)
+    for start in starts:
+        drive[start:start + len(offsets)] = np.column_stack([
+            rng.normal(0, 3.0, len(offsets)) + 5.0 * np.exp(-offsets * 5),
+            rng.normal(0, 3.0, len(offsets)) + 3.0 * np.exp(-offsets * 3),
+            rng.normal(0, 4.0, len(offsets)) + 2.0 * np.exp(-offsets * 4),
+            rng.normal(0, 100.0, len(offsets)) + 200.0 * np.exp(-offsets * 2),
+            rng.normal(0, 100.0, len(offsets)) + 150.0 * np.exp(-offsets * 2),
+            rng.normal(0, 80.0, len(offsets)) + 100.0 * np.exp(-offsets * 2),
+        ])
+    return [tuple(sample) for sample in drive.tolist()], list(starts)
+
+def replay(samples, scheduler=None):
+    """Sample indices at which the classifier fired"""
+    preprocessor = DataPreprocessor()
+    fired = []
+    for index, sample in enumerate(samples):
+        preprocessor.add_data(sample)
+        if scheduler is not None and not scheduler.should_infer(sample[:3], sample[3:]):
+            continue
+        window = preprocessor.get_processed_window()
+        if window is not None and window_classifier(window):
+            fired.append(index)
+    return fired
+
+def first_detection(fired, start, horizon):
+    return next((index for index in fired if start <= index < start + horizon), None)
+
+class TestInferenceScheduler(unittest.TestCase):
+    
+    def test_quiet_driving_runs_every_hop(self):
+        """Test that calm samples only run the model once per hop"""
+        scheduler = InferenceScheduler(hop_size=5)
+        runs = [scheduler.should_infer((0.0, 0.0, 1.0), (1.0, -1.0, 0.5)) for _ in range(20)]
+        self.assertEqual(runs, [False, False, False, False, True] * 4)
+        self.assertEqual(scheduler.get_metrics()['inferences'], 4)
+    
+    def test_gate_forces_inference_and_holds(self):
+        """Test that an anomalous sample runs the model at once and for the hold period"""
+        scheduler = InferenceScheduler(hop_size=10, hold_samples=3)
+        for _ in range(3):
+            scheduler.should_infer((0.0, 0.0, 1.0), (0.0, 0.0, 0.0))
+        self.assertTrue(scheduler.should_infer((0.0, 0.0, 1.0), (0.0, 250.0, 0.0)))
+        runs = [scheduler.should_infer((0.0, 0.0, 1.0), (0.0, 0.0, 0.0)) for _ in range(12)]
+        self.assertEqual(runs, [True] * 3 + [False] * 9)
+        self.assertEqual(scheduler.triggers, 1)
+        self.assertEqual(scheduler.gated_inferences, 4)
+    
+    def test_replay_preserves_recall(self):
+        """Test that every accident found by per-sample inference is still found, no later"""
+        samples, starts = make_drive(seed=7, minutes=10, accidents=8)
+        horizon = Config().WINDOW_SIZE * 6
+        baseline = replay(samples)
+        scheduler = InferenceScheduler()
+        scheduled = replay(samples, scheduler)
+        
+        for start in starts:
+            expected = first_detection(baseline, start, horizon)
+            self.assertIsNotNone(expected)
+            self.assertEqual(first_detection(scheduled, start, horizon), expected)
+        
+        # Far fewer model invocations than the 50/s of per-sample inference,
+        # even with an accident every 75 s
+        metrics = scheduler.get_metrics()
+        self.assertLess(metrics['inferences_per_second'], 15)
+        self.assertGreater(metrics['gated_inferences'], 0)
+    
+    def test_quiet_replay_stays_near_hop_rate(self):
+        """Test that the gate rarely fires on normal driving"""
+        samples, _ = make_drive(seed=3, minutes=5, accidents=0)
+        scheduler = InferenceScheduler()
+        self.assertEqual(replay(samples, scheduler), [])
+        rate = scheduler.get_metrics()['inferences_per_second']
+        self.assertLess(rate, 1.5 * Config().SAMPLING_RATE / scheduler.hop_size)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
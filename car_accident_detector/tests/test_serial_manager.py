@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.alert.serial_manager import (PRIORITY_ALERT, PRIORITY_CONTROL, PRIORITY_POLL,
+                                                         SerialPortManager)
+from car_accident_detector.alert.sim7000c import SIM7000C
+from car_accident_detector.sensors.gps import GPSInterface
+from car_accident_detector.tests.fake_modem import FakeModem
+
+class TestSerialPortManager(unittest.TestCase):
+    def setUp(self):
+        self.modem = FakeModem(delay=0.01)
+        self.manager = SerialPortManager(self.modem)
+        self.manager.start()
+
+    def tearDown(self):
+        self.manager.close()
+
+    def test_alert_runs_before_queued_polls(self):
+        order = []
+        release = threading.Event()
+        self.manager.submit(lambda engine: release.wait(1), PRIORITY_CONTROL)
+        polls = [self.manager.submit(lambda engine, i=i: order.append(f"poll{i}"), PRIORITY_POLL) for i in range(3)]
+        alert = self.manager.submit(lambda engine: order.append("alert"), PRIORITY_ALERT)
+        release.set()
+        alert.result(1)
+        for poll in polls:
+            poll.result(1)
+        self.assertEqual(order, ["alert", "poll0", "poll1", "poll2"])
+
+    def test_requests_get_their_own_responses(self):
+        self.assertEqual(self.manager.command("AT+CSQ").value("+CSQ:"), "15,0")
+        self.assertTrue(self.manager.command("AT+CGNSINF", PRIORITY_POLL).value("+CGNSINF:").startswith("1,1,"))
+        metrics = self.manager.get_metrics()
+        self.assertEqual(metrics['executed'], 2)
+        self.assertEqual(metrics['queue_latency']['control']['count'], 1)
+        self.assertEqual(metrics['queue_latency']['poll']['count'], 1)
+
+    def test_urcs_are_routed_by_prefix(self):
+        sms, registration = [], []
+        self.manager.subscribe('+CMTI:', lambda urc, body: sms.append(urc))
+        self.manager.subscribe('+CREG:', lambda urc, body: registration.append(urc))
+        self.modem.inject('\r\n+CMTI: "SM",3\r\n+CREG: 5\r\nRING\r\n')
+        self.manager.command("AT")
+        time.sleep(0.05)
+        self.assertEqual(sms, ['+CMTI: "SM",3'])
+        self.assertEqual(registration, ['+CREG: 5'])
+        self.assertEqual(self.manager.get_metrics()['unrouted_urcs'], 1)
+
+    def test_close_cancels_queued_requests(self):
+        release = threading.Event()
+        self.manager.submit(lambda engine: release.wait(0.2))
+        queued = self.manager.submit(lambda engine: None, PRIORITY_POLL)
+        self.manager.close()
+        release.set()
+        self.assertTrue(queued.cancelled())
+        self.assertIsNotNone(self.manager.submit(lambda engine: None).exception())
+
+class TestSharedPort(unittest.TestCase):
+    def test_sms_preempts_gps_polling(self):
+        modem = FakeModem(delay=0.02)
+        manager = SerialPortManager(modem)
+        manager.start()
+        gps = GPSInterface(manager)
+        sim = SIM7000C(manager)
+        # Saturate the queue with GPS polls from several threads
+        stop = threading.Event()
+
+        def flood():
+            while not stop.is_set():
+                gps.poll()
+
+        flooders = [threading.Thread(target=flood) for _ in range(4)]
+        try:
+            self.assertTrue(sim.initialize_module())
+            for thread in flooders:
+                thread.start()
+            time.sleep(0.1)
+            self.assertTrue(sim.send_alert("+15551234", gps.get_google_maps_link()))
+        finally:
+            stop.set()
+            for thread in flooders:
+                thread.join()
+            manager.close()
+
+        metrics = manager.get_metrics()
+        # The SMS waited for at most the one poll already on the wire
+        self.assertLess(metrics['queue_latency']['alert']['max_ms'], 60)
+        self.assertGreater(metrics['queue_latency']['poll']['max_ms'], metrics['queue_latency']['alert']['max_ms'])
+        # Interleaved traffic never corrupted a GPS reply
+        self.assertEqual(gps.parse_errors, 0)
+        self.assertEqual(gps.get_position(), (40.7128, -74.006))
+        self.assertIn(b'AT+CMGS="+15551234"\r', modem.written)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
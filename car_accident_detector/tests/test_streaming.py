@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import tensorflow as tf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from car_accident_detector.ml.streaming import StreamingAccidentDetector
+from car_accident_detector.ml.streaming_export import build_step_model, export_streaming_model
+
+WINDOW = 12
+FEATURES = 6
+
+def make_model():
+    """Untrained model with the create_lstm_model layer stack, on a short window"""
+    tf.keras.utils.set_random_seed(0)
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=(WINDOW, FEATURES)),
+        tf.keras.layers.LSTM(16, return_sequences=True),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.LSTM(8),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.Dense(4, activation='relu'),
+        tf.keras.layers.Dense(1, activation='sigmoid'),
+    ])
+
+class TestStreamingInference(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.model = make_model()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.directory.name, 'stream.tflite')
+        export_streaming_model(cls.model, cls.model_path)
+        cls.samples = np.random.default_rng(1).uniform(-1, 1, (100, FEATURES)).astype(np.float32)
+        windows = np.stack([cls.samples[end - WINDOW:end] for end in range(WINDOW, len(cls.samples) + 1)])
+        # windowed[n] is the windowed confidence after n + WINDOW samples
+        cls.windowed = cls.model.predict(windows, verbose=0)[:, 0]
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+    
+    def test_step_model_interface(self):
+        """Test the exported state inputs and outputs"""
+        step = build_step_model(self.model)
+        self.assertEqual([tuple(x.shape) for x in step.inputs], [(1, 1, 6), (1, 16), (1, 16), (1, 8), (1, 8)])
+        self.assertEqual(len(step.outputs), 5)
+    
+    def test_parity_with_windowed_inference_at_resyncs(self):
+        """Test that the streamed confidence equals windowed inference at every resync"""
+        detector = StreamingAccidentDetector(self.model_path, window_size=WINDOW, resync_interval=20)
+        streamed = [detector.update(sample) for sample in self.samples]
+        
+        self.assertEqual(streamed[:WINDOW - 1], [None] * (WINDOW - 1))
+        exact = range(WINDOW, len(self.samples) + 1, 20)
+        for count in exact:
+            self.assertAlmostEqual(streamed[count - 1], self.windowed[count - WINDOW], places=5)
+        self.assertEqual(detector.resyncs, len(exact) - 1)
+        # One step per sample plus one window of shadow steps per resync
+        self.assertEqual(detector.steps, len(self.samples) + WINDOW * detector.resyncs)
+    
+    def test_reset_restarts_warm_up(self):
+        """Test that reset forgets state"""
+        detector = StreamingAccidentDetector(self.model_path, window_size=WINDOW, resync_interval=20)
+        for sample in self.samples[:30]:
+            detector.update(sample)
+        detector.reset()
+        streamed = [detector.update(sample) for sample in self.samples[:WINDOW]]
+        self.assertIsNone(streamed[-2])
+        self.assertAlmostEqual(streamed[-1], self.windowed[0], places=5)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,242 @@
+import time
+from typing import Callable, List, NamedTuple, Optional
+from config import Config
+
+try:
+    from time import ticks_ms, ticks_add, ticks_diff, sleep_ms
+except ImportError:
+    # CPython: plain integer milliseconds, no wraparound
+    def ticks_ms():
+        return time.monotonic_ns() // 1000000
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    def ticks_diff(end, start):
+        return end - start
+
+    def sleep_ms(ms):
+        time.sleep(ms / 1000)
+
+# Result codes that end a command
+FINAL_RESULTS = ('OK', 'ERROR', 'NO CARRIER', 'BUSY', 'NO ANSWER', 'NO DIALTONE')
+FINAL_ERROR_PREFIXES = ('+CME ERROR:', '+CMS ERROR:')
+
+# Unsolicited result codes; a line with one of these prefixes is only a
+# response when it matches the command in flight (AT+CREG? -> +CREG: 0,1)
+URC_PREFIXES = ('RING', '+CMTI:', '+CMT:', '+CDS:', '+CREG:', '+CGREG:', '+CEREG:', '+CPIN:', '+CFUN:',
+                '+UGNSINF:', '+APP PDP:', 'RDY', 'SMS Ready', 'Call Ready', 'NORMAL POWER DOWN',
+                'UNDER-VOLTAGE', 'OVER-VOLTAGE')
+# URCs followed by one more line (the message text)
+URC_WITH_BODY = ('+CMT:', '+CDS:')
+
+# Maximum response times from the SIM7000 AT command manual, in seconds
+COMMAND_TIMEOUTS = {
+    'AT+CMGS': 60.0,
+    'AT+COPS': 120.0,
+    'AT+CGATT': 75.0,
+    'AT+CFUN': 10.0,
+    'AT+CGNSPWR': 10.0
+}
+
+class ATResponse(NamedTuple):
+    """
+    Outcome of one AT command
+    """
+    command: str
+    final: str          # 'OK', 'ERROR', '+CME ERROR: <n>', '>' or 'TIMEOUT'
+    lines: List[str]    # Information lines between the command and the final result
+    elapsed: float      # Seconds from write to final result
+
+    @property
+    def ok(self) -> bool:
+        return self.final in ('OK', '>')
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines + [self.final])
+
+    def value(self, prefix: str) -> Optional[str]:
+        """
+        Payload of the first line starting with prefix ('+CSQ:' -> '15,0')
+        """
+        for line in self.lines:
+            if line.startswith(prefix):
+                return line[len(prefix):].strip()
+        return None
+
+class _Pending:
+    def __init__(self, command: str, prompt: bool):
+        self.command = command
+        # Solicited information lines start with the command name
+        name = command[2:].split('=')[0].split('?')[0] if command.upper().startswith('AT+') else None
+        self.prefix = name + ':' if name else None
+        self.prompt = prompt
+        self.lines = []
+        self.final = None
+
+class ATTokenizer:
+    """
+    Splits the modem byte stream into lines, plus the bare '>' prompt that
+    AT+CMGS sends without a line ending
+    """
+
+    def __init__(self):
+        self.buffer = b''
+
+    def feed(self, data: bytes) -> List[str]:
+        self.buffer += data
+        *lines, self.buffer = self.buffer.replace(b'\r', b'\n').split(b'\n')
+        tokens = [line.decode('utf-8', 'replace').strip() for line in lines]
+        tokens = [token for token in tokens if token]
+        if self.buffer.strip() == b'>':
+            tokens.append('>')
+            self.buffer = b''
+        return tokens
+
+class ATEngine:
+    """
+    AT command channel that completes each command on its final result code
+
+    There is no reader thread: command() polls the UART every POLL_MS and
+    returns as soon as the final result code (or the '>' prompt) arrives,
+    instead of sleeping for a fixed time. Unsolicited result codes seen
+    while waiting, or drained with poll() from the main loop, go to on_urc
+    and are never mixed into a command response.
+    """
+
+    # UART poll step while a command is in flight
+    POLL_MS = 2
+
+    def __init__(self, port, on_urc: Optional[Callable[[str, Optional[str]], None]] = None):
+        """
+        port: machine.UART (any/read/write) or pyserial (in_waiting/read/write)
+        on_urc: called with (urc, body); body is the message text for
+                +CMT/+CDS, otherwise None
+        """
+        self.config = Config()
+        self.port = port
+        self.on_urc = on_urc
+        self.tokenizer = ATTokenizer()
+        self._pending = None
+        self._urc_header = None
+
+        self.urcs = []                # Recent (urc, body), newest last
+        self.urc_count = 0
+        self.commands = 0
+        self.timeouts = 0
+        self.stray_results = 0        # Final results that arrived after their command timed out
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _available(self) -> int:
+        if hasattr(self.port, 'any'):
+            return self.port.any()
+        return self.port.in_waiting
+
+    def poll(self):
+        """Process whatever the modem has sent; dispatches pending URCs"""
+        count = self._available()
+        if count:
+            for token in self.tokenizer.feed(self.port.read(count)):
+                self._handle_line(token)
+
+    def command(self, command: str, timeout: Optional[float] = None, prompt: bool = False,
+                terminator: str = '\r') -> ATResponse:
+        """
+        Send one command and wait for its final result code
+        timeout: seconds; defaults to COMMAND_TIMEOUTS or AT_COMMAND_TIMEOUT
+        prompt: also complete on the '>' prompt (AT+CMGS)
+        terminator: '\\x1A' sends SMS text after the prompt
+        Returns: ATResponse; final is 'TIMEOUT' if nothing final arrived
+        """
+        if timeout is None:
+            name = command.split('=')[0].split('?')[0].upper()
+            timeout = COMMAND_TIMEOUTS.get(name, self.config.AT_COMMAND_TIMEOUT)
+
+        # URCs that arrived before the command must not be taken as its response
+        self.poll()
+        pending = _Pending(command, prompt)
+        self._pending = pending
+        started = ticks_ms()
+        deadline = ticks_add(started, int(timeout * 1000))
+        self.port.write((command + terminator).encode())
+        try:
+            while True:
+                self.poll()
+                if pending.final is not None or ticks_diff(deadline, ticks_ms()) <= 0:
+                    break
+                sleep_ms(self.POLL_MS)
+        finally:
+            self._pending = None
+        elapsed = ticks_diff(ticks_ms(), started) / 1000
+
+        self.commands += 1
+        if pending.final is None:
+            self.timeouts += 1
+            return ATResponse(command, 'TIMEOUT', pending.lines, elapsed)
+        self._latency_total += elapsed
+        self._latency_max = max(self._latency_max, elapsed)
+        return ATResponse(command, pending.final, pending.lines, elapsed)
+
+    def _handle_line(self, line: str):
+        # Route one tokenized line to the command in flight or to on_urc
+        if self._urc_header is not None:
+            header, self._urc_header = self._urc_header, None
+            self._dispatch_urc(header, line)
+            return
+
+        pending = self._pending
+        is_final = line in FINAL_RESULTS or line.startswith(FINAL_ERROR_PREFIXES)
+        if pending is None or pending.final is not None:
+            if is_final:
+                self.stray_results += 1
+            elif line != '>':
+                self._urc(line)
+            return
+
+        if line == pending.command:
+            return  # Echo
+        if is_final:
+            pending.final = line
+        elif line == '>':
+            if pending.prompt:
+                pending.final = line
+        elif line.startswith(URC_PREFIXES) and not (pending.prefix and line.startswith(pending.prefix)):
+            self._urc(line)
+        else:
+            pending.lines.append(line)
+
+    def _urc(self, line: str):
+        if line.startswith(URC_WITH_BODY):
+            self._urc_header = line
+        else:
+            self._dispatch_urc(line, None)
+
+    def _dispatch_urc(self, urc: str, body: Optional[str]):
+        self.urcs.append((urc, body))
+        if len(self.urcs) > 20:
+            self.urcs.pop(0)
+        self.urc_count += 1
+        if self.on_urc is not None:
+            try:
+                self.on_urc(urc, body)
+            except Exception as e:
+                print(f"URC handler error: {e}")
+
+    def get_metrics(self) -> dict:
+        """
+        Command count and latency, timeouts and URCs seen
+        """
+        completed = self.commands - self.timeouts
+        return {
+            'commands': self.commands,
+            'timeouts': self.timeouts,
+            'stray_results': self.stray_results,
+            'urcs': self.urc_count,
+            'latency': {
+                'count': completed,
+                'mean_ms': 1000 * self._latency_total / completed if completed else 0.0,
+                'max_ms': 1000 * self._latency_max
+            }
+        }
\ No newline at end of file
@@ -1,7 +1,7 @@
-import time
 from typing import Optional
 import serial
 from config import Config
+from alert.at_engine import ATEngine, COMMAND_TIMEOUTS
 
 class SIM7000C:
     """
@@ -11,9 +11,10 @@ class SIM7000C:
     def __init__(self):
         self.config = Config()
         self.serial_port = None
+        self.engine = None
         self.initialized = False
         self.power_pin = None  # For ESP32 power control if needed
-        
+    
     def connect(self) -> bool:
         """
         Connect to SIM7000C module via serial
@@ -23,50 +24,45 @@ class SIM7000C:
             # For ESP32, we might need to use a different serial implementation
             # This is a simplified version - actual ESP32 implementation would
             # use machine.UART or similar
-            
+        
             # In a real ESP32 implementation, you would use:
             # from machine import UART, Pin
-            # self.serial_port = UART(1, baudrate=self.config.BAUD_RATE, 
-            #                        tx=Pin(self.config.SIM7000C_TX_PIN), 
+            # self.serial_port = UART(1, baudrate=self.config.BAUD_RATE,
+            #                        tx=Pin(self.config.SIM7000C_TX_PIN),
             #                        rx=Pin(self.config.SIM7000C_RX_PIN))
-            
+            # ATEngine works with either port type
+        
             # For PC testing, we'll use pyserial
             self.serial_port = serial.Serial(
                 self.config.SERIAL_PORT,
                 self.config.BAUD_RATE,
-                timeout=2
+                timeout=0
             )
-            print("Connected to SIM7000C")
-            return True
         except Exception as e:
             print(f"Failed to connect to SIM7000C: {e}")
             return False
+        self.engine = ATEngine(self.serial_port, on_urc=self.handle_urc)
+        print("Connected to SIM7000C")
+        return True
+    
+    def handle_urc(self, urc: str, body: Optional[str]):
+        """Unsolicited result codes (incoming SMS, registration changes)"""
+        print(f"SIM7000C: {urc}" + (f" {body}" if body else ""))
+    
+    def poll(self):
+        """Handle URCs that arrived between commands; call from the main loop"""
+        if self.engine:
+            self.engine.poll()
     
-    def send_at_command(self, command: str, wait_time: float = 1.0) -> str:
+    def send_at_command(self, command: str, timeout: Optional[float] = None) -> str:
         """
         Send AT command to SIM7000C and return response
+        Returns as soon as the final result code arrives
         """
-        if not self.serial_port:
+        if not self.engine:
             return ""
-            
         try:
-            # Clear input buffer
-            self.serial_port.flushInput()
-            
-            # Send command
-            cmd = command + '\r\n'
-            self.serial_port.write(cmd.encode())
-            time.sleep(wait_time)
-            
-            # Read response
-            response = ""
-            start_time = time.time()
-            while time.time() - start_time < 2.0:
-                if self.serial_port.in_waiting > 0:
-                    response += self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
-                time.sleep(0.1)
-            
-            return response
+            return self.engine.command(command, timeout).text
         except Exception as e:
             print(f"Error sending AT command: {e}")
             return ""
@@ -76,34 +72,34 @@ class SIM7000C:
         Initialize SIM7000C module
         Returns: True if initialization successful
         """
-        if not self.serial_port:
+        if not self.engine:
             return False
-            
+        
         print("Initializing SIM7000C...")
         
         # Test communication
-        response = self.send_at_command("AT", 1)
-        if "OK" not in response:
+        if not self.engine.command("AT").ok:
             print("Module not responding to AT commands")
             return False
         
+        # Disable command echo
+        self.engine.command("ATE0")
+        
         # Set SMS mode to text
-        self.send_at_command("AT+CMGF=1", 1)
+        self.engine.command("AT+CMGF=1")
         
         # Set SMS character set
-        self.send_at_command("AT+CSCS=\"GSM\"", 1)
+        self.engine.command("AT+CSCS=\"GSM\"")
         
         # Enable SMS notification
-        self.send_at_command("AT+CNMI=1,2,0,0,0", 1)
+        self.engine.command("AT+CNMI=1,2,0,0,0")
         
         # Check if SIM is inserted and registered
-        response = self.send_at_command("AT+CPIN?", 1)
-        if "READY" not in response:
+        if self.engine.command("AT+CPIN?").value("+CPIN:") != "READY":
             print("SIM card not ready")
             return False
         
-        response = self.send_at_command("AT+CREG?", 1)
-        if "+CREG: 0,1" not in response and "+CREG: 0,5" not in response:
+        if self.engine.command("AT+CREG?").value("+CREG:") not in ("0,1", "0,5"):
             print("Not registered to network")
             return False
         
@@ -119,29 +115,20 @@ class SIM7000C:
         if not self.initialized:
             print("Module not initialized")
             return False
-            
+        
         try:
-            # Send SMS command
-            self.send_at_command(f"AT+CMGS=\"{phone_number}\"", 1)
-            
-            # Send message content
-            self.serial_port.write(message.encode())
-            
-            # Send Ctrl+Z to terminate message
-            self.serial_port.write(b'\x1A')
-            
-            # Wait for response
-            time.sleep(3)
-            
-            response = self.serial_port.read_all().decode('utf-8', errors='ignore')
-            if "OK" in response or "+CMGS" in response:
+            # Wait for the '>' prompt, then send the text terminated by Ctrl+Z
+            response = self.engine.command(f"AT+CMGS=\"{phone_number}\"", prompt=True)
+            if response.final == '>':
+                response = self.engine.command(message, timeout=COMMAND_TIMEOUTS['AT+CMGS'], terminator='\x1A')
+            if response.ok:
                 print(f"SMS sent successfully to {phone_number}")
                 return True
             else:
                 print(f"Failed to send SMS to {phone_number}")
-                print(f"Response: {response}")
+                print(f"Response: {response.text}")
                 return False
-                
+        
         except Exception as e:
             print(f"Error sending SMS: {e}")
             return False
@@ -163,39 +150,38 @@ class SIM7000C:
         Get network signal strength
         Returns: Signal strength in dBm or None if unavailable
         """
-        response = self.send_at_command("AT+CSQ", 1)
-        if "+CSQ:" in response:
-            try:
-                # Parse response like "+CSQ: 15,0"
-                parts = response.split("+CSQ:")[1].split(",")[0].strip()
-                signal = int(parts)
-                # Convert to dBm (approximate)
-                dBm = -113 + (signal * 2)
-                return dBm
-            except:
-                pass
-        return None
+        if not self.engine:
+            return None
+        # Parse response like "+CSQ: 15,0"
+        value = self.engine.command("AT+CSQ").value("+CSQ:")
+        try:
+            signal = int(value.split(",")[0])
+        except (AttributeError, ValueError):
+            return None
+        # 99 means not known or not detectable
+        if signal == 99:
+            return None
+        # Convert to dBm (approximate)
+        return -113 + (signal * 2)
     
     def get_gps_location(self) -> Optional[tuple]:
         """
         Get GPS location from SIM7000C module
         Returns: (latitude, longitude) or None if unavailable
         """
+        if not self.engine:
+            return None
         try:
             # Enable GPS
-            self.send_at_command("AT+CGNSPWR=1", 1)
-            
+            self.engine.command("AT+CGNSPWR=1")
+        
             # Get GPS info
-            response = self.send_at_command("AT+CGNSINF", 2)
-            
-            if "+CGNSINF:" in response:
-                # Parse GPS response
-                # Format: +CGNSINF: <type>,<fix>,<lat>,<lon>,<alt>,...
-                parts = response.split("+CGNSINF:")[1].split("\n")[0].split(",")
-                if len(parts) > 4 and parts[1] == "1":  # Fix valid
-                    lat = float(parts[2]) if parts[2] else 0.0
-                    lon = float(parts[3]) if parts[3] else 0.0
-                    return (lat, lon)
+            # Format: +CGNSINF: <run>,<fix>,<utc>,<lat>,<lon>,<alt>,...
+            value = self.engine.command("AT+CGNSINF").value("+CGNSINF:")
+            if value:
+                parts = value.split(",")
+                if len(parts) > 4 and parts[1] == "1" and parts[3] and parts[4]:  # Fix valid
+                    return (float(parts[3]), float(parts[4]))
         except Exception as e:
             print(f"Error getting GPS location: {e}")
         
@@ -0,0 +1,77 @@
+"""
+Measure SIM7000C command latency against a fake modem that answers every
+command after --delay seconds.
+
+    python benchmarks/bench_at_engine.py --delay 0.05
+    python benchmarks/bench_at_engine.py --fixed-wait   # also time the old driver (~30 s)
+
+engine      ATEngine: returns on the final result code
+fixed-wait  the previous send_at_command: sleep wait_time, then poll for 2 s
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert.at_engine import ATEngine
+from tests.fake_modem import FakeModem
+
+# initialize_module, get_signal_strength, then an SMS
+SEQUENCE = ['AT', 'ATE0', 'AT+CMGF=1', 'AT+CSCS="GSM"', 'AT+CNMI=1,2,0,0,0', 'AT+CPIN?', 'AT+CREG?',
+            'AT+CSQ', 'AT+CMGS="+15551234"', 'SMS']
+
+def run_engine(modem):
+    engine = ATEngine(modem)
+    timings = []
+    for command in SEQUENCE:
+        if command == 'SMS':
+            response = engine.command("EMERGENCY: Car accident detected!", terminator='\x1A')
+        else:
+            response = engine.command(command, prompt=command.startswith('AT+CMGS'))
+        timings.append(response.elapsed)
+    return timings
+
+def fixed_wait_command(port, command, wait_time=1.0):
+    # The old driver: sleep, then poll the port for a fixed two seconds
+    port.write((command + '\r\n').encode())
+    time.sleep(wait_time)
+    response = b''
+    started = time.time()
+    while time.time() - started < 2.0:
+        if port.any():
+            response += port.read(port.any())
+        time.sleep(0.1)
+    return response
+
+def run_fixed_wait(modem):
+    timings = []
+    for command in SEQUENCE:
+        started = time.monotonic()
+        if command == 'SMS':
+            modem.write(b"EMERGENCY: Car accident detected!\x1a")
+            time.sleep(3)
+            modem.read(modem.any())
+        else:
+            fixed_wait_command(modem, command)
+        timings.append(time.monotonic() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.05, help="modem reply delay in seconds")
+    parser.add_argument("--fixed-wait", action="store_true")
+    args = parser.parse_args()
+
+    results = {'engine': run_engine(FakeModem(delay=args.delay))}
+    if args.fixed_wait:
+        results['fixed-wait'] = run_fixed_wait(FakeModem(delay=args.delay))
+
+    print(f"{'command':24s}" + "".join(f"{name:>12s}" for name in results))
+    for index, command in enumerate(SEQUENCE):
+        print(f"{command:24s}" + "".join(f"{timings[index] * 1000:10.1f}ms" for timings in results.values()))
+    print(f"{'total':24s}" + "".join(f"{sum(timings):11.2f}s" for timings in results.values()))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
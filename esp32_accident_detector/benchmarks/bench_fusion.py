@@ -0,0 +1,92 @@
+"""
+Compare the array-backed SensorFusion buffer with the previous dict-per-sample
+buffer: per-sample cost of add_sensor_data + get_processed_window, bytes
+allocated per sample, and memory held by a full buffer.
+
+    python benchmarks/bench_fusion.py --samples 20000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from sensors.fusion import SensorFusion
+
+class DictSensorFusion:
+    """
+    The previous buffer: one dict per sample, list.pop(0) eviction and six
+    list comprehensions per window
+    """
+
+    def __init__(self):
+        config = Config()
+        self.window_size = config.WINDOW_SIZE
+        self.features = config.FEATURES
+        self.accel_range = float(config.ACCELEROMETER_RANGE)
+        self.gyro_range = float(config.GYROSCOPE_RANGE)
+        self.data_buffer = []
+
+    def add_sensor_data(self, accel_data, gyro_data, timestamp=None):
+        self.data_buffer.append({
+            'timestamp': time.time() if timestamp is None else timestamp,
+            'accel_x': accel_data[0], 'accel_y': accel_data[1], 'accel_z': accel_data[2],
+            'gyro_x': gyro_data[0], 'gyro_y': gyro_data[1], 'gyro_z': gyro_data[2],
+        })
+        if len(self.data_buffer) > self.window_size:
+            self.data_buffer.pop(0)
+
+    def get_processed_window(self):
+        if len(self.data_buffer) < self.window_size:
+            return None
+        window = self.data_buffer[-self.window_size:]
+        columns = []
+        for field, limit in (('accel_x', self.accel_range), ('accel_y', self.accel_range), ('accel_z', self.accel_range),
+                             ('gyro_x', self.gyro_range), ('gyro_y', self.gyro_range), ('gyro_z', self.gyro_range)):
+            values = np.array([entry[field] for entry in window])
+            columns.append(np.clip(values, -limit, limit) / limit)
+        return np.stack(columns, axis=1).reshape(1, self.window_size, self.features)
+
+def run(fusion_class, samples):
+    fusion = fusion_class()
+    started = time.perf_counter()
+    for index, sample in enumerate(samples):
+        fusion.add_sensor_data(sample[:3], sample[3:], timestamp=index)
+        fusion.get_processed_window()
+    per_sample = (time.perf_counter() - started) / len(samples)
+
+    # Allocation churn in steady state and memory held by the full buffer
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for index, sample in enumerate(samples[:1000]):
+        fusion.add_sensor_data(sample[:3], sample[3:], timestamp=index)
+        fusion.get_processed_window()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    held = fusion_class()
+    for index, sample in enumerate(samples[:held.window_size]):
+        held.add_sensor_data(sample[:3], sample[3:], timestamp=index)
+    resident, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_sample, peak - before, resident
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = [tuple(sample) for sample in rng.uniform(-4, 4, (args.samples, 6)).tolist()]
+    for name, fusion_class in (("dict", DictSensorFusion), ("array", SensorFusion)):
+        per_sample, peak, resident = run(fusion_class, samples)
+        print(f"{name:6} {per_sample * 1e6:8.1f} us/sample  peak transient {peak / 1024:7.1f} KiB  buffer {resident / 1024:7.1f} KiB")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Compare per-sample windowed LSTM inference with streaming inference on the
+lightweight model architecture (untrained weights; only cost is measured).
+
+    python benchmarks/bench_streaming.py --samples 2000
+
+windowed   full window through the TFLite model on every sample
+streaming  StreamingAccidentDetector: one timestep per sample plus shadow
+           steps for the periodic resync
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import tensorflow as tf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from ml.streaming import StreamingAccidentDetector
+from ml.streaming_export import export_streaming_model
+
+def make_model(window_size, features, units=(32, 16), batch_size=None):
+    """The create_lightweight_lstm_model layer stack"""
+    layers = [tf.keras.Input(shape=(window_size, features), batch_size=batch_size)]
+    for i, unit_count in enumerate(units):
+        layers.append(tf.keras.layers.LSTM(unit_count, return_sequences=i < len(units) - 1))
+        layers.append(tf.keras.layers.Dropout(0.2))
+    layers += [tf.keras.layers.Dense(8, activation='relu'), tf.keras.layers.Dense(1, activation='sigmoid')]
+    return tf.keras.Sequential(layers)
+
+def windowed_interpreter(model):
+    # A fixed batch of one converts to the fused builtin LSTM op, so no Flex delegate is needed
+    window_size, features = model.input_shape[1:]
+    fixed = make_model(window_size, features, batch_size=1)
+    fixed.set_weights(model.get_weights())
+    converter = tf.lite.TFLiteConverter.from_keras_model(fixed)
+    interpreter = tf.lite.Interpreter(model_content=converter.convert())
+    interpreter.allocate_tensors()
+    return interpreter
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--resync-interval", type=int, default=Config().STREAMING_RESYNC_INTERVAL)
+    args = parser.parse_args()
+
+    config = Config()
+    window = config.WINDOW_SIZE
+    model = make_model(window, config.FEATURES)
+    samples = np.random.default_rng(0).uniform(-1, 1, (args.samples, config.FEATURES)).astype(np.float32)
+
+    interpreter = windowed_interpreter(model)
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+    started = time.perf_counter()
+    for end in range(window, args.samples + 1):
+        interpreter.set_tensor(input_index, samples[None, end - window:end])
+        interpreter.invoke()
+        interpreter.get_tensor(output_index)
+    windowed = (time.perf_counter() - started) / (args.samples - window + 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'stream.tflite')
+        export_streaming_model(model, path)
+        detector = StreamingAccidentDetector(path, window_size=window, resync_interval=args.resync_interval)
+        started = time.perf_counter()
+        for sample in samples:
+            detector.update(sample)
+        streaming = (time.perf_counter() - started) / args.samples
+
+    print(f"windowed  {windowed * 1e6:8.1f} us/sample  ({window} timesteps)")
+    print(f"streaming {streaming * 1e6:8.1f} us/sample  ({detector.steps / args.samples:.2f} timesteps, "
+          f"resync every {detector.resync_interval} samples)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 
 @dataclass
 class Config:
@@ -12,11 +12,24 @@ class Config:
     # Data preprocessing
     WINDOW_SIZE: int = 50         # 1 second of data at 50Hz
     FEATURES: int = 6             # accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z
+    STATS_RECOMPUTE_INTERVAL: int = 1000  # Samples between exact recomputes of running window sums
     
     # Model configuration
     MODEL_PATH: str = "models/accident_model.tflite"
     CONFIDENCE_THRESHOLD: float = 0.7
     
+    # Inference scheduling
+    INFERENCE_HOP_SIZE: int = 10          # Run the model every 10 samples (5 Hz) on quiet driving
+    GATE_ACCEL_DEVIATION: float = 1.5     # g away from 1 g (|accel|) that forces inference
+    GATE_JERK: float = 50.0               # g/s change of |accel| that forces inference
+    GATE_GYRO_RATE: float = 100.0         # deg/s on any axis that forces inference
+    GATE_HOLD_SAMPLES: int = 50           # Keep inferring every sample this long after a trigger
+    
+    # Streaming inference (single-step LSTM with state kept between samples)
+    USE_STREAMING_INFERENCE: bool = False
+    STREAMING_MODEL_PATH: str = "models/accident_model_stream.tflite"
+    STREAMING_RESYNC_INTERVAL: int = 100  # Samples between exact resyncs to the windowed state
+    
     # Alert configuration
     ALERT_DELAY: int = 15         # 15 seconds delay before sending alert
     PHONE_NUMBER: str = "+1234567890"  # Emergency contact
@@ -27,6 +40,7 @@ class Config:
     LED_PIN: int = 2              # GPIO pin for status LED (built-in LED on most ESP32 boards)
     MPU6050_SDA_PIN: int = 21     # I2C SDA pin for MPU6050
     MPU6050_SCL_PIN: int = 22     # I2C SCL pin for MPU6050
+    MPU6050_INT_PIN: Optional[int] = None  # Pin wired to MPU6050 INT; None paces sampling on deadlines
     SIM7000C_RX_PIN: int = 16     # UART RX pin for SIM7000C
     SIM7000C_TX_PIN: int = 17     # UART TX pin for SIM7000C
     
@@ -37,6 +51,7 @@ class Config:
     # SIM7000C configuration
     SERIAL_PORT: str = "/dev/uart/1"  # ESP32 UART1
     BAUD_RATE: int = 115200
+    AT_COMMAND_TIMEOUT: float = 5.0  # Seconds to wait for a final result code (long commands have their own)
     
     @classmethod
     def from_env(cls):
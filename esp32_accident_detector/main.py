@@ -5,7 +5,10 @@ import numpy as np
 
 from config import Config
 from sensors.fusion import SensorFusion
+from sensors.sample_clock import SampleClock
 from ml.inference import AccidentDetector
+from ml.scheduler import InferenceScheduler
+from ml.streaming import StreamingAccidentDetector
 from alert.sim7000c import SIM7000C, MockSIM700C
 
 # For ESP32, we would use machine module instead of GPIO
@@ -72,7 +75,10 @@ class ESP32CarAccidentDetector:
         
         # Initialize components
         self.sensor_fusion = SensorFusion()
+        self.sample_clock = SampleClock()
         self.detector = AccidentDetector()
+        self.scheduler = InferenceScheduler()
+        self.streaming = self.setup_streaming()
         
         # Use mock or real SIM7000C
         if use_mock:
@@ -89,6 +95,16 @@ class ESP32CarAccidentDetector:
         # Initialize communications
         self.initialize_communications()
     
+    def setup_streaming(self) -> Optional[StreamingAccidentDetector]:
+        """Load the single-step model when streaming inference is enabled"""
+        if not self.config.USE_STREAMING_INFERENCE:
+            return None
+        streaming = StreamingAccidentDetector()
+        if streaming.interpreter is None:
+            print("Falling back to windowed inference")
+            return None
+        return streaming
+    
     def setup_gpio(self):
         """Setup GPIO pins"""
         GPIO.setmode(GPIO.BCM)
@@ -230,35 +246,52 @@ class ESP32CarAccidentDetector:
         print("Press Ctrl+C to stop")
         
         try:
+            self.sample_clock.reset()
             while self.system_active:
+                # Wait for the next sample deadline
+                timestamp = self.sample_clock.wait()
+                
                 # Simulate reading sensor data
                 # In real implementation, this would read from MPU6050
                 accel_data, gyro_data = self.simulate_sensor_data()
                 
                 # Add to sensor fusion buffer
-                self.sensor_fusion.add_sensor_data(accel_data, gyro_data)
+                self.sensor_fusion.add_sensor_data(accel_data, gyro_data, timestamp)
                 
                 # Update GPS periodically
                 self.update_gps()
                 
-                # Get processed data window
-                processed_data = self.sensor_fusion.get_processed_window()
-                
-                # Run inference if we have enough data
-                if processed_data is not None:
-                    is_accident, confidence = self.detector.predict(processed_data)
+                is_accident, confidence = False, 0.0
+                if self.streaming is not None:
+                    # One LSTM timestep on the newest normalized sample
+                    is_accident, confidence = self.streaming.predict_sample(self.sensor_fusion.get_latest_normalized())
+                elif self.scheduler.should_infer(accel_data, gyro_data):
+                    # Run the model every hop, or every sample while the gate is open
+                    processed_data = self.sensor_fusion.get_processed_window()
                     
-                    if is_accident and not self.accident_detected:
-                        print(f"Accident detected! Confidence: {confidence:.3f}")
-                        self.accident_detected = True
-                        self.start_alert_timer()
+                    # Run inference if we have enough data
+                    if processed_data is not None:
+                        is_accident, confidence = self.detector.predict(processed_data)
                 
-                # Small delay to control sampling rate
-                time.sleep(1.0 / self.config.SAMPLING_RATE)
+                if is_accident and not self.accident_detected:
+                    print(f"Accident detected! Confidence: {confidence:.3f}")
+                    self.accident_detected = True
+                    self.start_alert_timer()
                 
         except KeyboardInterrupt:
             print("\nStopping detection system...")
             self.system_active = False
+            if self.streaming is not None:
+                # The scheduler is bypassed in streaming mode
+                print(f"Streaming model ran {self.streaming.steps} steps on {self.streaming.samples} samples "
+                      f"({self.streaming.resyncs} resyncs)")
+            else:
+                metrics = self.scheduler.get_metrics()
+                print(f"Model ran {metrics['inferences']} times on {metrics['samples']} samples "
+                      f"({metrics['inferences_per_second']:.1f}/s, {metrics['gated_inferences']} forced by the gate)")
+            pacing = self.sample_clock.get_metrics()
+            print(f"Sampled at {pacing['observed_rate']:.2f} Hz (target {pacing['target_rate']} Hz), "
+                  f"{pacing['missed_deadlines']} missed deadlines, {pacing['interval_jitter_ms']:.2f} ms jitter")
     
     def run(self):
         """Main application entry point"""
@@ -319,9 +352,9 @@ class ESP32CarAccidentDetector:
     
     def read_sensors(self):
         # Read from MPU6050
-        accel = self.mpu6050.get_acceleration()
-        gyro = self.mpu6050.get_gyroscope()
-        return accel, gyro
+        # One burst read for accel and gyro
+        sample = self.mpu6050.get_sensor_data()
+        return sample[:3], sample[3:]
 """
 
 if __name__ == "__main__":
@@ -24,7 +24,9 @@ try:
     from config import Config
     from sensors.mpu6050_esp32 import MPU6050_ESP32
     from sensors.fusion import SensorFusion
+    from sensors.sample_clock import SampleClock
     from ml.inference import AccidentDetector
+    from ml.scheduler import InferenceScheduler
     # Note: SIM7000C implementation would need to be adapted for MicroPython
     # from alert.sim7000c_esp32 import SIM7000C_ESP32
 except ImportError as e:
@@ -84,6 +86,18 @@ class ESP32CarAccidentDetector:
             self.mpu6050 = None
         
         self.sensor_fusion = SensorFusion()
+        self.scheduler = InferenceScheduler()
+        self.sample_clock = self.setup_sample_clock()
+    
+    def setup_sample_clock(self):
+        """Pace sampling on the MPU6050 data-ready interrupt if wired, else on deadlines"""
+        if self.config.MPU6050_INT_PIN is None or self.mpu6050 is None:
+            return SampleClock()
+        sample_clock = SampleClock(interrupt=True)
+        self.mpu6050.enable_data_ready_interrupt(self.config.SAMPLING_RATE)
+        self.mpu_int = Pin(self.config.MPU6050_INT_PIN, Pin.IN)
+        self.mpu_int.irq(trigger=Pin.IRQ_RISING, handler=sample_clock.data_ready)
+        return sample_clock
     
     def setup_ml(self):
         """Setup ML inference"""
@@ -120,9 +134,9 @@ class ESP32CarAccidentDetector:
             return accel, gyro
         
         try:
-            accel = self.mpu6050.get_acceleration()
-            gyro = self.mpu6050.get_gyroscope()
-            return accel, gyro
+            # One burst read for accel and gyro
+            sample = self.mpu6050.get_sensor_data()
+            return sample[:3], sample[3:]
         except Exception as e:
             print(f"Sensor read error: {e}")
             return (0, 0, 0), (0, 0, 0)
@@ -165,36 +179,35 @@ class ESP32CarAccidentDetector:
         print("Starting detection loop...")
         print("Press button to stop")
         
-        sample_period_ms = int(1000 / self.config.SAMPLING_RATE)
-        last_sample = time.ticks_ms()
+        gc_every = 5 * self.config.SAMPLING_RATE
+        self.sample_clock.reset()
         
         while self.system_active:
-            # Check if it's time for next sample
-            now = time.ticks_ms()
-            if time.ticks_diff(now, last_sample) >= sample_period_ms:
-                last_sample = now
-                
-                # Read sensors
-                accel_data, gyro_data = self.read_sensors()
-                
-                # Add to fusion buffer
-                self.sensor_fusion.add_sensor_data(accel_data, gyro_data)
-                
-                # Get processed data
-                processed_data = self.sensor_fusion.get_processed_window()
-                
-                # Run inference
-                if processed_data is not None and self.detector is not None:
-                    is_accident, confidence = self.detector.predict(processed_data)
-                    
-                    if is_accident and not self.accident_detected:
-                        print(f"Accident detected! Confidence: {confidence:.3f}")
-                        self.accident_detected = True
-                        self.start_alert_timer()
+            # Wait for the next sample deadline (or data-ready interrupt)
+            timestamp = self.sample_clock.wait()
+            
+            # Read sensors
+            accel_data, gyro_data = self.read_sensors()
+            
+            # Add to fusion buffer
+            self.sensor_fusion.add_sensor_data(accel_data, gyro_data, timestamp)
+            
+            # Get processed data, every hop or every sample while the gate is open
+            run_model = self.scheduler.should_infer(accel_data, gyro_data)
+            processed_data = self.sensor_fusion.get_processed_window() if run_model else None
+            
+            # Run inference
+            if processed_data is not None and self.detector is not None:
+                is_accident, confidence = self.detector.predict(processed_data)
                 
-                # Periodic cleanup
-                if time.ticks_diff(now, last_sample) % 5000 < sample_period_ms:  # Every 5 seconds
-                    gc.collect()  # Run garbage collection
+                if is_accident and not self.accident_detected:
+                    print(f"Accident detected! Confidence: {confidence:.3f}")
+                    self.accident_detected = True
+                    self.start_alert_timer()
+            
+            # Periodic cleanup
+            if self.sample_clock.samples % gc_every == 0:  # Every 5 seconds
+                gc.collect()  # Run garbage collection
     
     def stop(self):
         """Stop the system"""
@@ -202,6 +215,9 @@ class ESP32CarAccidentDetector:
         if self.alert_timer is not None:
             self.alert_timer.deinit()
         self.led.off()
+        pacing = self.sample_clock.get_metrics()
+        print(f"Sampled at {pacing['observed_rate']:.2f} Hz, {pacing['missed_deadlines']} missed deadlines, "
+              f"{pacing['interval_jitter_ms']:.2f} ms jitter")
         print("System stopped")
 
 # Global instance
@@ -0,0 +1,90 @@
+import math
+from typing import Optional, Sequence
+from config import Config
+
+class InferenceScheduler:
+    """
+    Decide per sample whether to run the model.
+    
+    On quiet driving the model runs every hop_size samples. A cheap gate on
+    the raw sample (|accel| far from 1 g, a jerk in |accel|, or a fast
+    rotation) forces inference on every sample from the trigger until
+    hold_samples quiet samples later, so an impact is never waiting for the
+    next hop.
+    """
+    
+    def __init__(self, hop_size: Optional[int] = None,
+                 accel_deviation: Optional[float] = None,
+                 jerk: Optional[float] = None,
+                 gyro_rate: Optional[float] = None,
+                 hold_samples: Optional[int] = None):
+        self.config = Config()
+        self.hop_size = max(1, hop_size or self.config.INFERENCE_HOP_SIZE)
+        self.accel_deviation = accel_deviation if accel_deviation is not None else self.config.GATE_ACCEL_DEVIATION
+        self.gyro_rate = gyro_rate if gyro_rate is not None else self.config.GATE_GYRO_RATE
+        self.hold_samples = hold_samples if hold_samples is not None else self.config.GATE_HOLD_SAMPLES
+        # Jerk threshold per sample interval, in g
+        self.jerk_step = (jerk if jerk is not None else self.config.GATE_JERK) / self.config.SAMPLING_RATE
+        self.reset()
+    
+    def reset(self):
+        self._previous_magnitude = None
+        self._since_inference = 0
+        self._hold = 0
+        self.samples = 0
+        self.inferences = 0
+        self.gated_inferences = 0
+        self.triggers = 0
+    
+    def is_anomalous(self, accel: Sequence[float], gyro: Sequence[float]) -> bool:
+        """
+        Gate check on one raw sample (accel in g, gyro in deg/s)
+        """
+        magnitude = math.sqrt(accel[0] * accel[0] + accel[1] * accel[1] + accel[2] * accel[2])
+        previous = self._previous_magnitude
+        self._previous_magnitude = magnitude
+        if abs(magnitude - 1.0) > self.accel_deviation:
+            return True
+        if previous is not None and abs(magnitude - previous) > self.jerk_step:
+            return True
+        return max(abs(gyro[0]), abs(gyro[1]), abs(gyro[2])) > self.gyro_rate
+    
+    def should_infer(self, accel: Sequence[float], gyro: Sequence[float]) -> bool:
+        """
+        Feed one sample; True when the model should run on the current window.
+        Call once per sample, whether or not the window is full yet.
+        """
+        self.samples += 1
+        self._since_inference += 1
+        if self.is_anomalous(accel, gyro):
+            if not self._hold:
+                self.triggers += 1
+            self._hold = self.hold_samples + 1
+        
+        if self._hold:
+            self._hold -= 1
+            gated = self._since_inference < self.hop_size
+        elif self._since_inference >= self.hop_size:
+            gated = False
+        else:
+            return False
+        
+        self._since_inference = 0
+        self.inferences += 1
+        if gated:
+            self.gated_inferences += 1
+        return True
+    
+    def get_metrics(self) -> dict:
+        """
+        Invocation counts and rate (model runs per second of sensor data)
+        """
+        seconds = self.samples / self.config.SAMPLING_RATE
+        return {
+            'samples': self.samples,
+            'inferences': self.inferences,
+            'gated_inferences': self.gated_inferences,
+            'triggers': self.triggers,
+            'inferences_per_second': self.inferences / seconds if seconds else 0.0,
+            'inference_fraction': self.inferences / self.samples if self.samples else 0.0,
+        }
\ No newline at end of file
@@ -0,0 +1,114 @@
+import numpy as np
+import tensorflow as tf
+from typing import Optional, Sequence, Tuple
+from config import Config
+
+class StreamingAccidentDetector:
+    """
+    Streaming LSTM inference: one timestep per new sample on a single-step
+    model exported by streaming_export.export_streaming_model, with the
+    hidden and cell state kept between samples.
+    
+    A persistent state remembers more than one window, so it drifts from
+    what windowed inference would report. To resync, a second (shadow) state
+    is started from zero window_size samples before every resync point; at
+    the resync it has seen exactly the last window and replaces the primary
+    state, so the output there equals windowed inference. Cost is one step
+    per sample plus window_size shadow steps every resync_interval samples.
+    """
+    
+    def __init__(self, model_path: Optional[str] = None,
+                 window_size: Optional[int] = None,
+                 resync_interval: Optional[int] = None):
+        self.config = Config()
+        self.model_path = model_path or self.config.STREAMING_MODEL_PATH
+        self.window_size = window_size or self.config.WINDOW_SIZE
+        # Shorter intervals would need overlapping shadow states
+        self.resync_interval = max(resync_interval or self.config.STREAMING_RESYNC_INTERVAL, self.window_size)
+        self.interpreter = None
+        self.load_model()
+        self.reset()
+    
+    def load_model(self):
+        """
+        Load the single-step TensorFlow Lite model
+        """
+        try:
+            self.interpreter = tf.lite.Interpreter(model_path=self.model_path)
+            self.interpreter.allocate_tensors()
+            runner = self.interpreter.get_signature_runner()
+            inputs = runner.get_input_details()
+            outputs = runner.get_output_details()
+            
+            self._sample_input = inputs.pop('sample')['index']
+            # States are h0, c0, h1, c1, ... in inputs and output_1.. in outputs
+            names = sorted(inputs, key=lambda name: (int(name[1:]), name != 'h' + name[1:]))
+            self._state_inputs = [inputs[name]['index'] for name in names]
+            self._state_shapes = [tuple(inputs[name]['shape']) for name in names]
+            self._confidence_output = outputs['output_0']['index']
+            self._state_outputs = [outputs[f'output_{i + 1}']['index'] for i in range(len(names))]
+            print(f"Streaming model loaded from {self.model_path} ({len(names) // 2} LSTM layers)")
+        except Exception as e:
+            print(f"Failed to load streaming model: {e}")
+            self.interpreter = None
+    
+    def reset(self):
+        """
+        Forget all state; the next window_size samples warm it up again
+        """
+        self._primary = self._zero_state() if self.interpreter is not None else None
+        self._shadow = None
+        self.samples = 0
+        self.steps = 0
+        self.resyncs = 0
+    
+    def _zero_state(self):
+        return [np.zeros(shape, dtype=np.float32) for shape in self._state_shapes]
+    
+    def _step(self, sample: np.ndarray, state):
+        interpreter = self.interpreter
+        interpreter.set_tensor(self._sample_input, sample)
+        for index, value in zip(self._state_inputs, state):
+            interpreter.set_tensor(index, value)
+        interpreter.invoke()
+        self.steps += 1
+        confidence = float(interpreter.get_tensor(self._confidence_output)[0][0])
+        return confidence, [interpreter.get_tensor(index) for index in self._state_outputs]
+    
+    def update(self, sample: Sequence[float]) -> Optional[float]:
+        """
+        Feed one normalized sample (as written by the preprocessor)
+        Returns: accident confidence, or None until a full window has been seen
+        """
+        if self.interpreter is None:
+            return None
+        self.samples += 1
+        sample = np.asarray(sample, dtype=np.float32).reshape(1, 1, -1)
+        window = self.window_size
+        phase = (self.samples - window) % self.resync_interval
+        
+        if self.samples > window and phase == (self.resync_interval - window + 1) % self.resync_interval:
+            self._shadow = self._zero_state()
+        
+        confidence, self._primary = self._step(sample, self._primary)
+        if self._shadow is not None:
+            shadow_confidence, self._shadow = self._step(sample, self._shadow)
+            if phase == 0:
+                # The shadow has seen exactly the last window_size samples
+                self._primary, self._shadow = self._shadow, None
+                confidence = shadow_confidence
+                self.resyncs += 1
+        
+        if self.samples < window:
+            return None
+        return confidence
+    
+    def predict_sample(self, sample: Sequence[float]) -> Tuple[bool, float]:
+        """
+        Feed one normalized sample
+        Returns: (is_accident, confidence)
+        """
+        confidence = self.update(sample)
+        if confidence is None:
+            return False, 0.0
+        return confidence > self.config.CONFIDENCE_THRESHOLD, confidence
\ No newline at end of file
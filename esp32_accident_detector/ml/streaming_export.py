@@ -0,0 +1,62 @@
+import tensorflow as tf
+
+STEP_SAMPLE_INPUT = 'sample'
+
+def state_names(layer_number: int):
+    """
+    Input names of the hidden and cell state of the n-th LSTM layer
+    """
+    return f'h{layer_number}', f'c{layer_number}'
+
+def build_step_model(model: tf.keras.Model) -> tf.keras.Model:
+    """
+    Single-timestep copy of a Sequential LSTM model with explicit state.
+    
+    Inputs: sample (1, 1, features) and h<n>, c<n> (1, units) per LSTM layer.
+    Outputs: [confidence, h0, c0, h1, c1, ...]. Weights are shared with the
+    trained model; Dropout is dropped as at inference.
+    """
+    features = model.input_shape[-1]
+    sample = tf.keras.Input(shape=(1, features), batch_size=1, name=STEP_SAMPLE_INPUT)
+    state_inputs = []
+    state_outputs = []
+    outputs = sample
+    
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.Dropout):
+            continue
+        config = layer.get_config()
+        config['name'] = f"{layer.name}_step"
+        if isinstance(layer, tf.keras.layers.LSTM):
+            h_name, c_name = state_names(len(state_inputs) // 2)
+            h = tf.keras.Input(shape=(layer.units,), batch_size=1, name=h_name)
+            c = tf.keras.Input(shape=(layer.units,), batch_size=1, name=c_name)
+            config.update(return_sequences=False, return_state=True, stateful=False)
+            step = tf.keras.layers.LSTM.from_config(config)
+            if len(outputs.shape) == 2:
+                # Output of the previous LSTM step as a one-step sequence
+                outputs = tf.keras.layers.Reshape((1, outputs.shape[-1]))(outputs)
+            outputs, h_out, c_out = step(outputs, initial_state=[h, c])
+            state_inputs += [h, c]
+            state_outputs += [h_out, c_out]
+        elif isinstance(layer, tf.keras.layers.Dense):
+            step = tf.keras.layers.Dense.from_config(config)
+            outputs = step(outputs)
+        else:
+            raise ValueError(f"Cannot stream layer {layer.name} ({type(layer).__name__}); only LSTM, Dropout and Dense are supported")
+        step.set_weights(layer.get_weights())
+    
+    if not state_inputs:
+        raise ValueError("Model has no LSTM layers to stream")
+    return tf.keras.Model([sample] + state_inputs, [outputs] + state_outputs)
+
+def export_streaming_model(model: tf.keras.Model, tflite_path: str) -> int:
+    """
+    Convert the single-step model to TensorFlow Lite
+    Returns: size of the written model in bytes
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(build_step_model(model))
+    tflite_model = converter.convert()
+    with open(tflite_path, 'wb') as f:
+        f.write(tflite_model)
+    return len(tflite_model)
\ No newline at end of file
@@ -9,6 +9,7 @@ from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
 import argparse
 import os
+from streaming_export import export_streaming_model
 
 def load_and_preprocess_data(data_path: str, sequence_length: int = 50):
     """
@@ -165,6 +166,15 @@ def train_model(data_path: str, model_save_path: str = 'accident_model.h5',
         print("Model saved as Keras model only")
         print(f"Model saved as {model_save_path}")
     
+    # Single-step model with explicit LSTM state for streaming inference;
+    # one timestep needs no tensor-list ops, so plain builtins suffice
+    stream_path = model_save_path.replace('.h5', '_stream.tflite')
+    try:
+        size = export_streaming_model(model, stream_path)
+        print(f"Streaming TensorFlow Lite model saved as {stream_path} ({size / 1024:.1f} KB)")
+    except Exception as e:
+        print(f"Failed to export streaming model: {e}")
+    
     return model, history
 
 def generate_sample_data(filename: str = 'sample_data.csv', samples: int = 10000):
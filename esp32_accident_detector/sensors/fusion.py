@@ -1,7 +1,17 @@
+import math
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 import time
 from config import Config
+from sensors.window_stats import SlidingWindowStats
+
+# Column order of the sample buffers
+SAMPLE_FIELDS = ('accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z')
+
+# Channels of the running window statistics: the six axes, then |accel|
+ACCEL_CHANNELS = (0, 1, 2)
+GYRO_CHANNELS = (3, 4, 5)
+MAGNITUDE_CHANNEL = 6
 
 class SensorFusion:
     """
@@ -13,7 +23,6 @@ class SensorFusion:
         self.config = Config()
         self.window_size = self.config.WINDOW_SIZE
         self.features = self.config.FEATURES
-        self.data_buffer = []
         self.gps_buffer = []
         
         # Pre-allocate arrays for efficiency
@@ -23,6 +32,22 @@ class SensorFusion:
         # Normalization factors
         self.accel_norm_factor = 1.0 / self.accel_range
         self.gyro_norm_factor = 1.0 / self.gyro_range
+        self._limits = np.array([self.accel_range] * 3 + [self.gyro_range] * 3, dtype=np.float32)
+        self._factors = np.array([self.accel_norm_factor] * 3 + [self.gyro_norm_factor] * 3, dtype=np.float32)
+        
+        # Mirrored rings: sample n is written at row n % window_size and again
+        # window_size rows later, so the latest window is always one
+        # contiguous slice. Appending and evicting are a pair of row writes.
+        rows = 2 * self.window_size
+        self._raw = np.zeros((rows, 6), dtype=np.float32)
+        self._normalized = np.zeros((rows, 6), dtype=np.float32)
+        self._timestamps = np.zeros(rows, dtype=np.float64)
+        self._count = 0
+        
+        # Running statistics of the same window, kept current per sample
+        self.window_stats = SlidingWindowStats(
+            self.window_size, 7, recompute_every=self.config.STATS_RECOMPUTE_INTERVAL
+        )
         
     def add_sensor_data(self, accel_data: Tuple[float, float, float], 
                        gyro_data: Tuple[float, float, float],
@@ -35,22 +60,49 @@ class SensorFusion:
         """
         if timestamp is None:
             timestamp = time.time()
-            
-        sensor_entry = {
-            'timestamp': timestamp,
-            'accel_x': accel_data[0],
-            'accel_y': accel_data[1],
-            'accel_z': accel_data[2],
-            'gyro_x': gyro_data[0],
-            'gyro_y': gyro_data[1],
-            'gyro_z': gyro_data[2]
-        }
         
-        self.data_buffer.append(sensor_entry)
+        slot = self._count % self.window_size
+        mirror = slot + self.window_size
+        raw = self._raw[slot]
+        raw[:3] = accel_data
+        raw[3:] = gyro_data
+        self._raw[mirror] = raw
+        
+        # Normalized once per sample rather than over the whole window per read
+        normalized = self._normalized[slot]
+        np.clip(raw, -self._limits, self._limits, out=normalized)
+        normalized *= self._factors
+        self._normalized[mirror] = normalized
+        
+        self._timestamps[slot] = self._timestamps[mirror] = timestamp
+        self._count += 1
         
-        # Keep only the last window_size samples for memory efficiency
-        if len(self.data_buffer) > self.window_size:
-            self.data_buffer.pop(0)
+        # Stored (float32) values, so the stats describe the buffered window
+        ax, ay, az, gx, gy, gz = raw.tolist()
+        self.window_stats.update((ax, ay, az, gx, gy, gz, math.sqrt(ax * ax + ay * ay + az * az)))
+    
+    def _recent(self, ring: np.ndarray) -> np.ndarray:
+        """
+        View of the buffered rows of a ring, oldest first
+        """
+        available = min(self._count, self.window_size)
+        end = self._count % self.window_size + self.window_size
+        return ring[end - available:end]
+    
+    @property
+    def data_buffer(self) -> List[dict]:
+        """
+        Buffered samples as dicts (built on demand, for inspection)
+        """
+        return self._as_entries(self._recent(self._raw), self._recent(self._timestamps))
+    
+    def _as_entries(self, samples: np.ndarray, timestamps: np.ndarray) -> List[dict]:
+        entries = []
+        for timestamp, sample in zip(timestamps.tolist(), samples.tolist()):
+            entry = {'timestamp': timestamp}
+            entry.update(zip(SAMPLE_FIELDS, sample))
+            entries.append(entry)
+        return entries
     
     def add_gps_data(self, latitude: float, longitude: float, 
                      timestamp: Optional[float] = None):
@@ -89,39 +141,50 @@ class SensorFusion:
         Get current data window
         Returns: List of sensor data entries or None if insufficient data
         """
-        if len(self.data_buffer) < self.window_size:
+        samples = self.get_window_array()
+        if samples is None:
+            return None
+        return self._as_entries(samples, self._recent(self._timestamps))
+    
+    def get_window_array(self) -> Optional[np.ndarray]:
+        """
+        Get current data window without copying
+        Returns: read-only (window_size, 6) float32 view of raw samples or None
+        """
+        if self._count < self.window_size:
             return None
-        return self.data_buffer[-self.window_size:]
+        window = self._recent(self._raw)
+        window.flags.writeable = False
+        return window
+    
+    def get_latest_normalized(self) -> Optional[np.ndarray]:
+        """
+        Newest sample as normalized for the model (view), or None if empty
+        """
+        if not self._count:
+            return None
+        return self._normalized[(self._count - 1) % self.window_size]
+    
+    def _as_array(self, data_window: Union[np.ndarray, List[dict]]) -> np.ndarray:
+        """
+        Samples as a (samples, 6) array; accepts windows from either getter
+        """
+        if isinstance(data_window, np.ndarray):
+            return data_window
+        return np.array([[entry[field] for field in SAMPLE_FIELDS] for entry in data_window], dtype=np.float32)
     
-    def normalize_sensor_data(self, data_window: List[dict]) -> np.ndarray:
+    def normalize_sensor_data(self, data_window: Union[np.ndarray, List[dict]]) -> np.ndarray:
         """
         Normalize sensor data for ML model input
         Optimized for embedded systems with pre-calculated factors
         """
-        # Convert to numpy array for efficient processing
-        accel_x = np.array([entry['accel_x'] for entry in data_window])
-        accel_y = np.array([entry['accel_y'] for entry in data_window])
-        accel_z = np.array([entry['accel_z'] for entry in data_window])
-        gyro_x = np.array([entry['gyro_x'] for entry in data_window])
-        gyro_y = np.array([entry['gyro_y'] for entry in data_window])
-        gyro_z = np.array([entry['gyro_z'] for entry in data_window])
-        
-        # Clip and normalize acceleration data
-        accel_x = np.clip(accel_x, -self.accel_range, self.accel_range) * self.accel_norm_factor
-        accel_y = np.clip(accel_y, -self.accel_range, self.accel_range) * self.accel_norm_factor
-        accel_z = np.clip(accel_z, -self.accel_range, self.accel_range) * self.accel_norm_factor
-        
-        # Clip and normalize gyroscope data
-        gyro_x = np.clip(gyro_x, -self.gyro_range, self.gyro_range) * self.gyro_norm_factor
-        gyro_y = np.clip(gyro_y, -self.gyro_range, self.gyro_range) * self.gyro_norm_factor
-        gyro_z = np.clip(gyro_z, -self.gyro_range, self.gyro_range) * self.gyro_norm_factor
-        
-        # Stack into final array (samples, features)
-        normalized_data = np.stack([accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z], axis=1)
-        
+        samples = self._as_array(data_window)
+        # Clip and scale all six axes in one pass (samples, features)
+        normalized_data = np.clip(samples, -self._limits, self._limits)
+        normalized_data *= self._factors
         return normalized_data
     
-    def extract_features(self, data_window: List[dict]) -> Optional[np.ndarray]:
+    def extract_features(self, data_window: Union[np.ndarray, List[dict]]) -> Optional[np.ndarray]:
         """
         Extract features from sensor data window
         Returns: Normalized numpy array of shape (1, window_size, features) or None
@@ -138,13 +201,36 @@ class SensorFusion:
     def get_processed_window(self) -> Optional[np.ndarray]:
         """
         Get fully processed data window ready for model inference
+        Returns: read-only (1, window_size, features) float32 view, valid until the next add_sensor_data
         """
-        window = self.get_data_window()
-        if window is None:
+        if self._count < self.window_size:
             return None
-        return self.extract_features(window)
+        window = self._recent(self._normalized).reshape(1, self.window_size, self.features)
+        window.flags.writeable = False
+        return window
+    
+    def current_stats(self) -> dict:
+        """
+        Statistics of the buffered samples from the running window state
+        Same keys as calculate_sensor_statistics plus the minima; O(1), no window scan
+        """
+        stats = self.window_stats
+        if not len(stats):
+            return {}
+        return {
+            'accel_mean': stats.means(ACCEL_CHANNELS),
+            'accel_std': stats.stds(ACCEL_CHANNELS),
+            'accel_max': stats.maxima(ACCEL_CHANNELS),
+            'accel_min': stats.minima(ACCEL_CHANNELS),
+            'gyro_mean': stats.means(GYRO_CHANNELS),
+            'gyro_std': stats.stds(GYRO_CHANNELS),
+            'gyro_max': stats.maxima(GYRO_CHANNELS),
+            'gyro_min': stats.minima(GYRO_CHANNELS),
+            'magnitude_max': stats.maximum(MAGNITUDE_CHANNEL),
+            'magnitude_mean': stats.mean(MAGNITUDE_CHANNEL),
+        }
     
-    def calculate_sensor_statistics(self, data_window: List[dict]) -> dict:
+    def calculate_sensor_statistics(self, data_window: Union[np.ndarray, List[dict]]) -> dict:
         """
         Calculate statistical features from sensor data for additional context
         """
@@ -152,10 +238,9 @@ class SensorFusion:
             return {}
         
         # Extract data arrays
-        accel_data = np.array([[entry['accel_x'], entry['accel_y'], entry['accel_z']] 
-                              for entry in data_window])
-        gyro_data = np.array([[entry['gyro_x'], entry['gyro_y'], entry['gyro_z']] 
-                             for entry in data_window])
+        samples = self._as_array(data_window)
+        accel_data = samples[:, :3]
+        gyro_data = samples[:, 3:]
         
         # Calculate statistics
         stats = {
@@ -1,5 +1,13 @@
 import time
-from typing import Tuple
+import struct
+from typing import List, Optional, Tuple
+
+def _sleep_ms(ms: int):
+    """time.sleep_ms on MicroPython, time.sleep elsewhere (host tests)"""
+    if hasattr(time, 'sleep_ms'):
+        time.sleep_ms(ms)
+    else:
+        time.sleep(ms / 1000)
 
 class MPU6050_ESP32:
     """
@@ -17,6 +25,33 @@ class MPU6050_ESP32:
     GYRO_ZOUT_H = 0x47
     ACCEL_CONFIG = 0x1C
     GYRO_CONFIG = 0x1B
+    SMPLRT_DIV = 0x19
+    CONFIG = 0x1A
+    FIFO_EN = 0x23
+    INT_PIN_CFG = 0x37
+    INT_ENABLE = 0x38
+    INT_STATUS = 0x3A
+    USER_CTRL = 0x6A
+    FIFO_COUNTH = 0x72
+    FIFO_R_W = 0x74
+    
+    # ACCEL_XOUT_H..GYRO_ZOUT_L: accel x/y/z, temperature, gyro x/y/z
+    BLOCK_SIZE = 14
+    BLOCK_FORMAT = '>7h'
+    
+    # FIFO_EN bits for the accelerometer and all three gyro axes; each FIFO
+    # frame is then accel x/y/z followed by gyro x/y/z
+    FIFO_ACCEL_GYRO = 0x78
+    FIFO_FRAME_SIZE = 12
+    FIFO_FRAME_FORMAT = '>6h'
+    FIFO_SIZE = 1024
+    USER_CTRL_FIFO_EN = 0x40
+    USER_CTRL_FIFO_RESET = 0x04
+    INT_STATUS_FIFO_OFLOW = 0x10
+    INT_ENABLE_DATA_RDY = 0x01
+    # DLPF_CFG = 1 (184 Hz bandwidth) runs the internal sample clock at 1 kHz
+    DLPF_184HZ = 0x01
+    INTERNAL_SAMPLE_RATE = 1000
     
     def __init__(self, i2c_bus, accel_range: int = 2, gyro_range: int = 250):
         """
@@ -28,13 +63,22 @@ class MPU6050_ESP32:
         self.i2c = i2c_bus
         self.accel_range = accel_range
         self.gyro_range = gyro_range
+        # Preallocated so steady-state reads do not allocate transfer buffers
+        self._block = bytearray(self.BLOCK_SIZE)
+        self._count = bytearray(2)
+        self._status = bytearray(1)
+        self._fifo = bytearray(self.FIFO_SIZE)
+        self._fifo_view = memoryview(self._fifo)
+        self.fifo_enabled = False
+        self.fifo_overflows = 0
+        self.temperature = None
         self._initialize()
     
     def _initialize(self):
         """Initialize the MPU6050 sensor"""
         # Wake up the MPU6050
         self.i2c.writeto_mem(self.MPU6050_ADDR, self.PWR_MGMT_1, b'\x00')
-        time.sleep_ms(100)
+        _sleep_ms(100)
         
         # Configure accelerometer range
         accel_range_reg = {
@@ -57,70 +101,158 @@ class MPU6050_ESP32:
         
         self.i2c.writeto_mem(self.MPU6050_ADDR, self.GYRO_CONFIG, 
                             bytes([gyro_range_reg]))
+        
+        # Convert to g and °/s based on range
+        self.accel_divisor = {
+            2: 16384.0,
+            4: 8192.0,
+            8: 4096.0,
+            16: 2048.0
+        }[self.accel_range]
+        self.gyro_divisor = {
+            250: 131.0,
+            500: 65.5,
+            1000: 32.8,
+            2000: 16.4
+        }[self.gyro_range]
+    
+    def _read_block(self) -> Tuple[int, ...]:
+        """
+        Read the accel, temperature and gyro registers in one I2C transaction
+        Returns: raw (accel_x, accel_y, accel_z, temp, gyro_x, gyro_y, gyro_z)
+        """
+        self.i2c.readfrom_mem_into(self.MPU6050_ADDR, self.ACCEL_XOUT_H, self._block)
+        return struct.unpack(self.BLOCK_FORMAT, self._block)
     
-    def _read_word(self, reg: int) -> int:
-        """Read a 16-bit word from the sensor"""
-        data = self.i2c.readfrom_mem(self.MPU6050_ADDR, reg, 2)
-        value = (data[0] << 8) | data[1]
-        # Convert to signed 16-bit integer
-        if value >= 0x8000:
-            value = -((65535 - value) + 1)
-        return value
+    def _write_reg(self, reg: int, value: int):
+        self.i2c.writeto_mem(self.MPU6050_ADDR, reg, bytes([value]))
     
     def get_acceleration(self) -> Tuple[float, float, float]:
         """
         Read acceleration data in g
         Returns: (accel_x, accel_y, accel_z) in g
         """
-        accel_x = self._read_word(self.ACCEL_XOUT_H)
-        accel_y = self._read_word(self.ACCEL_YOUT_H)
-        accel_z = self._read_word(self.ACCEL_ZOUT_H)
-        
-        # Convert to g based on range
-        accel_divisor = {
-            2: 16384.0,
-            4: 8192.0,
-            8: 4096.0,
-            16: 2048.0
-        }[self.accel_range]
-        
-        return (
-            accel_x / accel_divisor,
-            accel_y / accel_divisor,
-            accel_z / accel_divisor
-        )
+        return self.get_sensor_data()[:3]
     
     def get_gyroscope(self) -> Tuple[float, float, float]:
         """
         Read gyroscope data in °/s
         Returns: (gyro_x, gyro_y, gyro_z) in °/s
         """
-        gyro_x = self._read_word(self.GYRO_XOUT_H)
-        gyro_y = self._read_word(self.GYRO_YOUT_H)
-        gyro_z = self._read_word(self.GYRO_ZOUT_H)
-        
-        # Convert to °/s based on range
-        gyro_divisor = {
-            250: 131.0,
-            500: 65.5,
-            1000: 32.8,
-            2000: 16.4
-        }[self.gyro_range]
-        
-        return (
-            gyro_x / gyro_divisor,
-            gyro_y / gyro_divisor,
-            gyro_z / gyro_divisor
-        )
+        return self.get_sensor_data()[3:]
     
     def get_sensor_data(self) -> Tuple[float, float, float, float, float, float]:
         """
-        Read all sensor data
+        Read all sensor data with a single burst read
         Returns: (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
         """
-        accel = self.get_acceleration()
-        gyro = self.get_gyroscope()
-        return accel + gyro
+        ax, ay, az, temp, gx, gy, gz = self._read_block()
+        self.temperature = temp / 340.0 + 36.53
+        accel_divisor = self.accel_divisor
+        gyro_divisor = self.gyro_divisor
+        return (
+            ax / accel_divisor,
+            ay / accel_divisor,
+            az / accel_divisor,
+            gx / gyro_divisor,
+            gy / gyro_divisor,
+            gz / gyro_divisor
+        )
+    
+    def get_temperature(self) -> float:
+        """
+        Read the die temperature
+        Returns: temperature in °C
+        """
+        self.get_sensor_data()
+        return self.temperature
+    
+    def _set_sample_rate(self, sample_rate: int) -> float:
+        """
+        Set the sensor's own output rate (4-1000 Hz) from the 1 kHz clock
+        Returns: the sample rate actually configured in Hz
+        """
+        divider = max(0, min(255, round(self.INTERNAL_SAMPLE_RATE / sample_rate) - 1))
+        self._write_reg(self.CONFIG, self.DLPF_184HZ)
+        self._write_reg(self.SMPLRT_DIV, divider)
+        return self.INTERNAL_SAMPLE_RATE / (1 + divider)
+    
+    def enable_data_ready_interrupt(self, sample_rate: int) -> float:
+        """
+        Pulse the INT pin (active high) each time a new sample is latched
+        at sample_rate Hz, to pace reads on the sensor's clock
+        Returns: the sample rate actually configured in Hz
+        """
+        rate = self._set_sample_rate(sample_rate)
+        self._write_reg(self.INT_PIN_CFG, 0)
+        self._write_reg(self.INT_ENABLE, self.INT_ENABLE_DATA_RDY)
+        return rate
+    
+    def enable_fifo(self, sample_rate: int) -> float:
+        """
+        Buffer accel and gyro samples in the sensor's 1 KB FIFO
+        The FIFO holds 85 samples, so read_fifo() must run at least every
+        85 / sample_rate seconds to avoid an overflow.
+        Returns: the sample rate actually configured in Hz
+        """
+        rate = self._set_sample_rate(sample_rate)
+        self._write_reg(self.FIFO_EN, self.FIFO_ACCEL_GYRO)
+        self._reset_fifo()
+        self.fifo_enabled = True
+        return rate
+    
+    def disable_fifo(self):
+        """Stop buffering samples in the FIFO"""
+        self._write_reg(self.FIFO_EN, 0)
+        self._write_reg(self.USER_CTRL, 0)
+        self.fifo_enabled = False
+    
+    def _reset_fifo(self):
+        """Discard the FIFO contents and keep buffering"""
+        self._write_reg(self.USER_CTRL, self.USER_CTRL_FIFO_RESET)
+        self._write_reg(self.USER_CTRL, self.USER_CTRL_FIFO_EN)
+    
+    def fifo_count(self) -> int:
+        """Number of complete samples waiting in the FIFO"""
+        self.i2c.readfrom_mem_into(self.MPU6050_ADDR, self.FIFO_COUNTH, self._count)
+        return ((self._count[0] << 8) | self._count[1]) // self.FIFO_FRAME_SIZE
+    
+    def read_fifo(self, max_samples: Optional[int] = None) -> List[Tuple[float, float, float, float, float, float]]:
+        """
+        Drain buffered samples, oldest first, in one I2C transaction
+        After an overflow the frame boundaries are lost, so the FIFO is
+        reset and the call returns no samples.
+        Returns: list of (accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
+        """
+        self.i2c.readfrom_mem_into(self.MPU6050_ADDR, self.INT_STATUS, self._status)
+        if self._status[0] & self.INT_STATUS_FIFO_OFLOW:
+            self.fifo_overflows += 1
+            self._reset_fifo()
+            return []
+        
+        frames = self.fifo_count()
+        if max_samples is not None:
+            frames = min(frames, max_samples)
+        if frames == 0:
+            return []
+        
+        size = frames * self.FIFO_FRAME_SIZE
+        self.i2c.readfrom_mem_into(self.MPU6050_ADDR, self.FIFO_R_W, self._fifo_view[:size])
+        
+        accel_divisor = self.accel_divisor
+        gyro_divisor = self.gyro_divisor
+        samples = []
+        for offset in range(0, size, self.FIFO_FRAME_SIZE):
+            ax, ay, az, gx, gy, gz = struct.unpack_from(self.FIFO_FRAME_FORMAT, self._fifo, offset)
+            samples.append((
+                ax / accel_divisor,
+                ay / accel_divisor,
+                az / accel_divisor,
+                gx / gyro_divisor,
+                gy / gyro_divisor,
+                gz / gyro_divisor
+            ))
+        return samples
     
     def calibrate(self, samples: int = 1000) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
         """
@@ -132,14 +264,13 @@ class MPU6050_ESP32:
         
         print("Calibrating MPU6050. Keep the sensor still...")
         for _ in range(samples):
-            accel = self.get_acceleration()
-            gyro = self.get_gyroscope()
+            sample = self.get_sensor_data()
             
             for i in range(3):
-                accel_sum[i] += accel[i]
-                gyro_sum[i] += gyro[i]
+                accel_sum[i] += sample[i]
+                gyro_sum[i] += sample[i + 3]
             
-            time.sleep_ms(10)
+            _sleep_ms(10)
         
         accel_offsets = tuple(accel_sum[i] / samples for i in range(3))
         gyro_offsets = tuple(gyro_sum[i] / samples for i in range(3))
@@ -167,4 +298,11 @@ while True:
     gyro_data = mpu.get_gyroscope()
     print(f"Accel: {accel_data}, Gyro: {gyro_data}")
     time.sleep(0.1)
+
+# High-rate sampling through the FIFO: drain every 50 ms at 500 Hz
+mpu.enable_fifo(500)
+while True:
+    for sample in mpu.read_fifo():
+        print(sample)
+    time.sleep_ms(50)
 """
\ No newline at end of file
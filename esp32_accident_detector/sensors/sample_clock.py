@@ -0,0 +1,151 @@
+import math
+import time
+from typing import Optional
+from config import Config
+
+try:
+    from time import ticks_us, ticks_add, ticks_diff, sleep_us
+except ImportError:
+    # CPython: plain integer microseconds, no wraparound
+    def ticks_us():
+        return time.monotonic_ns() // 1000
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    def ticks_diff(end, start):
+        return end - start
+
+    def sleep_us(us):
+        time.sleep(us / 1000000)
+
+class SampleClock:
+    """
+    Paces the detection loop on absolute sample deadlines, or on the
+    MPU6050 data-ready interrupt when one is wired up
+
+    Deadline n is start + n * period in wrap-safe microsecond ticks, so
+    loop cost shortens the next wait instead of stretching the period.
+    If a whole period is lost, the missed deadlines are counted and
+    skipped instead of being caught up in a burst.
+    """
+
+    # Poll step while waiting for a data-ready interrupt
+    POLL_US = 200
+    # Edge counter wraps here so it stays a small int (no allocation in the IRQ)
+    EDGE_MASK = 0x3FFFFFFF
+
+    def __init__(self, rate: Optional[int] = None, interrupt: bool = False):
+        """
+        rate: samples per second (defaults to SAMPLING_RATE)
+        interrupt: pace on data_ready() calls instead of deadlines
+        """
+        self.config = Config()
+        self.rate = rate if rate is not None else self.config.SAMPLING_RATE
+        self.period_us = 1000000 // self.rate
+        self.interrupt = interrupt
+        # Written only by data_ready(); _wait_interrupt() keeps its own
+        # _edges_seen, so an edge landing mid-read is never lost
+        self._edges = 0
+        self._edges_seen = 0
+        self._ready_ticks = 0
+        self.reset()
+
+    def reset(self):
+        """Restart pacing from now and clear statistics"""
+        self._deadline = None
+        # Timestamps are tick-paced but on the time.time() scale
+        self._start_ticks = ticks_us()
+        self._start_time = time.time()
+        self.samples = 0
+        self.missed_deadlines = 0
+        self._first_ticks = None
+        self._last_ticks = None
+        self._lateness_sum = 0
+        self._max_lateness = 0
+        self._intervals = 0
+        self._interval_error_sq_sum = 0.0
+
+    def data_ready(self, pin=None):
+        """
+        Data-ready interrupt handler for Pin.irq; does not allocate
+        """
+        self._ready_ticks = ticks_us()
+        self._edges = (self._edges + 1) & self.EDGE_MASK
+
+    def wait(self) -> float:
+        """
+        Block until the next sample is due
+        Returns: the sample timestamp in seconds since the epoch
+        """
+        if self.interrupt:
+            sample_ticks, lateness, missed = self._wait_interrupt()
+        else:
+            sample_ticks, lateness, missed = self._wait_deadline()
+        self._record(sample_ticks, lateness, missed)
+        return self._start_time + ticks_diff(sample_ticks, self._start_ticks) / 1000000
+
+    def _wait_deadline(self):
+        now = ticks_us()
+        missed = 0
+        if self._deadline is None:
+            self._deadline = now
+        else:
+            self._deadline = ticks_add(self._deadline, self.period_us)
+            behind = ticks_diff(now, self._deadline)
+            if behind >= self.period_us:
+                missed = behind // self.period_us
+                self._deadline = ticks_add(self._deadline, missed * self.period_us)
+            remaining = ticks_diff(self._deadline, now)
+            if remaining > 0:
+                sleep_us(remaining)
+                now = ticks_us()
+        return now, ticks_diff(now, self._deadline), missed
+
+    def _wait_interrupt(self):
+        start = ticks_us()
+        while self._edges == self._edges_seen:
+            if ticks_diff(ticks_us(), start) > 2 * self.period_us:
+                # No edge for two periods: read anyway so the loop keeps running
+                return ticks_us(), 0, 1
+            sleep_us(self.POLL_US)
+        # Re-read if an edge landed between the count and its timestamp
+        edges = self._edges
+        ready_ticks = self._ready_ticks
+        while edges != self._edges:
+            edges = self._edges
+            ready_ticks = self._ready_ticks
+        pending = (edges - self._edges_seen) & self.EDGE_MASK
+        self._edges_seen = edges
+        # Each extra edge was a sample overwritten before it was read
+        return ready_ticks, ticks_diff(ticks_us(), ready_ticks), pending - 1
+
+    def _record(self, sample_ticks: int, lateness: int, missed: int):
+        self.samples += 1
+        self.missed_deadlines += missed
+        self._lateness_sum += lateness
+        self._max_lateness = max(self._max_lateness, lateness)
+        if self._last_ticks is None:
+            self._first_ticks = sample_ticks
+        elif not missed:
+            # Interval jitter only over back-to-back samples
+            error = ticks_diff(sample_ticks, self._last_ticks) - self.period_us
+            self._intervals += 1
+            self._interval_error_sq_sum += error * error
+        self._last_ticks = sample_ticks
+
+    def get_metrics(self) -> dict:
+        """
+        Pacing statistics since the last reset
+        Returns: dictionary with observed rate, missed deadlines and jitter
+        """
+        elapsed_us = ticks_diff(self._last_ticks, self._first_ticks) if self.samples > 1 else 0
+        return {
+            'samples': self.samples,
+            'missed_deadlines': self.missed_deadlines,
+            'target_rate': self.rate,
+            'observed_rate': (self.samples - 1) * 1000000 / elapsed_us if elapsed_us > 0 else 0.0,
+            'mean_lateness_ms': self._lateness_sum / self.samples / 1000 if self.samples else 0.0,
+            'max_lateness_ms': self._max_lateness / 1000,
+            'interval_jitter_ms': math.sqrt(self._interval_error_sq_sum / self._intervals) / 1000 if self._intervals else 0.0
+        }
\ No newline at end of file
@@ -0,0 +1,123 @@
+import math
+from array import array
+from collections import deque
+from typing import List, Optional, Sequence
+
+class SlidingWindowStats:
+    """
+    Mean, variance, min and max of several channels over the last
+    window_size samples, updated in O(1) (amortized) per sample.
+    
+    Means and variances come from running sums and sums of squares, which
+    are recomputed exactly from the buffered samples every recompute_every
+    samples so floating-point drift cannot accumulate. Min and max come from
+    monotonic deques and are exact.
+    """
+    
+    def __init__(self, window_size: int, channels: int, recompute_every: Optional[int] = 1000):
+        self.window_size = window_size
+        self.channels = channels
+        self.recompute_every = recompute_every
+        self.reset()
+    
+    def reset(self):
+        # Flat ring of window_size rows of channel values
+        self._values = array('d', bytes(8 * self.window_size * self.channels))
+        self._sums = [0.0] * self.channels
+        self._squares = [0.0] * self.channels
+        # (sample index, value) pairs; values decrease along _maxima and
+        # increase along _minima, so the extreme is always at the front
+        self._maxima = [deque() for _ in range(self.channels)]
+        self._minima = [deque() for _ in range(self.channels)]
+        self.count = 0
+        self.recomputes = 0
+    
+    def __len__(self) -> int:
+        return min(self.count, self.window_size)
+    
+    def update(self, values: Sequence[float]):
+        """
+        Add one sample (one value per channel), evicting the oldest once the window is full
+        """
+        index = self.count
+        expired = index - self.window_size
+        row = (index % self.window_size) * self.channels
+        ring = self._values
+        sums = self._sums
+        squares = self._squares
+        
+        for channel, value in enumerate(values):
+            if expired >= 0:
+                old = ring[row + channel]
+                sums[channel] += value - old
+                squares[channel] += value * value - old * old
+            else:
+                sums[channel] += value
+                squares[channel] += value * value
+            ring[row + channel] = value
+            
+            maxima = self._maxima[channel]
+            while maxima and maxima[-1][1] <= value:
+                maxima.pop()
+            maxima.append((index, value))
+            if maxima[0][0] <= expired:
+                maxima.popleft()
+            
+            minima = self._minima[channel]
+            while minima and minima[-1][1] >= value:
+                minima.pop()
+            minima.append((index, value))
+            if minima[0][0] <= expired:
+                minima.popleft()
+        
+        self.count += 1
+        if self.recompute_every and self.count % self.recompute_every == 0:
+            self.recompute()
+    
+    def recompute(self):
+        """
+        Replace the running sums with exact sums over the buffered samples
+        """
+        rows = len(self) * self.channels
+        for channel in range(self.channels):
+            column = self._values[channel:rows:self.channels]
+            self._sums[channel] = math.fsum(column)
+            self._squares[channel] = math.fsum(value * value for value in column)
+        self.recomputes += 1
+    
+    def mean(self, channel: int) -> float:
+        return self._sums[channel] / len(self) if self.count else 0.0
+    
+    def variance(self, channel: int) -> float:
+        """
+        Population variance (as np.var)
+        """
+        size = len(self)
+        if not size:
+            return 0.0
+        mean = self._sums[channel] / size
+        # Cancellation can leave a tiny negative remainder for constant signals
+        return max(self._squares[channel] / size - mean * mean, 0.0)
+    
+    def std(self, channel: int) -> float:
+        return math.sqrt(self.variance(channel))
+    
+    def maximum(self, channel: int) -> float:
+        maxima = self._maxima[channel]
+        return maxima[0][1] if maxima else 0.0
+    
+    def minimum(self, channel: int) -> float:
+        minima = self._minima[channel]
+        return minima[0][1] if minima else 0.0
+    
+    def means(self, channels: Sequence[int]) -> List[float]:
+        return [self.mean(channel) for channel in channels]
+    
+    def stds(self, channels: Sequence[int]) -> List[float]:
+        return [self.std(channel) for channel in channels]
+    
+    def maxima(self, channels: Sequence[int]) -> List[float]:
+        return [self.maximum(channel) for channel in channels]
+    
+    def minima(self, channels: Sequence[int]) -> List[float]:
+        return [self.minimum(channel) for channel in channels]
\ No newline at end of file
@@ -0,0 +1,68 @@
+import time
+
+class FakeModem:
+    """
+    UART stand-in for a SIM7000C: answers each command after `delay`
+    seconds with a scripted reply. Output only becomes readable once due,
+    so no thread is needed.
+    """
+
+    def __init__(self, delay=0.02, replies=None, echo=False):
+        self.delay = delay
+        self.echo = echo
+        self.replies = {
+            'AT': 'OK',
+            'ATE0': 'OK',
+            'AT+CMGF=1': 'OK',
+            'AT+CSCS="GSM"': 'OK',
+            'AT+CNMI=1,2,0,0,0': 'OK',
+            'AT+CPIN?': '+CPIN: READY\r\n\r\nOK',
+            'AT+CREG?': '+CREG: 0,1\r\n\r\nOK',
+            'AT+CSQ': '+CSQ: 15,0\r\n\r\nOK',
+            'AT+CGNSPWR=1': 'OK',
+            'AT+CGNSINF': '+CGNSINF: 1,1,20240101120000.000,40.712800,-74.006000,10.0,0.00,0.0,1,,1.0,1.2,0.8,,8,7,,,40,,\r\n\r\nOK'
+        }
+        self.replies.update(replies or {})
+        self.written = []
+        self._output = []  # (due time, bytes)
+        self._readable = b''
+        self._input = b''
+
+    def inject(self, text, delay=0.0):
+        """Emit modem output, e.g. a URC, after delay seconds"""
+        self._output.append((time.monotonic() + delay, text.encode()))
+
+    def write(self, data):
+        self.written.append(data)
+        self._input += data
+        while True:
+            ends = [index for index in (self._input.find(b'\r'), self._input.find(b'\x1a')) if index >= 0]
+            if not ends:
+                break
+            end = min(ends)
+            command, self._input = self._input[:end].decode().strip(), self._input[end + 1:]
+            if self.echo:
+                self.inject(command + '\r\n')
+            if command.startswith('AT+CMGS='):
+                reply = '\r\n> '
+            elif command.startswith('AT'):
+                reply = self.replies.get(command)
+                if reply is None:
+                    continue
+                reply = f"\r\n{reply}\r\n"
+            else:
+                # Message text after the prompt
+                reply = '\r\n+CMGS: 12\r\n\r\nOK\r\n'
+            self.inject(reply, self.delay)
+        return len(data)
+
+    def any(self):
+        now = time.monotonic()
+        self._readable += b''.join(chunk for when, chunk in self._output if when <= now)
+        self._output = [(when, chunk) for when, chunk in self._output if when > now]
+        return len(self._readable)
+
+    def read(self, size):
+        self.any()
+        data, self._readable = self._readable[:size], self._readable[size:]
+        return data
\ No newline at end of file
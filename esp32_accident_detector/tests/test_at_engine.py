@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert.at_engine import ATEngine, ATTokenizer
+from alert.sim7000c import SIM7000C
+from tests.fake_modem import FakeModem
+
+@pytest.fixture()
+def modem():
+    return FakeModem()
+
+@pytest.fixture()
+def urcs():
+    return []
+
+@pytest.fixture()
+def engine(modem, urcs):
+    return ATEngine(modem, on_urc=lambda urc, body: urcs.append((urc, body)))
+
+def test_tokenizer_splits_lines_across_reads_and_prompt():
+    tokenizer = ATTokenizer()
+    assert tokenizer.feed(b'\r\n+CSQ: 1') == []
+    assert tokenizer.feed(b'5,0\r\n\r\nOK\r\n') == ['+CSQ: 15,0', 'OK']
+    assert tokenizer.feed(b'\r\n> ') == ['>']
+
+def test_command_completes_on_final_result(engine):
+    response = engine.command("AT+CSQ")
+    assert response.ok
+    assert response.value("+CSQ:") == "15,0"
+    # Done when OK arrives, not after a fixed wait
+    assert response.elapsed < 0.2
+
+def test_error_results_are_final(engine, modem):
+    modem.replies['AT+CPIN?'] = '+CME ERROR: 10'
+    modem.replies['AT+CMGR=1'] = '+CMS ERROR: 321'
+    assert engine.command("AT+CPIN?").final == '+CME ERROR: 10'
+    response = engine.command("AT+CMGR=1")
+    assert not response.ok
+    assert response.final == '+CMS ERROR: 321'
+
+def test_timeout(engine):
+    response = engine.command("AT+UNKNOWN", timeout=0.1)
+    assert response.final == 'TIMEOUT'
+    assert response.elapsed >= 0.1
+    assert engine.get_metrics()['timeouts'] == 1
+
+def test_urcs_are_kept_out_of_responses(engine, modem, urcs):
+    # New SMS and registration change arrive while AT+CSQ is in flight
+    modem.inject('\r\n+CMTI: "SM",3\r\n\r\n+CREG: 5\r\n', 0.01)
+    assert engine.command("AT+CSQ").lines == ['+CSQ: 15,0']
+    # A +CREG line is the response to AT+CREG?
+    assert engine.command("AT+CREG?").value("+CREG:") == "0,1"
+
+    # Between commands, URCs are drained by poll()
+    modem.inject('\r\n+CMT: "+15551234",,"24/01/01,12:00:00+00"\r\nCANCEL\r\n')
+    engine.poll()
+    assert urcs == [('+CMTI: "SM",3', None), ('+CREG: 5', None),
+                    ('+CMT: "+15551234",,"24/01/01,12:00:00+00"', 'CANCEL')]
+
+def test_echo_is_ignored(engine, modem):
+    modem.echo = True
+    assert engine.command("AT+CSQ").lines == ['+CSQ: 15,0']
+
+def test_sim7000c_initialize_send_and_locate(modem):
+    # 20 ms per reply; the fixed-wait driver took 12+ s to initialize
+    # and about 10 s per SMS regardless of the modem
+    sim = SIM7000C()
+    sim.serial_port = modem
+    sim.engine = ATEngine(modem, on_urc=sim.handle_urc)
+
+    started = time.monotonic()
+    assert sim.initialize_module()
+    assert sim.get_signal_strength() == -83
+    assert sim.get_gps_location() == (40.7128, -74.006)
+    assert sim.send_alert("+15551234", "https://www.google.com/maps?q=1,2")
+    assert time.monotonic() - started < 1.0
+
+    assert modem.written[-2] == b'AT+CMGS="+15551234"\r'
+    assert modem.written[-1].endswith(b'\x1a')
+    assert sim.engine.get_metrics()['latency']['mean_ms'] < 100
\ No newline at end of file
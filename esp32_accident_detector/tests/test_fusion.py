@@ -0,0 +1,56 @@
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from sensors.fusion import SensorFusion
+
+def reference_window(samples):
+    """Normalization as done by the dict-based buffer"""
+    config = Config()
+    accel = np.clip(samples[:, :3], -config.ACCELEROMETER_RANGE, config.ACCELEROMETER_RANGE) / config.ACCELEROMETER_RANGE
+    gyro = np.clip(samples[:, 3:], -config.GYROSCOPE_RANGE, config.GYROSCOPE_RANGE) / config.GYROSCOPE_RANGE
+    return np.concatenate([accel, gyro], axis=1).reshape(1, config.WINDOW_SIZE, config.FEATURES)
+
+def test_processed_window_matches_reference():
+    fusion = SensorFusion()
+    window = fusion.window_size
+    samples = np.random.default_rng(0).uniform(-300, 300, (3 * window + 7, 6))
+    for count, sample in enumerate(samples, start=1):
+        fusion.add_sensor_data(tuple(sample[:3]), tuple(sample[3:]), timestamp=count)
+        processed = fusion.get_processed_window()
+        if count < window:
+            assert processed is None
+            continue
+        assert processed.dtype == np.float32
+        assert not processed.flags.writeable
+        np.testing.assert_allclose(processed, reference_window(samples[count - window:count]), rtol=1e-6, atol=1e-7)
+
+def test_dict_views_keep_the_old_shape():
+    fusion = SensorFusion()
+    for i in range(fusion.window_size + 5):
+        fusion.add_sensor_data((0.5, 0.25, 1.0), (float(i), 0.0, -1.0), timestamp=100 + i)
+
+    assert len(fusion.data_buffer) == fusion.window_size
+    entries = fusion.get_data_window()
+    assert entries[0] == {
+        'timestamp': 105.0, 'accel_x': 0.5, 'accel_y': 0.25, 'accel_z': 1.0,
+        'gyro_x': 5.0, 'gyro_y': 0.0, 'gyro_z': -1.0,
+    }
+    assert entries[-1]['timestamp'] == 100 + fusion.window_size + 4
+
+    # Old-style dict windows and the array view give the same results
+    np.testing.assert_allclose(fusion.extract_features(entries), fusion.get_processed_window())
+    assert fusion.calculate_sensor_statistics(entries) == fusion.calculate_sensor_statistics(fusion.get_window_array())
+
+def test_window_is_a_view_of_the_buffer():
+    fusion = SensorFusion()
+    assert fusion.get_window_array() is None
+    for i in range(fusion.window_size * 2 + 1):
+        fusion.add_sensor_data((0.0, 0.0, 1.0), (0.0, 0.0, 0.0), timestamp=i)
+    processed = fusion.get_processed_window()
+    assert processed.flags.c_contiguous
+    assert processed.base is not None
+    assert fusion.get_window_array().shape == (fusion.window_size, 6)
\ No newline at end of file
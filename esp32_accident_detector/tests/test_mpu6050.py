@@ -0,0 +1,95 @@
+import os
+import struct
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensors.mpu6050_esp32 import MPU6050_ESP32
+
+class FakeI2C:
+    """
+    Simulated MPU6050 register map with a 1 KB FIFO behind machine.I2C's
+    memory API; counts I2C transactions
+    """
+
+    def __init__(self):
+        self.registers = bytearray(0x80)
+        self.fifo = bytearray()
+        self.transactions = 0
+
+    def set_block(self, ax, ay, az, temp, gx, gy, gz):
+        self.registers[MPU6050_ESP32.ACCEL_XOUT_H:MPU6050_ESP32.ACCEL_XOUT_H + 14] = struct.pack('>7h', ax, ay, az, temp, gx, gy, gz)
+
+    def push(self, frames):
+        for frame in frames:
+            self.fifo += struct.pack('>6h', *frame)
+        if len(self.fifo) > 1024:
+            # The hardware keeps writing over the oldest bytes
+            del self.fifo[:len(self.fifo) - 1024]
+            self.registers[MPU6050_ESP32.INT_STATUS] |= MPU6050_ESP32.INT_STATUS_FIFO_OFLOW
+
+    def writeto_mem(self, addr, reg, data):
+        self.transactions += 1
+        self.registers[reg] = data[0]
+        if reg == MPU6050_ESP32.USER_CTRL and data[0] & MPU6050_ESP32.USER_CTRL_FIFO_RESET:
+            self.fifo.clear()
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        self.transactions += 1
+        if reg == MPU6050_ESP32.FIFO_R_W:
+            buf[:] = self.fifo[:len(buf)]
+            del self.fifo[:len(buf)]
+        elif reg == MPU6050_ESP32.FIFO_COUNTH:
+            buf[:] = struct.pack('>H', len(self.fifo))
+        else:
+            buf[:] = self.registers[reg:reg + len(buf)]
+            if reg == MPU6050_ESP32.INT_STATUS:
+                # Interrupt status clears on read
+                self.registers[reg] = 0
+
+@pytest.fixture()
+def i2c():
+    return FakeI2C()
+
+@pytest.fixture()
+def mpu(i2c):
+    sensor = MPU6050_ESP32(i2c)
+    i2c.transactions = 0
+    return sensor
+
+def test_burst_read_is_one_transaction(i2c, mpu):
+    i2c.set_block(16384, -8192, 4096, -521, 131, -262, 655)
+    assert mpu.get_sensor_data() == pytest.approx((1.0, -0.5, 0.25, 1.0, -2.0, 5.0))
+    assert i2c.transactions == 1
+    assert mpu.temperature == pytest.approx(35.0, abs=0.01)
+
+def test_fifo_drains_many_samples_per_transaction(i2c, mpu):
+    assert mpu.enable_fifo(200) == 200
+    assert i2c.registers[MPU6050_ESP32.SMPLRT_DIV] == 4
+
+    i2c.push([(i * 16, -i * 16, 16384, i * 131, 0, -131) for i in range(85)])
+    i2c.transactions = 0
+    samples = mpu.read_fifo()
+
+    # Status, count and one read for all 85 samples
+    assert i2c.transactions == 3
+    assert len(samples) == 85
+    assert samples[10] == pytest.approx((160 / 16384.0, -160 / 16384.0, 1.0, 10.0, 0.0, -1.0))
+    assert mpu.read_fifo() == []
+
+def test_fifo_max_samples_leaves_the_rest(i2c, mpu):
+    mpu.enable_fifo(1000)
+    i2c.push([(i, 0, 0, 0, 0, 0) for i in range(10)])
+    samples = mpu.read_fifo(max_samples=4) + mpu.read_fifo()
+    assert [round(s[0] * 16384) for s in samples] == list(range(10))
+
+def test_fifo_overflow_resets(i2c, mpu):
+    mpu.enable_fifo(1000)
+    i2c.push([(1, 2, 3, 4, 5, 6)] * 100)
+    assert mpu.read_fifo() == []
+    assert mpu.fifo_overflows == 1
+    assert len(i2c.fifo) == 0
+
+    i2c.push([(1, 2, 3, 4, 5, 6)] * 5)
+    assert len(mpu.read_fifo()) == 5
\ No newline at end of file
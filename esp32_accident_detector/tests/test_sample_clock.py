@@ -0,0 +1,144 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensors import sample_clock
+from sensors.sample_clock import SampleClock
+
+TICKS_PERIOD = 1 << 30
+
+class FakeTicks:
+    """
+    MicroPython-style microsecond ticks that wrap at 2**30 and only move
+    when slept on or advanced
+    """
+
+    def __init__(self, start):
+        self.now = start
+
+    def ticks_us(self):
+        return self.now
+
+    def sleep_us(self, us):
+        self.advance(us)
+
+    def advance(self, us):
+        self.now = (self.now + us) % TICKS_PERIOD
+
+@pytest.fixture()
+def ticks(monkeypatch):
+    # Start shortly before the wrap so the deadlines cross it
+    fake = FakeTicks(TICKS_PERIOD - 3000000)
+    monkeypatch.setattr(sample_clock, "ticks_us", fake.ticks_us)
+    monkeypatch.setattr(sample_clock, "sleep_us", fake.sleep_us)
+    monkeypatch.setattr(sample_clock, "ticks_add", lambda t, d: (t + d) % TICKS_PERIOD)
+    monkeypatch.setattr(sample_clock, "ticks_diff",
+                        lambda a, b: ((a - b + TICKS_PERIOD // 2) % TICKS_PERIOD) - TICKS_PERIOD // 2)
+    return fake
+
+def test_loop_cost_does_not_lower_the_rate(ticks):
+    clock = SampleClock(50)
+    timestamps = []
+    for _ in range(500):
+        timestamps.append(clock.wait())
+        ticks.advance(12000)
+
+    metrics = clock.get_metrics()
+    assert metrics['observed_rate'] == pytest.approx(50.0)
+    assert metrics['missed_deadlines'] == 0
+    assert metrics['interval_jitter_ms'] == 0
+    assert timestamps[-1] - timestamps[0] == pytest.approx(499 * 0.02)
+
+def test_stall_skips_missed_deadlines_and_stays_on_grid(ticks):
+    clock = SampleClock(50)
+    start = clock.wait()
+    ticks.advance(70000)
+    late = clock.wait()
+    assert clock.missed_deadlines == 2
+    assert late - start == pytest.approx(0.07)
+    assert clock.get_metrics()['max_lateness_ms'] == pytest.approx(10.0)
+
+    following = [clock.wait() for _ in range(3)]
+    assert [round((t - start) * 1000) for t in following] == [80, 100, 120]
+
+def test_interrupt_pacing_uses_edge_times(ticks):
+    clock = SampleClock(50, interrupt=True)
+    clock.data_ready()
+    ticks.advance(1000)
+    first = clock.wait()
+
+    # Two edges before the next read: one sample was overwritten
+    ticks.advance(19000)
+    clock.data_ready()
+    ticks.advance(20000)
+    clock.data_ready()
+    ticks.advance(2000)
+    second = clock.wait()
+
+    assert second - first == pytest.approx(0.04)
+    metrics = clock.get_metrics()
+    assert metrics['missed_deadlines'] == 1
+    assert metrics['max_lateness_ms'] == pytest.approx(2.0)
+
+def test_interrupt_timeout_counts_a_miss(ticks):
+    clock = SampleClock(50, interrupt=True)
+    clock.wait()
+    assert clock.missed_deadlines == 1
+
+class RacingClock(SampleClock):
+    """
+    Fires one data-ready edge right after the race_after-th read of the
+    edge count
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.race_after = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def _edges(self):
+        value = self.__dict__['_edges']
+        if self.race_after is not None:
+            self.race_after -= 1
+            if not self.race_after:
+                self.race_after = None
+                self.data_ready()
+        return value
+
+    @_edges.setter
+    def _edges(self, value):
+        self.__dict__['_edges'] = value
+
+def test_edge_during_read_is_not_lost(ticks):
+    clock = RacingClock(50, interrupt=True)
+    clock.data_ready()
+    ticks.advance(1000)
+    clock.wait()
+
+    ticks.advance(19000)
+    clock.data_ready()
+    ticks.advance(500)
+    # After the wait loop's read, between the count and its timestamp
+    clock.race_after = 2
+    clock.wait()
+    assert clock.race_after is None
+    # Both edges are counted: one sample was overwritten
+    assert clock.missed_deadlines == 1
+
+    # Nothing was left pending or counted twice
+    ticks.advance(20000)
+    clock.data_ready()
+    clock.wait()
+    assert clock.samples == 3
+    assert clock.missed_deadlines == 1
+
+def test_edge_counter_wraps(ticks):
+    clock = SampleClock(50, interrupt=True)
+    clock._edges = clock._edges_seen = SampleClock.EDGE_MASK
+    clock.data_ready()
+    assert clock._edges == 0
+    clock.wait()
+    assert clock.samples == 1
+    assert clock.missed_deadlines == 0
\ No newline at end of file
@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml.scheduler import InferenceScheduler
+
+def test_hop_and_gate():
+    scheduler = InferenceScheduler(hop_size=4, hold_samples=2)
+    quiet = ((0.1, 0.0, 1.0), (2.0, 0.0, -1.0))
+    runs = [scheduler.should_infer(*quiet) for _ in range(8)]
+    assert runs == [False, False, False, True] * 2
+
+    # A 3 g spike runs the model at once; the drop back to 1 g is a jerk that
+    # re-opens the gate, which then holds for two more samples
+    assert scheduler.should_infer((3.0, 0.0, 1.0), (0.0, 0.0, 0.0))
+    runs = [scheduler.should_infer(*quiet) for _ in range(7)]
+    assert runs == [True, True, True, False, False, False, True]
+
+    metrics = scheduler.get_metrics()
+    assert metrics['samples'] == 16
+    assert metrics['inferences'] == 7
+    assert metrics['gated_inferences'] == 4
+    assert metrics['triggers'] == 1
+
+def test_jerk_alone_opens_the_gate():
+    scheduler = InferenceScheduler(hop_size=100, hold_samples=0)
+    scheduler.should_infer((0.0, 0.0, 1.0), (0.0, 0.0, 0.0))
+    # |accel| rises by 1.2 g in one 20 ms sample: within 1.5 g of 1 g, but 60 g/s
+    assert scheduler.should_infer((0.0, 0.0, 2.2), (0.0, 0.0, 0.0))
+    assert not scheduler.should_infer((0.0, 0.0, 2.2), (0.0, 0.0, 0.0))
\ No newline at end of file
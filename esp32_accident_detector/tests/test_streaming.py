@@ -0,0 +1,35 @@
+import os
+import sys
+import numpy as np
+import tensorflow as tf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml.streaming import StreamingAccidentDetector
+from ml.streaming_export import export_streaming_model
+
+def test_streaming_matches_windowed_inference_at_resyncs(tmp_path):
+    window = 10
+    tf.keras.utils.set_random_seed(0)
+    # create_lightweight_lstm_model layer stack, untrained
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(window, 6)),
+        tf.keras.layers.LSTM(32, return_sequences=True),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.LSTM(16),
+        tf.keras.layers.Dropout(0.2),
+        tf.keras.layers.Dense(8, activation='relu'),
+        tf.keras.layers.Dense(1, activation='sigmoid'),
+    ])
+    path = str(tmp_path / 'stream.tflite')
+    export_streaming_model(model, path)
+
+    samples = np.random.default_rng(2).uniform(-1, 1, (61, 6)).astype(np.float32)
+    detector = StreamingAccidentDetector(path, window_size=window, resync_interval=25)
+    streamed = [detector.update(sample) for sample in samples]
+
+    for count in (10, 35, 60):
+        expected = model.predict(samples[None, count - window:count], verbose=0)[0, 0]
+        assert abs(streamed[count - 1] - expected) < 1e-5
+    assert detector.resyncs == 2
+    assert detector.steps == len(samples) + 2 * window
\ No newline at end of file
@@ -0,0 +1,52 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensors.fusion import SensorFusion
+from sensors.window_stats import SlidingWindowStats
+
+@pytest.mark.parametrize("window", [1, 7, 50])
+def test_matches_numpy_over_sliding_window(window):
+    values = np.random.default_rng(window).normal(0, 3, (400, 2))
+    stats = SlidingWindowStats(window, 2, recompute_every=None)
+    for count, sample in enumerate(values.tolist(), start=1):
+        stats.update(sample)
+        recent = values[max(0, count - window):count]
+        assert len(stats) == len(recent)
+        for channel in range(2):
+            assert stats.mean(channel) == pytest.approx(recent[:, channel].mean(), abs=1e-9)
+            assert stats.std(channel) == pytest.approx(recent[:, channel].std(), abs=1e-6)
+            assert stats.maximum(channel) == recent[:, channel].max()
+            assert stats.minimum(channel) == recent[:, channel].min()
+
+def test_periodic_recompute_removes_drift():
+    # A burst of huge values leaves rounding error in running sums after it
+    # has left the window; the exact recompute clears it
+    values = [1e12 + 0.1 * i for i in range(50)] + [0.001 * (i % 7) for i in range(150)]
+    drifting = SlidingWindowStats(20, 1, recompute_every=None)
+    exact = SlidingWindowStats(20, 1, recompute_every=100)
+    for value in values:
+        drifting.update((value,))
+        exact.update((value,))
+    expected = np.var(values[-20:])
+    assert exact.recomputes == 2
+    assert exact.variance(0) == pytest.approx(expected, rel=1e-9)
+    assert drifting.variance(0) != pytest.approx(expected, rel=0.5)
+
+def test_current_stats_match_full_window_statistics():
+    fusion = SensorFusion()
+    samples = np.random.default_rng(1).uniform(-4, 4, (fusion.window_size * 3 + 5, 6))
+    assert fusion.current_stats() == {}
+    for index, sample in enumerate(samples):
+        fusion.add_sensor_data(tuple(sample[:3]), tuple(sample[3:]), timestamp=index)
+
+    current = fusion.current_stats()
+    full = fusion.calculate_sensor_statistics(fusion.get_window_array())
+    for key, value in full.items():
+        np.testing.assert_allclose(current[key], value, rtol=1e-5, atol=1e-5)
+    window = fusion.get_window_array()
+    np.testing.assert_allclose(current['accel_min'], window[:, :3].min(axis=0))
+    np.testing.assert_allclose(current['gyro_min'], window[:, 3:].min(axis=0))
\ No newline at end of file
@@ -0,0 +1,2 @@
+from .index import EARTH_RADIUS_KM, Facility, FacilityIndex, KDTree, haversine_km, to_unit_xyz
+from .database import FacilityDatabase, build_database, open_facilities
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Compare cold start and lookup of the JSON facility index with the
+memory-mapped facility database.
+
+    python -m facilities.bench_database --facilities 100000
+
+json      json.load + FacilityIndex (what main.py did on every boot)
+database  FacilityDatabase over a file from facilities.build
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from .database import FacilityDatabase, build_database
+from .index import FacilityIndex
+
+def measure_open(func):
+    started = time.perf_counter()
+    index = func()
+    elapsed = time.perf_counter() - started
+    # Peak heap from a second, traced open; tracing slows the timing pass
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return index, elapsed, peak
+
+def mean_lookup(index, queries):
+    timings = []
+    names = []
+    for la, lo in queries:
+        started = time.perf_counter()
+        names.append(index.nearest(la, lo)[0].name)
+        timings.append(time.perf_counter() - started)
+    return statistics.mean(timings), names
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--facilities", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    entries = [
+        [f"Facility {i}", [float(lat), float(lon)], f"080{i:07d}"]
+        for i, (lat, lon) in enumerate(rng.uniform([8.0, 68.0], [35.0, 97.0], (args.facilities, 2)))
+    ]
+    queries = rng.uniform([8.0, 68.0], [35.0, 97.0], (args.queries, 2))
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "facilities.json")
+        database_path = os.path.join(directory, "facilities.fdb")
+        with open(json_path, "w") as out:
+            json.dump(entries, out)
+        build_database(entries, database_path)
+        print(
+            f"{args.facilities} facilities: json {os.path.getsize(json_path)} bytes, "
+            f"database {os.path.getsize(database_path)} bytes"
+        )
+
+        json_index, json_open, json_peak = measure_open(lambda: FacilityIndex.load(json_path))
+        database, database_open, database_peak = measure_open(lambda: FacilityDatabase(database_path))
+        json_lookup, json_names = mean_lookup(json_index, queries)
+        database_lookup, database_names = mean_lookup(database, queries)
+        print(f"json     open {json_open * 1000:9.1f} ms  peak heap {json_peak / 1e6:8.1f} MB  {json_lookup * 1e6:7.1f} us/query")
+        print(f"database open {database_open * 1000:9.1f} ms  peak heap {database_peak / 1e6:8.1f} MB  {database_lookup * 1e6:7.1f} us/query")
+        agree = sum(a == b for a, b in zip(json_names, database_names))
+        print(f"same nearest facility: {agree}/{len(queries)}")
+        database.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Compare nearest-facility lookup strategies on a synthetic facility set.
+
+    python -m facilities.bench_lookup --facilities 100000
+
+legacy   the close_hos/close_pol loop from main.py: one geopy geodesic per
+         facility on every lookup (run on fewer queries; it is slow)
+linear   one vectorized numpy haversine pass over every facility
+kdtree   FacilityIndex (KD-tree over unit-sphere xyz)
+"""
+import argparse
+import statistics
+import time
+import numpy as np
+from .index import EARTH_RADIUS_KM, FacilityIndex
+
+def legacy_lookup(data, la, lo):
+    import geopy.distance
+    best, best_distance = None, None
+    for entry in data:
+        d = geopy.distance.geodesic((float(la), float(lo)), (entry[1][0], entry[1][1])).km
+        if best_distance is None or d < best_distance:
+            best, best_distance = entry, d
+    return best[0]
+
+def linear_lookup(names, latitudes, longitudes, la, lo):
+    phi1 = np.radians(la)
+    phi2 = np.radians(latitudes)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(longitudes - lo) / 2) ** 2
+    return names[int(np.argmin(2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(1.0, a)))))]
+
+def timed(func, queries):
+    timings = []
+    results = []
+    for la, lo in queries:
+        started = time.perf_counter()
+        results.append(func(la, lo))
+        timings.append(time.perf_counter() - started)
+    return statistics.mean(timings), results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--facilities", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--legacy-queries", type=int, default=3)
+    args = parser.parse_args()
+
+    # Roughly the extent of India, where the legacy data sets come from
+    rng = np.random.default_rng(42)
+    latitudes = rng.uniform(8.0, 35.0, args.facilities)
+    longitudes = rng.uniform(68.0, 97.0, args.facilities)
+    names = [f"Facility {i}" for i in range(args.facilities)]
+    queries = rng.uniform([8.0, 68.0], [35.0, 97.0], (args.queries, 2))
+
+    started = time.perf_counter()
+    index = FacilityIndex(names, ["100"] * args.facilities, latitudes, longitudes)
+    print(f"{args.facilities} facilities, index built in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    kdtree_mean, kdtree_results = timed(lambda la, lo: index.nearest(la, lo)[0].name, queries)
+    linear_mean, linear_results = timed(lambda la, lo: linear_lookup(names, latitudes, longitudes, la, lo), queries)
+    print(f"kdtree   {kdtree_mean * 1e6:12.1f} us/query")
+    print(f"linear   {linear_mean * 1e6:12.1f} us/query")
+    print("kdtree == linear:", kdtree_results == linear_results)
+
+    try:
+        import geopy  # noqa: F401
+    except ImportError:
+        print("legacy   skipped (geopy is not installed)")
+        return
+    data = [[name, [float(lat), float(lon)], "100"] for name, lat, lon in zip(names, latitudes, longitudes)]
+    legacy_mean, _ = timed(lambda la, lo: legacy_lookup(data, la, lo), queries[:args.legacy_queries])
+    print(f"legacy   {legacy_mean * 1e6:12.1f} us/query ({args.legacy_queries} queries)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Compile facility JSON ([name, [latitude, longitude], phone] entries) into a
+memory-mapped facility database.
+
+    python -m facilities.build /home/pi/hub_coords.json /home/pi/police_coords.json
+
+Each input gets a .fdb file next to it unless --output is given (single input only).
+"""
+import argparse
+import json
+import os
+import time
+from .database import build_database
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Facility JSON files")
+    parser.add_argument("--output", help="Output path (only with a single input)")
+    parser.add_argument("--leaf-size", type=int, default=16)
+    args = parser.parse_args()
+    if args.output and len(args.inputs) > 1:
+        parser.error("--output needs exactly one input")
+
+    for json_path in args.inputs:
+        output = args.output or os.path.splitext(json_path)[0] + ".fdb"
+        started = time.perf_counter()
+        with open(json_path, mode='r') as read_file:
+            entries = json.load(read_file)
+        count = build_database(entries, output, leaf_size=args.leaf_size)
+        print(
+            f"{json_path} -> {output}: {count} facilities, {os.path.getsize(output)} bytes "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import mmap
+import os
+import struct
+from typing import Iterable, List, Union
+import numpy as np
+from .index import Facility, FacilityIndex, KDTree, haversine_km, to_unit_xyz
+
+# Layout (little-endian, sections 8-byte aligned):
+#   header        magic, count, tree depth, section offsets
+#   latlon        float32[count, 2]   in KD-tree order
+#   xyz           float32[count, 3]   unit-sphere points, same order
+#   split_value   float32[nodes]      implicit tree, node i -> 2i+1, 2i+2
+#   split_axis    int8[nodes]
+#   string_index  uint32[2 * count + 1]  offsets of name_i, phone_i in the blob
+#   strings       utf-8 blob
+MAGIC = b"FACILDB\x01"
+HEADER = struct.Struct("<8sII6Q")
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def build_database(entries: Iterable, path: str, leaf_size: int = 16) -> int:
+    """
+    Compile [name, [latitude, longitude], phone] entries into a facility
+    database file
+    Returns: number of facilities written
+    """
+    names, phones, latitudes, longitudes = [], [], [], []
+    for name, (latitude, longitude), phone, *_ in entries:
+        names.append(str(name))
+        phones.append(str(phone))
+        latitudes.append(float(latitude))
+        longitudes.append(float(longitude))
+    count = len(names)
+
+    # Build on the float32 points the reader will search, so split values
+    # and points agree exactly
+    xyz = to_unit_xyz(latitudes, longitudes).astype(np.float32).reshape(-1, 3)
+    tree = KDTree(xyz, leaf_size=leaf_size)
+    order = tree.order
+    latlon = np.column_stack((latitudes, longitudes)).astype(np.float32).reshape(-1, 2)[order]
+
+    blob = bytearray()
+    string_index = [0]
+    for position in order:
+        blob += names[position].encode("utf-8")
+        string_index.append(len(blob))
+        blob += phones[position].encode("utf-8")
+        string_index.append(len(blob))
+
+    sections = [
+        latlon.tobytes(),
+        xyz[order].tobytes(),
+        tree.split_value.astype(np.float32).tobytes(),
+        tree.split_axis.astype(np.int8).tobytes(),
+        np.asarray(string_index, dtype=np.uint32).tobytes(),
+        bytes(blob),
+    ]
+    offsets = []
+    offset = HEADER.size
+    for section in sections:
+        offset = _align(offset)
+        offsets.append(offset)
+        offset += len(section)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, count, tree.depth, *offsets))
+        for section_offset, section in zip(offsets, sections):
+            out.write(b"\0" * (section_offset - out.tell()))
+            out.write(section)
+    # Readers never see a half-written file
+    os.replace(temporary_path, path)
+    return count
+
+class FacilityDatabase:
+    """
+    Memory-mapped facility database. Opening it parses only the header;
+    coordinates and the index are used in place and strings are decoded
+    only for the facilities a query returns.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as read_file:
+            self._map = mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, depth, *offsets = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a facility database")
+        latlon_at, xyz_at, value_at, axis_at, index_at, strings_at = offsets
+        nodes = (1 << depth) - 1
+        self.count = count
+        self._latlon = np.frombuffer(self._map, dtype=np.float32, count=2 * count, offset=latlon_at).reshape(-1, 2)
+        xyz = np.frombuffer(self._map, dtype=np.float32, count=3 * count, offset=xyz_at).reshape(-1, 3)
+        split_value = np.frombuffer(self._map, dtype=np.float32, count=nodes, offset=value_at)
+        split_axis = np.frombuffer(self._map, dtype=np.int8, count=nodes, offset=axis_at)
+        self._string_index = np.frombuffer(self._map, dtype=np.uint32, count=2 * count + 1, offset=index_at)
+        self._strings_at = strings_at
+        self.tree = KDTree.prebuilt(xyz, split_axis, split_value, depth)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Drop the array views first; an mmap with exported buffers cannot close
+        self._latlon = self._string_index = self.tree = None
+        self._map.close()
+
+    def _string(self, slot: int) -> str:
+        start = self._strings_at + int(self._string_index[slot])
+        end = self._strings_at + int(self._string_index[slot + 1])
+        return self._map[start:end].decode("utf-8")
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Facility]:
+        """
+        The k nearest facilities, nearest first, with haversine distances
+        """
+        point = to_unit_xyz([latitude], [longitude])[0]
+        results = []
+        for position, _ in self.tree.query(point, k):
+            lat, lon = (float(value) for value in self._latlon[position])
+            results.append(Facility(
+                self._string(2 * position),
+                self._string(2 * position + 1),
+                lat,
+                lon,
+                haversine_km(latitude, longitude, lat, lon),
+            ))
+        results.sort(key=lambda facility: facility.distance_km)
+        return results
+
+def open_facilities(json_path: str) -> Union[FacilityDatabase, FacilityIndex]:
+    """
+    Use the compiled database next to json_path (same name, .fdb) when it is
+    at least as new as the JSON, otherwise load the JSON
+    """
+    database_path = os.path.splitext(json_path)[0] + ".fdb"
+    if os.path.exists(database_path) and (
+        not os.path.exists(json_path) or os.path.getmtime(database_path) >= os.path.getmtime(json_path)
+    ):
+        return FacilityDatabase(database_path)
+    return FacilityIndex.load(json_path)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import heapq
+import json
+import math
+from typing import Iterable, List, NamedTuple, Sequence
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+class Facility(NamedTuple):
+    name: str
+    phone: str
+    latitude: float
+    longitude: float
+    distance_km: float
+
+def to_unit_xyz(latitudes, longitudes) -> np.ndarray:
+    """
+    Points on the unit sphere; straight-line (chord) distance between them
+    grows monotonically with great-circle distance, so a plain KD-tree
+    nearest-neighbour search in xyz finds the great-circle nearest
+    """
+    phi = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lam = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)))
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+class KDTree:
+    """
+    Implicit, balanced KD-tree over an (n, 3) array. Points are reordered
+    once at build time so every node covers a contiguous slice; node i has
+    children 2i+1 and 2i+2 and only the split axis and value are stored.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16):
+        points = np.asarray(points, dtype=np.float64)
+        count = len(points)
+        self.depth = max(0, math.ceil(math.log2(count / leaf_size))) if count else 0
+        self.order = np.arange(count)
+        nodes = (1 << self.depth) - 1
+        self.split_axis = np.zeros(nodes, dtype=np.int8)
+        self.split_value = np.zeros(nodes, dtype=np.float64)
+
+        stack = [(0, 0, count, 0)]
+        while stack:
+            node, lo, hi, level = stack.pop()
+            if level == self.depth or hi - lo < 2:
+                continue
+            block = points[self.order[lo:hi]]
+            axis = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            mid = (lo + hi) // 2
+            # Partition so [lo, mid) <= value <= [mid, hi) along the axis
+            partition = np.argpartition(block[:, axis], mid - lo)
+            self.order[lo:hi] = self.order[lo:hi][partition]
+            self.split_axis[node] = axis
+            self.split_value[node] = points[self.order[mid], axis]
+            stack.append((2 * node + 1, lo, mid, level + 1))
+            stack.append((2 * node + 2, mid, hi, level + 1))
+        self.points = points[self.order]
+
+    @classmethod
+    def prebuilt(cls, points: np.ndarray, split_axis: np.ndarray, split_value: np.ndarray, depth: int) -> "KDTree":
+        """
+        Tree over arrays that are already in tree order (e.g. memory-mapped
+        from a facility database); indices returned by query are positions
+        in those arrays
+        """
+        tree = cls.__new__(cls)
+        tree.points = points
+        tree.split_axis = split_axis
+        tree.split_value = split_value
+        tree.depth = depth
+        tree.order = None
+        return tree
+
+    def query(self, point: Sequence[float], k: int = 1):
+        """
+        Indices (into the original array) and squared distances of the k
+        nearest points, nearest first
+        """
+        k = min(k, len(self.points))
+        if k <= 0:
+            return []
+        point = np.asarray(point, dtype=np.float64)
+        best = []  # max-heap of (-squared distance, position)
+        self._search(0, 0, len(self.points), 0, point, k, best)
+        found = sorted(best, reverse=True)
+        if self.order is None:
+            return [(position, -negative) for negative, position in found]
+        return [(int(self.order[position]), -negative) for negative, position in found]
+
+    def _search(self, node, lo, hi, level, point, k, best):
+        if level == self.depth or hi - lo < 2:
+            distances = ((self.points[lo:hi] - point) ** 2).sum(axis=1)
+            for offset in np.argsort(distances)[:k]:
+                distance = float(distances[offset])
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, lo + int(offset)))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, lo + int(offset)))
+                else:
+                    break
+            return
+        mid = (lo + hi) // 2
+        gap = point[self.split_axis[node]] - self.split_value[node]
+        if gap < 0:
+            near, far = (2 * node + 1, lo, mid), (2 * node + 2, mid, hi)
+        else:
+            near, far = (2 * node + 2, mid, hi), (2 * node + 1, lo, mid)
+        self._search(*near, level + 1, point, k, best)
+        if len(best) < k or gap * gap < -best[0][0]:
+            self._search(*far, level + 1, point, k, best)
+
+class FacilityIndex:
+    """
+    Nearest hospital / police station lookup. Entries are in the format of
+    hub_coords.json and police_coords.json: [name, [latitude, longitude], phone].
+    """
+
+    def __init__(self, names: Sequence[str], phones: Sequence[str], latitudes, longitudes, leaf_size: int = 16):
+        self.names = list(names)
+        self.phones = [str(phone) for phone in phones]
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.tree = KDTree(to_unit_xyz(self.latitudes, self.longitudes), leaf_size=leaf_size)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable, **kwargs) -> "FacilityIndex":
+        names, phones, latitudes, longitudes = [], [], [], []
+        for name, (latitude, longitude), phone, *_ in entries:
+            names.append(name)
+            phones.append(phone)
+            latitudes.append(float(latitude))
+            longitudes.append(float(longitude))
+        return cls(names, phones, latitudes, longitudes, **kwargs)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "FacilityIndex":
+        with open(path, mode='r') as read_file:
+            return cls.from_entries(json.load(read_file), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Facility]:
+        """
+        The k nearest facilities, nearest first, with haversine distances
+        """
+        point = to_unit_xyz([latitude], [longitude])[0]
+        results = []
+        for index, _ in self.tree.query(point, k):
+            lat = float(self.latitudes[index])
+            lon = float(self.longitudes[index])
+            results.append(Facility(
+                self.names[index], self.phones[index], lat, lon, haversine_km(latitude, longitude, lat, lon)
+            ))
+        # Chord order equals great-circle order; re-sort on the exact
+        # distances so float rounding in xyz cannot swap near-ties
+        results.sort(key=lambda facility: facility.distance_km)
+        return results
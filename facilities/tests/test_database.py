@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from facilities import FacilityDatabase, FacilityIndex, build_database, open_facilities
+
+def random_entries(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        [f"F{i}", [float(lat), float(lon)], str(100 + i)]
+        for i, (lat, lon) in enumerate(rng.uniform([-60, -180], [70, 180], (count, 2)))
+    ]
+
+@pytest.mark.parametrize("count", [1, 17, 2000])
+def test_database_matches_json_index(tmp_path, count):
+    entries = random_entries(count, seed=count)
+    path = str(tmp_path / "facilities.fdb")
+    assert build_database(entries, path, leaf_size=4) == count
+    index = FacilityIndex.from_entries(entries)
+
+    rng = np.random.default_rng(1)
+    with FacilityDatabase(path) as database:
+        assert len(database) == count
+        for latitude, longitude in rng.uniform([-60, -180], [70, 180], (50, 2)):
+            expected = index.nearest(latitude, longitude, k=3)
+            found = database.nearest(latitude, longitude, k=3)
+            assert [facility.name for facility in found] == [facility.name for facility in expected]
+            assert [facility.phone for facility in found] == [facility.phone for facility in expected]
+            # Coordinates are stored as float32 (~1 m)
+            assert found[0].distance_km == pytest.approx(expected[0].distance_km, abs=0.01)
+
+def test_strings_round_trip(tmp_path):
+    path = str(tmp_path / "facilities.fdb")
+    build_database([["Hôpital Saint-Éloi", [43.6, 3.87], 33467337], ["", [0, 0], ""]], path)
+    with FacilityDatabase(path) as database:
+        nearest = database.nearest(43.61, 3.88)[0]
+        assert (nearest.name, nearest.phone) == ("Hôpital Saint-Éloi", "33467337")
+        assert database.nearest(0.1, 0.1)[0].name == ""
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "hub_coords.fdb"
+    path.write_bytes(b"[" * 128)
+    with pytest.raises(ValueError):
+        FacilityDatabase(str(path))
+
+def test_open_facilities_prefers_fresh_database(tmp_path):
+    json_path = str(tmp_path / "hub_coords.json")
+    with open(json_path, "w") as out:
+        json.dump(random_entries(10), out)
+    assert isinstance(open_facilities(json_path), FacilityIndex)
+
+    build_database(random_entries(10), str(tmp_path / "hub_coords.fdb"))
+    database = open_facilities(json_path)
+    assert isinstance(database, FacilityDatabase)
+    database.close()
+
+    # A JSON file edited after the build wins over the stale database
+    later = time.time() + 10
+    os.utime(json_path, (later, later))
+    assert isinstance(open_facilities(json_path), FacilityIndex)
\ No newline at end of file
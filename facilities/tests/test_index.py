@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from facilities import FacilityIndex, KDTree, haversine_km
+
+def brute_force(latitudes, longitudes, latitude, longitude, k):
+    distances = [haversine_km(latitude, longitude, lat, lon) for lat, lon in zip(latitudes, longitudes)]
+    return list(np.argsort(distances, kind="stable")[:k])
+
+@pytest.mark.parametrize("count", [1, 5, 17, 1000])
+def test_nearest_matches_brute_force(count):
+    rng = np.random.default_rng(count)
+    latitudes = rng.uniform(-60, 70, count)
+    longitudes = rng.uniform(-180, 180, count)
+    index = FacilityIndex([f"F{i}" for i in range(count)], ["100"] * count, latitudes, longitudes, leaf_size=4)
+    for latitude, longitude in rng.uniform([-60, -180], [70, 180], (50, 2)):
+        expected = brute_force(latitudes, longitudes, latitude, longitude, 3)
+        found = index.nearest(latitude, longitude, k=3)
+        assert [facility.name for facility in found] == [f"F{i}" for i in expected]
+        assert found[0].distance_km == pytest.approx(
+            haversine_km(latitude, longitude, latitudes[expected[0]], longitudes[expected[0]])
+        )
+
+def test_antimeridian_neighbours_are_found():
+    index = FacilityIndex(["west", "east", "far"], ["1", "2", "3"], [0, 0, 0], [179.9, -179.95, 90])
+    assert [facility.name for facility in index.nearest(0, -179.99, k=2)] == ["east", "west"]
+
+def test_load_legacy_json(tmp_path):
+    path = tmp_path / "hub_coords.json"
+    path.write_text(json.dumps([
+        ["City Hospital", [12.9716, 77.5946], 8012345678],
+        ["Rural Clinic", [13.3392, 77.1140], 8087654321],
+    ]))
+    index = FacilityIndex.load(str(path))
+    nearest = index.nearest(12.98, 77.60)[0]
+    assert (nearest.name, nearest.phone) == ("City Hospital", "8012345678")
+    assert nearest.distance_km < 2
+    # Repeated lookups do not change the index (the legacy code appended
+    # a distance to every entry on each call)
+    assert index.nearest(12.98, 77.60)[0] == nearest
+    assert len(index) == 2
+
+def test_empty_tree():
+    assert KDTree(np.zeros((0, 3))).query([1.0, 0.0, 0.0], k=3) == []
\ No newline at end of file
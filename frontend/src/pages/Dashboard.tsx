@@ -56,11 +56,10 @@ const Dashboard: React.FC = () => {
   useEffect(() => {
     const fetchStats = async () => {
       try {
-        const response = await api.get('/accidents');
-        const accidents = response.data;
+        const response = await api.get('/accidents/stats', { params: { days: 0, max_locations: 0 } });
         setAccidentStats({
-          total: accidents.length,
-          confirmed: accidents.filter((a: any) => a.is_confirmed).length,
+          total: response.data.total,
+          confirmed: response.data.confirmed,
         });
       } catch (error) {
         console.error('Failed to fetch accident stats', error);
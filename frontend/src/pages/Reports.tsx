@@ -35,16 +35,31 @@ interface Accident {
   is_confirmed: boolean;
 }
 
+interface AccidentStats {
+  confirmed: number;
+  potential: number;
+  low_confidence: number;
+}
+
 const Reports: React.FC = () => {
   const [accidents, setAccidents] = useState<Accident[]>([]);
+  const [accidentStats, setAccidentStats] = useState({ confirmed: 0, potential: 0, lowConfidence: 0 });
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
   useEffect(() => {
     const fetchAccidents = async () => {
       try {
-        const response = await api.get('/accidents');
+        const [response, statsResponse] = await Promise.all([
+          api.get('/accidents'),
+          api.get<AccidentStats>('/accidents/stats', { params: { days: 0, max_locations: 0 } }),
+        ]);
         setAccidents(response.data);
+        setAccidentStats({
+          confirmed: statsResponse.data.confirmed,
+          potential: statsResponse.data.potential,
+          lowConfidence: statsResponse.data.low_confidence,
+        });
       } catch (err) {
         setError('Failed to fetch accident reports');
         console.error(err);
@@ -56,21 +71,7 @@ const Reports: React.FC = () => {
     fetchAccidents();
   }, []);
 
-  // Prepare data for charts
-  const accidentStats = accidents.reduce(
-    (acc, accident) => {
-      if (accident.is_confirmed) {
-        acc.confirmed++;
-      } else if (accident.confidence_score && accident.confidence_score > 0.7) {
-        acc.potential++;
-      } else {
-        acc.lowConfidence++;
-      }
-      return acc;
-    },
-    { confirmed: 0, potential: 0, lowConfidence: 0 }
-  );
-
+  // Prepare data for charts (totals come from the server-side rollup)
   const chartData = [
     { name: 'Confirmed', value: accidentStats.confirmed },
     { name: 'Potential', value: accidentStats.potential },
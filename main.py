@@ -3,8 +3,7 @@ from time import sleep, time
 import RPi.GPIO as GPIO  # Raspberry Pi GPIO library
 import sys
 import serial
-import json
-import geopy.distance
+from facilities import open_facilities
 
 # GPIO pins and constants
 no_help_but = 12
@@ -76,13 +75,11 @@ MPU_Init()
 print("Reading Data of Gyroscope and Accelerometer")
 print("Reading the latest DATABASE .....")
 
-with open("/home/pi/hub_coords.json", mode='r') as read_file:
-    data = json.load(read_file)
-    data = list(data)
-
-with open("/home/pi/police_coords.json", mode='r') as read_file:
-    data_police = json.load(read_file)
-    data_police = list(data_police)
+# Loaded once into spatial indexes; lookups no longer scan every facility.
+# A hub_coords.fdb / police_coords.fdb built with `python -m facilities.build`
+# is memory-mapped instead of parsing the JSON at boot
+data = open_facilities("/home/pi/hub_coords.json")
+data_police = open_facilities("/home/pi/police_coords.json")
 
 def main_sms(msg1, num):
     print("HERE 1")
@@ -206,39 +203,21 @@ def button_check():
             print("0")
         sleep(0.5)
 
+def close_facility(index, la, lo, kind):
+    matches = index.nearest(float(la), float(lo))
+    if not matches:
+        # Empty database: the alert still goes out, without facility details
+        print(f"\n\nNo {kind} found in the database")
+        return "N/A", "", [0.00, 0.00]
+    nearest = matches[0]
+    print(f"\n\nNearest {kind}: {nearest.name} \nContact : {nearest.phone} \nDistance : {nearest.distance_km} km")
+    return nearest.name, nearest.phone, [nearest.latitude, nearest.longitude]
+
 def close_hos(data, la, lo):
-    for c, x in enumerate(data):
-        coords_1 = (float(la), float(lo))
-        coords_2 = (x[1][0], x[1][1])
-        d = geopy.distance.geodesic(coords_1, coords_2)
-        p = f"{d}"
-        q = p.replace(" km", "")
-        x.append(float(q))
-    low_dis = data[0][3]
-    index = 0
-    for c, x in enumerate(data):
-        if x[3] < low_dis:
-            low_dis = x[3]
-            index = c
-    print(f"\n\nNearest Hospital: {data[index][0]} \nContact : {data[index][2]} \nDistance : {low_dis} km")
-    return data[index][0], data[index][2], data[index][1]
+    return close_facility(data, la, lo, "Hospital")
 
 def close_pol(data, la, lo):
-    for c, x in enumerate(data):
-        coords_1 = (float(la), float(lo))
-        coords_2 = (x[1][0], x[1][1])
-        d = geopy.distance.geodesic(coords_1, coords_2)
-        p = f"{d}"
-        q = p.replace(" km", "")
-        x.append(float(q))
-    low_dis = data[0][3]
-    index = 0
-    for c, x in enumerate(data):
-        if x[3] < low_dis:
-            low_dis = x[3]
-            index = c
-    print(f"\n\nNearest Police station: {data[index][0]} \nContact : {data[index][2]} \nDistance : {low_dis} km")
-    return data[index][0], data[index][2], data[index][1]
+    return close_facility(data, la, lo, "Police station")
 
 def trigger_case(case):
     global acci_time, flag
@@ -341,10 +320,12 @@ try:
                     hos_lo = [0.00, 0.00]
                     pol_lo = [0.00, 0.00]
 
-                send_text(hos_name, hos_num, msg_parts, hos_lo)
-                sleep(2)
-                send_text(pol_name, pol_num, msg_parts, pol_lo)
-                sleep(3)
+                if hos_num:
+                    send_text(hos_name, hos_num, msg_parts, hos_lo)
+                    sleep(2)
+                if pol_num:
+                    send_text(pol_name, pol_num, msg_parts, pol_lo)
+                    sleep(3)
                 send_text_rel(em_pho_no, msg_parts, hos_name, hos_num, pol_name, pol_num)
 
         if not noti_flag: